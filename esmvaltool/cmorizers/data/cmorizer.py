@@ -4,12 +4,16 @@ This module adds new commands to the ESMValTool to allow the user to get
 and reformat to the ESMValTool's data format a set of observations and
 reanalysis.
 """
+import contextlib
 import datetime
 import importlib
 import logging
+import multiprocessing
 import os
 import shutil
 import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import esmvalcore
@@ -23,6 +27,36 @@ logger = logging.getLogger(__name__)
 datasets_file = os.path.join(os.path.dirname(__file__), 'datasets.yml')
 
 
+_LOG_FORMAT = ('%(asctime)s UTC [%(process)d] %(levelname)-7s '
+               '%(name)s:%(lineno)s %(message)s')
+
+
+def _configure_worker_logging(log_level):
+    """Configure console logging in a worker process."""
+    handler = logging.StreamHandler()
+    handler.setLevel(log_level.upper())
+    handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(handler)
+    logging.Formatter.converter = time.gmtime
+
+
+@contextlib.contextmanager
+def _log_to_file(log_file, log_level):
+    """Temporarily copy all log messages to an additional log file."""
+    handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
+    handler.setLevel(log_level.upper())
+    handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    try:
+        yield
+    finally:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+
 class Formatter():
     """
     Class to manage the download and formatting of datasets.
@@ -169,7 +203,7 @@ class Formatter():
                                     start_date, end_date, overwrite)
         logger.info('%s downloaded', dataset)
 
-    def format(self, start, end, install):
+    def format(self, start, end, install, jobs=1):
         """Format all available datasets.
 
         Parameters
@@ -181,6 +215,8 @@ class Formatter():
         install: bool
             If True, automatically moves the data to the final location if
             there is no
+        jobs: int
+            Number of datasets to format in parallel
         """
         logger.info("Running the CMORization scripts.")
         # datasets dictionary of Tier keys
@@ -191,15 +227,53 @@ class Formatter():
         logger.info("Processing datasets %s", datasets)
 
         # loop through tier/datasets to be cmorized
-        failed_datasets = []
-        for dataset in datasets:
-            if not self.format_dataset(dataset, start, end, install):
-                failed_datasets.append(dataset)
+        if jobs > 1 and len(datasets) > 1:
+            success = self._format_parallel(datasets, start, end, install,
+                                            jobs)
+        else:
+            success = {
+                dataset: self.format_dataset(dataset, start, end, install)
+                for dataset in datasets
+            }
 
+        failed_datasets = [
+            dataset for dataset in datasets if not success[dataset]
+        ]
+        logger.info("Formatting finished: %i succeeded, %i failed",
+                    len(datasets) - len(failed_datasets),
+                    len(failed_datasets))
         if failed_datasets:
             raise Exception(
                 f'Format failed for datasets {" ".join(failed_datasets)}')
 
+    def _format_parallel(self, datasets, start, end, install, jobs):
+        """Format datasets in a pool of worker processes."""
+        logger.info("Formatting %i datasets using %i parallel jobs",
+                    len(datasets), jobs)
+        success = {}
+        # Use fresh interpreters, forking a process that has already used
+        # threads (e.g. through dask) may deadlock
+        with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_configure_worker_logging,
+                initargs=(self.log_level, ),
+        ) as executor:
+            futures = {
+                executor.submit(self.format_dataset, dataset, start, end,
+                                install): dataset
+                for dataset in datasets
+            }
+            for future in as_completed(futures):
+                dataset = futures[future]
+                try:
+                    success[dataset] = future.result()
+                except Exception:
+                    logger.exception('Formatting failed for dataset %s',
+                                     dataset)
+                    success[dataset] = False
+        return success
+
     @staticmethod
     def has_downloader(dataset):
         """Check if a given datasets has an automatic downloader.
@@ -257,7 +331,21 @@ class Formatter():
         install: bool
             If True, automatically moves the data to the final location if
             there is no data there.
+
+        Returns
+        -------
+        bool
+            True if formatting was successful, False otherwise.
         """
+        log_dir = os.path.join(self.run_dir, dataset)
+        if not os.path.isdir(log_dir):
+            os.makedirs(log_dir)
+        log_file = os.path.join(log_dir, 'log.txt')
+        with _log_to_file(log_file, self.log_level):
+            return self._format_dataset(dataset, start, end, install)
+
+    def _format_dataset(self, dataset, start, end, install):
+        """Format a single dataset, see :meth:`format_dataset`."""
         reformat_script_root = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), 'formatters',
             'datasets', self._dataset_to_module(dataset))
@@ -276,8 +364,6 @@ class Formatter():
         if not os.path.isdir(out_data_dir):
             os.makedirs(out_data_dir)
 
-        # all operations are done in the working dir now
-        os.chdir(out_data_dir)
         # figure out what language the script is in
         logger.info("Reformat script: %s", reformat_script_root)
         if os.path.isfile(reformat_script_root + '.ncl'):
@@ -370,6 +456,7 @@ class Formatter():
         with subprocess.Popen(ncl_call,
                               stdout=subprocess.PIPE,
                               stderr=subprocess.STDOUT,
+                              cwd=out_dir,
                               env=env) as process:
             output, err = process.communicate()
         for oline in str(output.decode('utf-8')).split('\n'):
@@ -469,6 +556,7 @@ class DataCommand():
                start=None,
                end=None,
                install=False,
+               jobs=1,
                **kwargs):
         """Format datasets.
 
@@ -486,12 +574,14 @@ class DataCommand():
             are YYYY, YYYYMM and YYYYMMDD.
         install : bool, optional
             If true, move processed data to the folder, by default False
+        jobs : int, optional
+            Number of datasets to format in parallel, by default 1
         """
         start = self._parse_date(start)
         end = self._parse_date(end)
 
         self.formatter.start('formatting', datasets, config_file, kwargs)
-        self.formatter.format(start, end, install)
+        self.formatter.format(start, end, install, jobs)
 
     def prepare(self,
                 datasets,
@@ -500,6 +590,7 @@ class DataCommand():
                 end=None,
                 overwrite=False,
                 install=False,
+                jobs=1,
                 **kwargs):
         """Download and format a set of datasets.
 
@@ -519,13 +610,15 @@ class DataCommand():
             If true, move processed data to the folder, by default False
         overwrite : bool, optional
             If true, download already present data again
+        jobs : int, optional
+            Number of datasets to format in parallel, by default 1
         """
         start = self._parse_date(start)
         end = self._parse_date(end)
 
         self.formatter.start('preparation', datasets, config_file, kwargs)
         if self.formatter.download(start, end, overwrite):
-            self.formatter.format(start, end, install)
+            self.formatter.format(start, end, install, jobs)
         else:
             logger.warning("Download failed, skipping format step")
 
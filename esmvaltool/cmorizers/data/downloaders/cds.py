@@ -1,8 +1,12 @@
 """Downloader for the Climate Data Store."""
 
+import contextlib
+import json
 import logging
 import os
+import time
 from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import cdsapi
 
@@ -10,10 +14,252 @@ from .downloader import BaseDownloader
 
 logger = logging.getLogger(__name__)
 
+LEDGER_FILE = '.cds_requests.json'
+POLL_INTERVAL = 10
+
+
+class CDSAPIClient():
+    """Non-blocking client for the CDS based on :class:`cdsapi.Client`.
+
+    This is the default client used by :class:`CDSRequestQueue`. Any object
+    implementing the methods ``submit``, ``state`` and ``download`` can be
+    used instead, e.g. to test against a fake local CDS.
+    """
+    def __init__(self):
+        # Requests are not deleted automatically so they can be reused
+        # if the download is interrupted
+        self._client = cdsapi.Client(wait_until_complete=False, delete=False)
+        self._results = {}
+
+    def _get_result(self, request_id):
+        if request_id not in self._results:
+            self._results[request_id] = cdsapi.api.Result(
+                self._client, {'request_id': request_id})
+        return self._results[request_id]
+
+    def submit(self, product_name, request):
+        """Submit a request to the CDS without waiting for it.
+
+        Parameters
+        ----------
+        product_name : str
+            Name of the product in the CDS
+        request : dict
+            Request dictionary for the CDS
+
+        Returns
+        -------
+        str
+            Request identifier
+        """
+        result = self._client.retrieve(product_name, request)
+        request_id = result.reply['request_id']
+        self._results[request_id] = result
+        return request_id
+
+    def state(self, request_id):
+        """Get the current state of a request.
+
+        Parameters
+        ----------
+        request_id : str
+            Request identifier
+
+        Returns
+        -------
+        str
+            One of ``'queued'``, ``'running'``, ``'completed'`` or
+            ``'failed'``
+        """
+        result = self._get_result(request_id)
+        result.update()
+        return result.reply['state']
+
+    def download(self, request_id, target):
+        """Download the result of a completed request.
+
+        Parameters
+        ----------
+        request_id : str
+            Request identifier
+        target : str
+            Path of the downloaded file
+        """
+        result = self._get_result(request_id)
+        result.download(target)
+        result.delete()
+        del self._results[request_id]
+
+
+class CDSRequestQueue():
+    """Submit many CDS requests at once and download them as they finish.
+
+    Submitted requests are stored in a ledger file, so an interrupted
+    download can be resumed without submitting the requests again.
+
+    Parameters
+    ----------
+    client : object
+        Client used to communicate with the CDS, see :class:`CDSAPIClient`
+    ledger_file : str
+        Path of the file used to store the submitted requests
+    max_requests : int, optional
+        Maximum number of requests submitted at the same time, by default 8
+    max_downloads : int, optional
+        Maximum number of parallel downloads, by default 4
+    poll_interval : float, optional
+        Seconds to wait between checks of the state of the requests, by
+        default :data:`POLL_INTERVAL`
+    """
+    def __init__(self,
+                 client,
+                 ledger_file,
+                 max_requests=8,
+                 max_downloads=4,
+                 poll_interval=None):
+        self._client = client
+        self.ledger_file = ledger_file
+        self.max_requests = max_requests
+        self.max_downloads = max_downloads
+        if poll_interval is None:
+            poll_interval = POLL_INTERVAL
+        self.poll_interval = poll_interval
+        self._pending = {}
+
+    def add(self, product_name, request, target):
+        """Add a request to the queue.
+
+        Parameters
+        ----------
+        product_name : str
+            Name of the product in the CDS
+        request : dict
+            Request dictionary for the CDS
+        target : str
+            Path of the downloaded file
+        """
+        self._pending[target] = {
+            'product_name': product_name,
+            'request': request,
+        }
+
+    def _read_ledger(self):
+        if not os.path.exists(self.ledger_file):
+            return {}
+        with open(self.ledger_file, encoding='utf-8') as file:
+            return json.load(file)
+
+    def _write_ledger(self, ledger):
+        if not ledger:
+            if os.path.exists(self.ledger_file):
+                os.remove(self.ledger_file)
+            return
+        tmp_file = self.ledger_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as file:
+            json.dump(ledger, file, indent=2)
+        os.replace(tmp_file, self.ledger_file)
+
+    def run(self):
+        """Submit all queued requests and wait until they are downloaded."""
+        entries, self._pending = self._pending, {}
+        ledger = self._read_ledger()
+        waiting = []
+        active = {}
+        resumed = set()
+        for target, entry in entries.items():
+            previous = ledger.get(target, {})
+            if (previous.get('product_name') == entry['product_name']
+                    and previous.get('request') == entry['request']):
+                logger.info('Resuming request %s for %s',
+                            previous['request_id'], target)
+                active[target] = previous['request_id']
+                resumed.add(target)
+            else:
+                waiting.append(target)
+
+        downloads = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_downloads) as executor:
+            while waiting or active or downloads:
+                while waiting and len(active) < self.max_requests:
+                    target = waiting.pop(0)
+                    entry = dict(entries[target])
+                    entry['request_id'] = self._client.submit(
+                        entry['product_name'], entry['request'])
+                    logger.info('Submitted request %s for %s',
+                                entry['request_id'], target)
+                    ledger[target] = entry
+                    self._write_ledger(ledger)
+                    active[target] = entry['request_id']
+
+                for target, request_id in list(active.items()):
+                    try:
+                        state = self._client.state(request_id)
+                    except Exception:
+                        if target not in resumed:
+                            raise
+                        # Requests are deleted by the CDS after some time
+                        logger.warning(
+                            'Could not resume request %s for %s, '
+                            'submitting it again', request_id, target,
+                            exc_info=True)
+                        resumed.remove(target)
+                        del active[target]
+                        del ledger[target]
+                        self._write_ledger(ledger)
+                        waiting.append(target)
+                        continue
+                    resumed.discard(target)
+                    if state == 'completed':
+                        del active[target]
+                        future = executor.submit(self._download, request_id,
+                                                 target)
+                        downloads[future] = target
+                    elif state == 'failed':
+                        del active[target]
+                        del ledger[target]
+                        self._write_ledger(ledger)
+                        logger.error('Failed request: %s',
+                                     entries[target]['request'])
+                        errors.append(target)
+
+                timeout = self.poll_interval if active or waiting else None
+                if not downloads:
+                    if active:
+                        time.sleep(self.poll_interval)
+                    continue
+                done, _ = wait(downloads,
+                               timeout=timeout,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    target = downloads.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        logger.exception('Failed to download %s', target)
+                        errors.append(target)
+                    else:
+                        del ledger[target]
+                        self._write_ledger(ledger)
+
+        if errors:
+            raise RuntimeError(
+                f"Failed to retrieve {len(errors)} file(s) from the CDS: "
+                f"{', '.join(errors)}")
+
+    def _download(self, request_id, target):
+        part_file = target + '.part'
+        self._client.download(request_id, part_file)
+        os.replace(part_file, target)
+        logger.info('Downloaded %s', target)
+
 
 class CDSDownloader(BaseDownloader):
     """Downloader class for the climate data store.
 
+    Requests made inside a :meth:`batch` block are submitted to the CDS
+    concurrently and downloaded as soon as they are ready.
+
     Parameters
     ----------
     product_name : str
@@ -31,6 +277,11 @@ class CDSDownloader(BaseDownloader):
     extra_name : str, optional
         Some products have a subfix appended to their name for certain
         variables. This parameter is to specify it, by default ''
+    client : object, optional
+        Client used to communicate with the CDS, by default a
+        :class:`CDSAPIClient`
+    max_requests : int, optional
+        Maximum number of requests submitted at the same time, by default 8
     """
     def __init__(self,
                  product_name,
@@ -39,20 +290,65 @@ class CDSDownloader(BaseDownloader):
                  dataset,
                  dataset_info,
                  overwrite,
-                 extra_name=''):
+                 extra_name='',
+                 client=None,
+                 max_requests=8):
         super().__init__(config, dataset, dataset_info, overwrite)
-        try:
-            self._client = cdsapi.Client()
-        except Exception as ex:
-            if str(ex).endswith(".cdsapirc"):
-                logger.error(
-                    'Could not connect to the CDS due to issues with your '
-                    '".cdsapirc" file. More info in '
-                    'https://cds.climate.copernicus.eu/api-how-to.')
-            raise
+        if client is None:
+            try:
+                client = CDSAPIClient()
+            except Exception as ex:
+                if str(ex).endswith(".cdsapirc"):
+                    logger.error(
+                        'Could not connect to the CDS due to issues with '
+                        'your ".cdsapirc" file. More info in '
+                        'https://cds.climate.copernicus.eu/api-how-to.')
+                raise
+        self._client = client
         self._product_name = product_name
         self._request_dict = request_dictionary
         self.extra_name = extra_name
+        self.max_requests = max_requests
+        self._queue = None
+
+    def _create_queue(self):
+        os.makedirs(self.local_folder, exist_ok=True)
+        return CDSRequestQueue(self._client,
+                               os.path.join(self.local_folder, LEDGER_FILE),
+                               max_requests=self.max_requests)
+
+    @contextlib.contextmanager
+    def batch(self, queue=None):
+        """Collect all requests and download them concurrently at the end.
+
+        Parameters
+        ----------
+        queue : CDSRequestQueue, optional
+            Add the requests to the queue of another downloader instead of
+            creating a new one. The queue is then run by the downloader
+            that created it.
+
+        Yields
+        ------
+        CDSRequestQueue
+            Queue collecting the requests
+
+        Examples
+        --------
+        >>> with downloader.batch():
+        ...     for year in range(1979, 2020):
+        ...         downloader.download(year, 1)
+        """
+        owner = queue is None
+        if owner:
+            queue = self._create_queue()
+        self._queue = queue
+        try:
+            yield queue
+        finally:
+            self._queue = None
+        if owner:
+            queue.run()
 
     def download(self,
                  year,
@@ -98,6 +394,8 @@ class CDSDownloader(BaseDownloader):
     def download_request(self, filename, request=None):
         """Download a specific request.
 
+        Inside a :meth:`batch` block the request is only queued.
+
         Parameters
         ----------
         filename : str
@@ -117,12 +415,9 @@ class CDSDownloader(BaseDownloader):
                 logger.info('File %s already downloaded. Skipping...',
                             filename)
                 return
-        try:
-            self._client.retrieve(
-                self._product_name,
-                request,
-                filename,
-            )
-        except Exception:
-            logger.error('Failed request: %s', request)
-            raise
+        if self._queue is not None:
+            self._queue.add(self._product_name, request, filename)
+            return
+        queue = self._create_queue()
+        queue.add(self._product_name, request, filename)
+        queue.run()
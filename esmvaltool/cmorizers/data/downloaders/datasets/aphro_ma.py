@@ -2,7 +2,10 @@
 import logging
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -51,4 +54,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         download_file(f"APHRO_V1101EX_R1/APHRO_MA/{grid}_nc/"
                       f"APHRO_MA_{grid}_V1101_EXR1.nc.tgz")
 
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -5,7 +5,10 @@ import datetime
 from dateutil import relativedelta
 
 from esmvaltool.cmorizers.data.downloaders.cds import CDSDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 
 def download_dataset(config, dataset, dataset_info, start_date, end_date,
@@ -53,8 +56,10 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
     )
 
     loop_date = start_date
-    while loop_date <= end_date:
-        downloader.download(loop_date.year, loop_date.month)
-        loop_date += relativedelta.relativedelta(months=1)
+    with downloader.batch():
+        while loop_date <= end_date:
+            downloader.download(loop_date.year, loop_date.month)
+            loop_date += relativedelta.relativedelta(months=1)
 
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -1,12 +1,16 @@
 """Script to download CDS-SATELLITE-SOIL-MOISTURE from the CDS."""
 
 import calendar
+import contextlib
 import datetime
 
 from dateutil import relativedelta
 
 from esmvaltool.cmorizers.data.downloaders.cds import CDSDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 
 def download_dataset(config, dataset, dataset_info, start_date, end_date,
@@ -61,25 +65,35 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         daily_downloaders[sensor] = get_downloader(config, dataset,
                                                    dataset_info, overwrite,
                                                    sensor, 'day')
-    while loop_date <= end_date:
-        for sensor, downloader in monthly_downloaders.items():
-            pattern = f'cds-satellite-soil-moisture_cdr_{sensor}_monthly'
-            downloader.download(loop_date.year,
-                                loop_date.month,
-                                file_pattern=pattern)
-        loop_date += relativedelta.relativedelta(months=1)
+    downloaders = [
+        *monthly_downloaders.values(),
+        *daily_downloaders.values(),
+    ]
+    with contextlib.ExitStack() as stack:
+        queue = stack.enter_context(downloaders[0].batch())
+        for downloader in downloaders[1:]:
+            stack.enter_context(downloader.batch(queue))
 
-    loop_date = start_date
-    while loop_date <= end_date:
-        for sensor, downloader in daily_downloaders.items():
-            downloader.download(
-                loop_date.year, loop_date.month, [
-                    f'{i+1:02d}' for i in range(
-                        calendar.monthrange(loop_date.year, loop_date.month)
-                        [1])
-                ], f'cds-satellite-soil-moisture_cdr_{sensor}_daily')
-        loop_date += relativedelta.relativedelta(months=1)
-    unpack_files_in_folder(downloader.local_folder)
+        while loop_date <= end_date:
+            for sensor, downloader in monthly_downloaders.items():
+                pattern = f'cds-satellite-soil-moisture_cdr_{sensor}_monthly'
+                downloader.download(loop_date.year,
+                                    loop_date.month,
+                                    file_pattern=pattern)
+            loop_date += relativedelta.relativedelta(months=1)
+
+        loop_date = start_date
+        while loop_date <= end_date:
+            for sensor, downloader in daily_downloaders.items():
+                downloader.download(
+                    loop_date.year, loop_date.month, [
+                        f'{i+1:02d}' for i in range(
+                            calendar.monthrange(loop_date.year,
+                                                loop_date.month)[1])
+                    ], f'cds-satellite-soil-moisture_cdr_{sensor}_daily')
+            loop_date += relativedelta.relativedelta(months=1)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
 
 
 def get_downloader(config, dataset, dataset_info, overwrite, sensor,
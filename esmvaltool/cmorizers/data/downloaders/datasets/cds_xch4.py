@@ -1,7 +1,10 @@
 """Script to download CDS-XCH4 from the Climate Data Store (CDS)."""
 
 from esmvaltool.cmorizers.data.downloaders.cds import CDSDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 
 def download_dataset(config, dataset, dataset_info, start_date, end_date,
@@ -38,4 +41,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         overwrite=overwrite,
     )
     downloader.download_request("CDS-XCH4.tar")
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
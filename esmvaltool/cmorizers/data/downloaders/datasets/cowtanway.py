@@ -2,7 +2,10 @@
 import logging
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,4 +49,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
     download_file("ghcn_short_uah_v2_0_0.nc.gz")
     download_file("had4sst4_krig_v2_0_0.nc.gz")
     download_file("had4_krig_v2_0_0.nc.gz")
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
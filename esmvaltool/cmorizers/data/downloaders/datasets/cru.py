@@ -2,7 +2,10 @@
 import logging
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,4 +41,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
             f'cruts.1811131722.v4.02/{var}/'
             f'cru_ts4.02.1901.2017.{var}.dat.nc.gz',
             wget_options=[])
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
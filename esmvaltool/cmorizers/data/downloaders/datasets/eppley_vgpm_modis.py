@@ -5,7 +5,10 @@ import logging
 from dateutil import relativedelta
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,4 +52,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
             f"eppley.r2018.m.chl.m.sst/hdf/eppley.m.{year}.tar",
             wget_options=["--accept=tar"])
         loop_date += relativedelta.relativedelta(years=1)
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
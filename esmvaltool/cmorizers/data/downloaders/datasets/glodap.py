@@ -2,7 +2,10 @@
 import logging
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,4 +39,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         "https://www.ncei.noaa.gov/data/oceans/ncei/ocads/data/0162565/mapped/"
         "GLODAPv2.2016b_MappedClimatologies.tar.gz",
         wget_options=[])
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
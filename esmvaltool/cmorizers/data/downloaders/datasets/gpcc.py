@@ -3,6 +3,7 @@ import logging
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
 from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
     read_cmor_config,
     unpack_files_in_folder,
 )
@@ -42,4 +43,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
     for version in cmor_config['attributes']['version'].values():
         downloader.download_file(raw_path.format(version=version),
                                  wget_options=[])
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -3,7 +3,10 @@ import logging
 import os
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,4 +45,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         "https://www.metoffice.gov.uk/hadobs/hadisst/data/HadISST_ice.nc.gz",
         wget_options=[])
 
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -5,7 +5,10 @@ from datetime import datetime
 from dateutil import relativedelta
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 
 def download_dataset(config, dataset, dataset_info, start_date, end_date,
@@ -46,4 +49,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
             f"ISCCP-FH_nc4_MPF_v.0.0_{loop_date.year}.tar.gz",
             wget_options=['--no-check-certificate'])
         loop_date += relativedelta.relativedelta(years=1)
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -3,7 +3,10 @@ import logging
 import os
 
 from esmvaltool.cmorizers.data.downloaders.wget import WGetDownloader
-from esmvaltool.cmorizers.data.utilities import unpack_files_in_folder
+from esmvaltool.cmorizers.data.utilities import (
+    get_n_workers,
+    unpack_files_in_folder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,4 +44,5 @@ def download_dataset(config, dataset, dataset_info, start_date, end_date,
         "ess-dive-ec4f4b7097524f6-20180621T213642471",
         ["-O", os.path.join(downloader.local_folder, "ndp017b.tar.gz")])
 
-    unpack_files_in_folder(downloader.local_folder)
+    unpack_files_in_folder(downloader.local_folder,
+                           n_workers=get_n_workers(config))
@@ -1,9 +1,16 @@
 """Downloader for FTP repositories."""
 
+import calendar
+import contextlib
 import ftplib
 import logging
 import os
+import posixpath
+import queue
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from progressbar import (
     ETA,
@@ -18,10 +25,19 @@ from .downloader import BaseDownloader
 
 logger = logging.getLogger(__name__)
 
+_CONNECTION_ERRORS = (OSError, EOFError, ftplib.error_temp)
+
+# Seconds to wait for a free connection before trying to open a new one
+_POOL_TIMEOUT = 5
+
 
 class FTPDownloader(BaseDownloader):
     """Downloader for FTP repositories.
 
+    Files are downloaded concurrently over a pool of FTP connections. Each
+    file is first written to a ``.part`` file, which is used to resume the
+    download if it is interrupted.
+
     Parameters
     ----------
     config : dict
@@ -34,18 +50,102 @@ class FTPDownloader(BaseDownloader):
         Dataset information from the datasets.yml file
     overwrite : bool
         Overwrite already downloaded files
+    max_connections : int, optional
+        Maximum number of concurrent connections used to download files,
+        by default 4
+    port : int, optional
+        FTP server port, by default 21
     """
-    def __init__(self, config, server, dataset, dataset_info, overwrite):
+    def __init__(self,
+                 config,
+                 server,
+                 dataset,
+                 dataset_info,
+                 overwrite,
+                 max_connections=4,
+                 port=21):
         super().__init__(config, dataset, dataset_info, overwrite)
         self._client = None
+        self._sessions = queue.LifoQueue()
+        self._n_sessions = 0
+        self._lock = threading.Lock()
         self.server = server
+        self.port = port
+        self.max_connections = max_connections
 
     def connect(self):
         """Connect to the FTP server."""
-        self._client = ftplib.FTP(self.server)
+        self._client = ftplib.FTP()
+        self._client.connect(self.server, self.port)
         logger.info(self._client.getwelcome())
         self._client.login()
 
+    def _open_session(self):
+        """Open a new connection for downloading files."""
+        session = ftplib.FTP()
+        session.connect(self.server, self.port)
+        session.login()
+        session.voidcmd('TYPE I')
+        return session
+
+    def _new_session(self):
+        """Open a new connection if allowed, return None otherwise."""
+        with self._lock:
+            if self._n_sessions >= self.max_connections:
+                return None
+            self._n_sessions += 1
+        try:
+            return self._open_session()
+        except ftplib.all_errors as ex:
+            with self._lock:
+                self._n_sessions -= 1
+                if not self._n_sessions:
+                    raise
+            logger.debug(
+                "Could not open another connection to %s (%s), "
+                "waiting for a free one", self.server, ex)
+        return None
+
+    @contextlib.contextmanager
+    def _session(self):
+        """Get a connection from the pool, opening a new one if allowed."""
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            session = None
+        while session is None:
+            session = self._new_session()
+            if session is None:
+                # Connections may be dropped while waiting, so try to open
+                # a new one again from time to time
+                try:
+                    session = self._sessions.get(timeout=_POOL_TIMEOUT)
+                except queue.Empty:
+                    pass
+        try:
+            yield session
+        except ftplib.all_errors:
+            # The connection may be broken, do not reuse it
+            with self._lock:
+                self._n_sessions -= 1
+            session.close()
+            raise
+        self._sessions.put(session)
+
+    def close(self):
+        """Close all connections of the pool used to download files."""
+        while True:
+            try:
+                session = self._sessions.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._n_sessions -= 1
+            try:
+                session.quit()
+            except ftplib.all_errors:
+                session.close()
+
     def set_cwd(self, path):
         """Set current working directory in the remote.
 
@@ -109,8 +209,7 @@ class FTPDownloader(BaseDownloader):
                 filename for filename in filenames
                 if expression.match(os.path.basename(filename))
             ]
-        for filename in filenames:
-            self.download_file(filename, sub_folder)
+        self.download_files(filenames, sub_folder)
 
     def download_file(self, server_path, sub_folder=''):
         """Download a file from the server.
@@ -122,18 +221,139 @@ class FTPDownloader(BaseDownloader):
         sub_folder : str, optional
             Name of the local subfolder to store the results in, by default ''
         """
-        os.makedirs(os.path.join(self.local_folder, sub_folder), exist_ok=True)
-        local_path = os.path.join(self.local_folder, sub_folder,
-                                  os.path.basename(server_path))
-        if not self.overwrite and os.path.isfile(local_path):
-            logger.info('File %s already downloaded. Skipping...', server_path)
-            return
-        logger.info('Downloading %s', server_path)
+        self.download_files([server_path], sub_folder)
+
+    def download_files(self, server_paths, sub_folder=''):
+        """Download several files from the server concurrently.
+
+        Files that have already been downloaded are skipped if their size
+        and modification time match the ones in the server, unless
+        `overwrite` is set.
+
+        Parameters
+        ----------
+        server_paths : list(str)
+            Paths to the files
+        sub_folder : str, optional
+            Name of the local subfolder to store the results in, by default ''
+        """
+        local_folder = os.path.join(self.local_folder, sub_folder)
+        os.makedirs(local_folder, exist_ok=True)
+        # Other connections do not share the working directory of the client
+        cwd = self._client.pwd()
+        server_paths = [posixpath.join(cwd, path) for path in server_paths]
+
+        try:
+            self._download_files(server_paths, local_folder)
+        finally:
+            self.close()
+
+    def _download_files(self, server_paths, local_folder):
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            stats = list(executor.map(self._stat, server_paths))
+            downloads = []
+            for server_path, (size, mtime) in zip(server_paths, stats):
+                local_path = os.path.join(local_folder,
+                                          posixpath.basename(server_path))
+                if not self.overwrite and _is_downloaded(
+                        local_path, size, mtime):
+                    logger.info('File %s already downloaded. Skipping...',
+                                server_path)
+                    continue
+                downloads.append((server_path, local_path, size, mtime))
+            if not downloads:
+                return
+
+            logger.info('Downloading %s files using %s connections',
+                        len(downloads), self.max_connections)
+            progress = _Progress(sum(size for (_, _, size, _) in downloads))
+            futures = [
+                executor.submit(self._download, *download, progress)
+                for download in downloads
+            ]
+            for future in as_completed(futures):
+                future.result()
+        progress.finish()
+
+    def _retry(self, function, *args):
+        """Call function, retrying once if the connection was lost.
+
+        Connections in the pool may have been closed by the server after
+        being idle for some time.
+        """
+        try:
+            return function(*args)
+        except _CONNECTION_ERRORS as ex:
+            logger.debug("Lost connection to %s (%s), retrying", self.server,
+                         ex)
+        return function(*args)
+
+    def _stat(self, server_path):
+        """Get size and modification time of a file in the server."""
+        return self._retry(self._get_stat, server_path)
+
+    def _get_stat(self, server_path):
+        with self._session() as session:
+            size = session.size(server_path)
+            try:
+                response = session.voidcmd(f'MDTM {server_path}')
+            except ftplib.error_perm:
+                mtime = None
+            else:
+                mtime = calendar.timegm(
+                    time.strptime(response[4:18], '%Y%m%d%H%M%S'))
+        return size, mtime
+
+    def _download(self, server_path, local_path, size, mtime, progress):
+        """Download a file, resuming a previous download if possible."""
+        self._retry(self._download_part, server_path, local_path, size, mtime,
+                    progress)
+        os.replace(f'{local_path}.part', local_path)
+        if mtime is not None:
+            os.utime(local_path, (mtime, mtime))
+
+    def _download_part(self, server_path, local_path, size, mtime, progress):
+        part_path = f'{local_path}.part'
+        offset = 0
+        if os.path.isfile(part_path):
+            offset = os.path.getsize(part_path)
+            modified = (mtime is not None
+                        and os.path.getmtime(part_path) < mtime)
+            if offset > size or modified:
+                offset = 0
+        if offset:
+            logger.info('Resuming download of %s at byte %s', server_path,
+                        offset)
+        else:
+            logger.info('Downloading %s', server_path)
         logger.debug('Downloading to %s', local_path)
+        progress.set_file_progress(server_path, offset)
+
+        with open(part_path, 'ab' if offset else 'wb') as file_handler:
+
+            def _file_write(data):
+                file_handler.write(data)
+                progress.update(server_path, len(data))
+
+            with self._session() as session:
+                session.retrbinary(f'RETR {server_path}',
+                                   _file_write,
+                                   rest=offset or None)
+
+
+def _is_downloaded(local_path, size, mtime):
+    """Check if a local file is a complete copy of a file in the server."""
+    if not os.path.isfile(local_path):
+        return False
+    if os.path.getsize(local_path) != size:
+        return False
+    return mtime is None or os.path.getmtime(local_path) >= mtime
+
 
-        self._client.sendcmd("TYPE i")
-        size = self._client.size(server_path)
+class _Progress:
+    """Thread-safe progress bar for the total size of several downloads."""
 
+    def __init__(self, total_size):
         widgets = [
             DataSize(),
             Bar(),
@@ -141,26 +361,32 @@ class FTPDownloader(BaseDownloader):
             FileTransferSpeed(), ' (',
             ETA(), ')'
         ]
-
-        progress = ProgressBar(max_value=size, widgets=widgets)
-        progress.start()
-
-        with open(local_path, 'wb') as file_handler:
-
-            def _file_write(data):
-                file_handler.write(data)
-                nonlocal progress
-                progress += len(data)
-
-            try:
-                self._client.retrbinary(f'RETR {server_path}', _file_write)
-            except Exception:
-                file_handler.close()
-                if os.path.exists(local_path):
-                    os.remove(local_path)
-                raise
-
-        progress.finish()
+        self._lock = threading.Lock()
+        self._files = {}
+        self._total = 0
+        self._bar = ProgressBar(max_value=total_size, widgets=widgets)
+        self._bar.start()
+
+    def set_file_progress(self, server_path, size):
+        """Set the downloaded size of a file, e.g. when (re)starting."""
+        with self._lock:
+            self._total += size - self._files.get(server_path, 0)
+            self._files[server_path] = size
+            self._refresh()
+
+    def update(self, server_path, size):
+        """Add the size of newly downloaded data of a file."""
+        with self._lock:
+            self._total += size
+            self._files[server_path] += size
+            self._refresh()
+
+    def _refresh(self):
+        self._bar.update(min(self._total, self._bar.max_value))
+
+    def finish(self):
+        """Finish the progress bar."""
+        self._bar.finish()
 
 
 class CCIDownloader(FTPDownloader):
@@ -156,15 +156,12 @@ def parse_cell_spec(spec):
     return dlon, dlat
 
 
-def _cmorize_dataset(in_file, var, cfg, out_dir):
+def _cmorize_dataset(in_file, var, definition, cfg, out_dir):
     logger.info("CMORizing variable '%s' from input file '%s'",
                 var['short_name'], in_file)
     attributes = deepcopy(cfg['attributes'])
     attributes['mip'] = var['mip']
 
-    cmor_table = cfg['cmor_table']
-    definition = cmor_table.get_variable(var['mip'], var['short_name'])
-
     cube = iris.load_cube(str(in_file),
                           constraint=NameConstraint(var_name=var['raw']))
 
@@ -258,15 +255,17 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
                     "regridding: %s", cfg['work_dir'])
         os.mkdir(cfg['work_dir'])
 
+    cmor_table = cfg.pop('cmor_table')
+    jobs = {}
     for short_name, var in cfg['variables'].items():
         var['short_name'] = short_name
         logger.info("Processing var %s", short_name)
+        definition = cmor_table.get_variable(var['mip'], short_name)
 
         # Regridding
         logger.info("Start regridding to: %s", cfg['custom']['regrid'])
         _regrid_dataset(in_dir, var, cfg)
         logger.info("Finished regridding")
-        logger.info("Start CMORizing")
 
         for year in range(1961, 2019):
             # File concatenation
@@ -275,12 +274,16 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
                     cfg['work_dir'], var['file'].format(year=year,
                                                         month=f"{month:02}"))
                 if os.path.isfile(in_file):
-                    # Read in the full dataset here from 'workdir'
-                    logger.info("Start CMORization of file %s", in_file)
-                    _cmorize_dataset(in_file, var, cfg, out_dir)
-                    logger.info("Finished processing %s-%s", year, month)
+                    jobs[(short_name, year, month)] = (in_file, var,
+                                                       definition, cfg,
+                                                       out_dir)
                 else:
                     logger.info("No files found for %s-%s", year, month)
-                    continue
 
-        logger.info("Finished CMORIZATION")
+    logger.info("Start CMORizing")
+    utils.run_jobs(_cmorize_dataset,
+                   jobs,
+                   cfg_user,
+                   job_memory=lambda in_file, *_: utils.estimate_memory(
+                       in_file))
+    logger.info("Finished CMORIZATION")
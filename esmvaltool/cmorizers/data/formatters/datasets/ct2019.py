@@ -144,9 +144,10 @@ def _load_cube(input_files, constraints):
     return cube
 
 
-def _extract_variable(short_name, var, cfg, input_files, out_dir):
+def _extract_variable(short_name, var, cmor_info, cfg, input_files,
+                      out_dir):
     """Extract variable."""
-    cmor_info = cfg['cmor_table'].get_variable(var['mip'], short_name)
+    logger.info("CMORizing variable '%s'", short_name)
 
     # Extract data
     constraint = var.get('raw_long_name', cmor_info.standard_name)
@@ -169,7 +170,7 @@ def _extract_variable(short_name, var, cfg, input_files, out_dir):
     utils.fix_coords(cube)
 
     # Fix metadata
-    attrs = cfg['attributes']
+    attrs = dict(cfg['attributes'])
     attrs['mip'] = var['mip']
     utils.fix_var_metadata(cube, cmor_info)
     utils.set_global_atts(cube, attrs)
@@ -185,7 +186,12 @@ def _extract_variable(short_name, var, cfg, input_files, out_dir):
 def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
     """Cmorization func call."""
     input_files = _get_input_files(in_dir, cfg)
+    cmor_table = cfg.pop('cmor_table')
+
     # Run the cmorization
+    jobs = {}
     for (short_name, var) in cfg['variables'].items():
-        logger.info("CMORizing variable '%s'", short_name)
-        _extract_variable(short_name, var, cfg, input_files, out_dir)
+        cmor_info = cmor_table.get_variable(var['mip'], short_name)
+        jobs[short_name] = (short_name, var, cmor_info, cfg, input_files,
+                            out_dir)
+    utils.run_jobs(_extract_variable, jobs, cfg_user)
@@ -94,17 +94,16 @@ For further details on obtaining daily values from ERA-Interim,
 import logging
 import re
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor, as_completed
 from copy import deepcopy
 from datetime import datetime, timedelta
-from os import cpu_count
 from pathlib import Path
 from warnings import catch_warnings, filterwarnings
 
+import dask.array as da
 import iris
 import numpy as np
 from esmvalcore.cmor.table import CMOR_TABLES
-from esmvalcore.preprocessor import daily_statistics, monthly_statistics
+from esmvalcore.preprocessor import monthly_statistics
 from iris import NameConstraint
 
 from esmvaltool.cmorizers.data import utilities as utils
@@ -244,6 +243,71 @@ def _compute_monthly(cube):
     return cube
 
 
+def _get_time_delta(time_coord, delta):
+    """Convert a :class:`datetime.timedelta` to the units of a time coord."""
+    origin = time_coord.units.num2date(0)
+    return time_coord.units.date2num(origin + delta)
+
+
+def _get_day_index(time_coord):
+    """Get the index of the day of each time point.
+
+    Returns
+    -------
+    tuple
+        Numerical time point of the midnight before the first time step,
+        length of a day in the units of the time coordinate and the day
+        index of every time point relative to that midnight.
+    """
+    one_day = _get_time_delta(time_coord, timedelta(days=1))
+    first = time_coord.units.num2date(time_coord.points[0])
+    midnight = time_coord.units.date2num(
+        first.replace(hour=0, minute=0, second=0, microsecond=0))
+    day_idx = np.floor((time_coord.points - midnight) / one_day).astype(int)
+    return (midnight, one_day, day_idx)
+
+
+def _daily_aggregate(cube, operator):
+    """Compute daily statistics on numeric time points with dask.
+
+    Time steps are assigned to days using the numerical time points, and
+    each day is reduced lazily, so the data is never fully realized.
+    """
+    time_coord = cube.coord('time')
+    time_dim = cube.coord_dims(time_coord)[0]
+    (midnight, one_day, day_idx) = _get_day_index(time_coord)
+    (days, starts) = np.unique(day_idx, return_index=True)
+    stops = np.append(starts[1:], len(day_idx))
+    if np.any(np.diff(day_idx) < 0):
+        raise ValueError(f"Time points of {cube.var_name} are not sorted")
+
+    (function, aggregator) = {
+        'max': (da.max, iris.analysis.MAX),
+        'min': (da.min, iris.analysis.MIN),
+        'sum': (da.sum, iris.analysis.SUM),
+        'mean': (da.mean, iris.analysis.MEAN),
+    }[operator]
+    data = cube.lazy_data()
+    index = (slice(None), ) * time_dim
+    daily_data = [
+        function(data[index + (slice(start, stop), )], axis=time_dim)
+        for (start, stop) in zip(starts, stops)
+    ]
+    daily_data = da.stack(daily_data, axis=time_dim)
+
+    result = cube[index + (starts, )]
+    result.data = daily_data
+    result.coord('time').points = (midnight + days * one_day +
+                                   _get_time_delta(time_coord,
+                                                   timedelta(hours=12)))
+    result.coord('time').bounds = None
+    result.coord('time').guess_bounds()
+    result.add_cell_method(
+        iris.coords.CellMethod(aggregator.cell_method,
+                               coords=['day_of_year', 'year']))
+    return result
+
+
 def _compute_daily(cube):
     """Convert various frequencies to daily frequency.
 
@@ -263,15 +327,14 @@ def _compute_daily(cube):
             'rss',
             'prsn',
     }:
-        cube.coord('time').points = cube.coord('time').units.date2num([
-            cell.point - timedelta(seconds=1)
-            for cell in cube.coord('time').cells()
-        ])
+        time_coord = cube.coord('time')
+        time_coord.points = time_coord.points - _get_time_delta(
+            time_coord, timedelta(seconds=1))
 
     if cube.var_name == 'tasmax':
-        cube = daily_statistics(cube, 'max')
+        cube = _daily_aggregate(cube, 'max')
     elif cube.var_name == 'tasmin':
-        cube = daily_statistics(cube, 'min')
+        cube = _daily_aggregate(cube, 'min')
     elif cube.var_name in {
             'pr',
             'rsds',
@@ -282,17 +345,9 @@ def _compute_daily(cube):
             'rss',
             'prsn',
     }:
-        cube = daily_statistics(cube, 'sum')
+        cube = _daily_aggregate(cube, 'sum')
     else:
-        cube = daily_statistics(cube, 'mean')
-
-    # Correct the time coordinate
-    cube.coord('time').points = cube.coord('time').units.date2num([
-        cell.point.replace(hour=12, minute=0, second=0, microsecond=0)
-        for cell in cube.coord('time').cells()
-    ])
-    cube.coord('time').bounds = None
-    cube.coord('time').guess_bounds()
+        cube = _daily_aggregate(cube, 'mean')
 
     return cube
 
@@ -437,7 +492,7 @@ def _extract_variable(in_files, var, cfg, out_dir):
 
     logger.debug("Saving cube\n%s", cube)
     logger.debug("Expected output size is %.1fGB",
-                 np.prod(cube.shape) * 4 / 2**30)
+                 _get_output_size(cube.shape) / 2**30)
     utils.save_variable(
         cube,
         cube.var_name,
@@ -448,6 +503,30 @@ def _extract_variable(in_files, var, cfg, out_dir):
     logger.info("Finished CMORizing %s", ', '.join(in_files))
 
 
+def _get_output_size(shape):
+    """Get the size in bytes of float32 data with the given shape."""
+    return int(np.prod(shape)) * 4
+
+
+def _estimate_output_size(in_files, var):
+    """Estimate the size of the output of a job without loading the data."""
+    cube = _load_cube(in_files, var)
+    shape = list(cube.shape)
+    if cube.coords('time', dim_coords=True):
+        time_coord = cube.coord('time')
+        time_dim = cube.coord_dims(time_coord)[0]
+        if 'fx' in var['mip']:
+            shape.pop(time_dim)
+        elif 'day' in var['mip']:
+            shape[time_dim] = len(np.unique(_get_day_index(time_coord)[2]))
+        elif 'mon' in var['mip']:
+            (start, end) = time_coord.units.num2date(
+                time_coord.points[[0, -1]])
+            shape[time_dim] = ((end.year - start.year) * 12 + end.month -
+                               start.month + 1)
+    return _get_output_size(shape)
+
+
 def _get_in_files_by_year(in_dir, var):
     """Find input files by year."""
     if 'file' in var:
@@ -468,28 +547,7 @@ def _get_in_files_by_year(in_dir, var):
                 len(var['files']), ', '.join(in_files[year]))
             in_files.pop(year)
 
-    return in_files.values()
-
-
-def _run(jobs, n_workers):
-    """Run CMORization jobs using n_workers."""
-    if n_workers == 1:
-        for job in jobs:
-            _extract_variable(*job)
-    else:
-        with ProcessPoolExecutor(max_workers=n_workers) as executor:
-            futures = {}
-            for job in jobs:
-                future = executor.submit(_extract_variable, *job)
-                futures[future] = job[0]
-
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except:  # noqa
-                    logger.error("Failed to CMORize %s",
-                                 ', '.join(futures[future]))
-                    raise
+    return in_files
 
 
 def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
@@ -498,16 +556,22 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
         year=datetime.now().year)
     cfg.pop('cmor_table')
 
-    n_workers = cfg_user.get('max_parallel_tasks')
-    if n_workers is None:
-        n_workers = int(cpu_count() / 1.5)
-    logger.info("Using at most %s workers", n_workers)
-
-    jobs = []
+    jobs = {}
     for short_name, var in cfg['variables'].items():
         if 'short_name' not in var:
             var['short_name'] = short_name
-        for in_files in _get_in_files_by_year(in_dir, var):
-            jobs.append([in_files, var, cfg, out_dir])
+        for year, in_files in _get_in_files_by_year(in_dir, var).items():
+            jobs[(short_name, year)] = (in_files, var, cfg, out_dir)
+
+    # The data is processed lazily, so the memory needed by a job is
+    # determined by the size of its output. The size is estimated once per
+    # variable, the yearly files of a variable have the same shape.
+    output_sizes = {}
+
+    def job_memory(in_files, var, *_):
+        key = (var['short_name'], var['mip'])
+        if key not in output_sizes:
+            output_sizes[key] = _estimate_output_size(in_files, var)
+        return output_sizes[key]
 
-    _run(jobs, n_workers)
+    utils.run_jobs(_extract_variable, jobs, cfg_user, job_memory=job_memory)
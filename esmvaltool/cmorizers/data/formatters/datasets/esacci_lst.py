@@ -27,7 +27,7 @@ from calendar import monthrange
 
 import iris
 
-from ...utilities import fix_coords, save_variable
+from ...utilities import fix_coords, run_jobs, save_variable
 
 logger = logging.getLogger(__name__)
 
@@ -41,53 +41,59 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
 
     # vals has the info from the yml file
     # var is set up in the yml file
+    jobs = {}
     for var, vals in cfg['variables'].items():
         # leave this loop in as might be useful in
         # the future for getting other info
         # like uncertainty information from the original files
 
-        glob_attrs['mip'] = vals['mip']
+        attrs = dict(glob_attrs, mip=vals['mip'])
 
         for key in vals.keys():
             logger.info("%s %s", key, vals[key])
 
-        variable = vals['raw']
-        # not currently used, but referenced for future
-        # platform = 'MODISA'
-
         # loop over years and months
         # get years from start_year and end_year
         # note 2003 doesn't start until July so not included at this stage
         for year in range(vals['start_year'], vals['end_year'] + 1):
-            this_years_cubes = iris.cube.CubeList()
-            for month0 in range(12):  # Change this in final version
-                month = month0 + 1
-                logger.info(month)
-                day_cube, night_cube = load_cubes(in_dir, vals['file_day'],
-                                                  vals['file_night'], year,
-                                                  month, variable)
-
-                monthly_cube = make_monthly_average(day_cube, night_cube, year,
-                                                    month)
-
-                # use CMORizer utils
-                monthly_cube = fix_coords(monthly_cube)
-
-                this_years_cubes.append(monthly_cube)
-
-            # Use utils save
-            # This seems to save files all with the same name!
-            # Fixed by making yearly files
-            this_years_cubes = this_years_cubes.merge_cube()
-            this_years_cubes.long_name = 'Surface Temperature'
-            this_years_cubes.standard_name = 'surface_temperature'
-
-            save_variable(
-                this_years_cubes,
-                var,
-                out_dir,
-                glob_attrs,
-            )
+            jobs[(var, year)] = (in_dir, out_dir, var, vals, attrs, year)
+    run_jobs(_extract_year, jobs, cfg_user)
+
+
+def _extract_year(in_dir, out_dir, var, vals, attrs, year):
+    """CMORize one year of a variable."""
+    variable = vals['raw']
+    # not currently used, but referenced for future
+    # platform = 'MODISA'
+
+    this_years_cubes = iris.cube.CubeList()
+    for month0 in range(12):  # Change this in final version
+        month = month0 + 1
+        logger.info(month)
+        day_cube, night_cube = load_cubes(in_dir, vals['file_day'],
+                                          vals['file_night'], year, month,
+                                          variable)
+
+        monthly_cube = make_monthly_average(day_cube, night_cube, year, month)
+
+        # use CMORizer utils
+        monthly_cube = fix_coords(monthly_cube)
+
+        this_years_cubes.append(monthly_cube)
+
+    # Use utils save
+    # This seems to save files all with the same name!
+    # Fixed by making yearly files
+    this_years_cubes = this_years_cubes.merge_cube()
+    this_years_cubes.long_name = 'Surface Temperature'
+    this_years_cubes.standard_name = 'surface_temperature'
+
+    save_variable(
+        this_years_cubes,
+        var,
+        out_dir,
+        attrs,
+    )
 
 
 def load_cubes(in_dir, file_day, file_night, year, month, variable):
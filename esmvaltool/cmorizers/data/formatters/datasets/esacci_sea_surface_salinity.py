@@ -24,6 +24,7 @@ from iris.util import equalise_attributes, unify_time_units
 
 from esmvaltool.cmorizers.data.utilities import (
     fix_var_metadata,
+    run_jobs,
     save_variable,
     set_global_atts,
 )
@@ -39,8 +40,8 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
                 glob_attrs['tier'], glob_attrs['dataset_id'])
     logger.info("Input data from: %s", in_dir)
     logger.info("Output will be written to: %s", out_dir)
+    jobs = {}
     for version in glob_attrs['versions']:
-        logger.info('Cmorizing version %s', version)
         file_expr = os.path.join(
             in_dir,
             "ESACCI-SEASURFACESALINITY-L4-SSS-MERGED_OI_Monthly_CENTRED_15Day_"
@@ -48,15 +49,21 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
 
         for var, vals in cfg['variables'].items():
             var_info = cfg['cmor_table'].get_variable(vals['mip'], var)
-            logger.info('Cmorizing var %s', var)
-            cubes = iris.load_raw(file_expr, vals['raw'])
-            equalise_attributes(cubes)
-            unify_time_units(cubes)
-            cube = cubes.concatenate_cube()
-            cube.units = '0.001'
-            logger.info(cube)
-            glob_attrs['mip'] = vals['mip']
-            glob_attrs['version'] = version
-            fix_var_metadata(cube, var_info)
-            set_global_atts(cube, glob_attrs)
-            save_variable(cube, var, out_dir, glob_attrs)
+            attrs = dict(glob_attrs, mip=vals['mip'], version=version)
+            jobs[(version, var)] = (file_expr, var, vals, var_info, attrs,
+                                    out_dir)
+    run_jobs(_extract_variable, jobs, cfg_user)
+
+
+def _extract_variable(file_expr, var, vals, var_info, attrs, out_dir):
+    """CMORize one version of a variable."""
+    logger.info('Cmorizing var %s (version %s)', var, attrs['version'])
+    cubes = iris.load_raw(file_expr, vals['raw'])
+    equalise_attributes(cubes)
+    unify_time_units(cubes)
+    cube = cubes.concatenate_cube()
+    cube.units = '0.001'
+    logger.info(cube)
+    fix_var_metadata(cube, var_info)
+    set_global_atts(cube, attrs)
+    save_variable(cube, var, out_dir, attrs)
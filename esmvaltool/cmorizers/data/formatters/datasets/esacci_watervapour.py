@@ -30,6 +30,7 @@ from ...utilities import (
     convert_timeunits,
     fix_coords,
     fix_var_metadata,
+    run_jobs,
     save_variable,
     set_global_atts,
 )
@@ -58,34 +59,42 @@ def extract_variable(var_info, raw_info, attrs, year):
     return cube
 
 
+def _extract_year(var, var_info, raw_info, attrs, year, out_dir):
+    """CMORize one year of a variable."""
+    months = ["0" + str(mo) for mo in range(1, 10)] + ["10", "11", "12"]
+    monthly_cubes = []
+    for month in months:
+        month_info = dict(raw_info,
+                          file=raw_info['file'].format(year=year,
+                                                       month=month))
+        logger.info("CMORizing var %s from file type %s", var,
+                    month_info['file'])
+        monthly_cubes.append(
+            extract_variable(var_info, month_info, attrs, year))
+    yearly_cube = concatenate(monthly_cubes)
+    # Fix monthly time bounds
+    time = yearly_cube.coord('time')
+    time.bounds = _get_time_bounds(time, 'mon')
+    save_variable(yearly_cube,
+                  var,
+                  out_dir,
+                  attrs,
+                  unlimited_dimensions=['time'])
+
+
 def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
     """Cmorize data."""
-    # cmor_table = cfg['cmor_table']
     glob_attrs = cfg['attributes']
 
     # run the cmorization
+    jobs = {}
     for var, vals in cfg['variables'].items():
         var_info = cfg['cmor_table'].get_variable(vals['mip'], var)
-        glob_attrs['mip'] = vals['mip']
-        raw_info = {'name': vals['raw'], 'file': vals['file']}
+        attrs = dict(glob_attrs, mip=vals['mip'])
         inpfile = os.path.join(in_dir, cfg['filename'])
+        raw_info = {'name': vals['raw'], 'file': inpfile}
         logger.info("CMORizing var %s from file type %s", var, inpfile)
-        # years = range(vals['start_year'], vals['end_year'] + 1)
-        months = ["0" + str(mo) for mo in range(1, 10)] + ["10", "11", "12"]
         for year in range(vals['start_year'], vals['end_year'] + 1):
-            monthly_cubes = []
-            for month in months:
-                raw_info['file'] = inpfile.format(year=year, month=month)
-                logger.info("CMORizing var %s from file type %s", var,
-                            raw_info['file'])
-                monthly_cubes.append(
-                    extract_variable(var_info, raw_info, glob_attrs, year))
-            yearly_cube = concatenate(monthly_cubes)
-            # Fix monthly time bounds
-            time = yearly_cube.coord('time')
-            time.bounds = _get_time_bounds(time, 'mon')
-            save_variable(yearly_cube,
-                          var,
-                          out_dir,
-                          glob_attrs,
-                          unlimited_dimensions=['time'])
+            jobs[(var, year)] = (var, var_info, raw_info, attrs, year,
+                                 out_dir)
+    run_jobs(_extract_year, jobs, cfg_user)
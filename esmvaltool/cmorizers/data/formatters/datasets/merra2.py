@@ -279,6 +279,7 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
         end_date = 2022
     else:
         end_date = end_date.year
+    jobs = {}
     for year in range(start_date, end_date + 1):
         for short_name, var in cfg['variables'].items():
             if 'short_name' not in var:
@@ -289,4 +290,10 @@ def cmorization(in_dir, out_dir, cfg, cfg_user, start_date, end_date):
             if not in_files:
                 logger.warning('Year %s data not found', year)
                 continue
-            _extract_variable(in_files, var, cfg, out_dir)
+            jobs[(short_name, year)] = (in_files, var, cfg, out_dir)
+
+    utils.run_jobs(_extract_variable,
+                   jobs,
+                   cfg_user,
+                   job_memory=lambda in_files, *_: utils.estimate_memory(
+                       in_files))
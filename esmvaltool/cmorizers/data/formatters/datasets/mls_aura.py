@@ -30,7 +30,6 @@ import iris
 import iris.coord_categorisation
 import netCDF4
 import numpy as np
-import pandas as pd
 from cf_units import Unit
 
 from esmvaltool.cmorizers.data import utilities as utils
@@ -228,30 +227,11 @@ def _get_gridded_data(variable, nc_rhi, nc_loc, nc_t, filename):
         lat = lat[:-4]
         lon = lon[:-4]
 
-    # Place on 1x1 degree grid
+    # Place on 1x1 degree grid and calculate daily mean of all levels
     lat = np.around(lat)
     lon = np.around(lon)
-
-    # Iterate over pressure levels
-    gridded_data = []
-    for (p_idx, _) in enumerate(pressure):
-        data_frame = pd.DataFrame({
-            'lat': lat,
-            'lon': lon,
-            'data': data[:, p_idx].filled(np.nan),
-        })
-
-        # Create daily-mean gridded data using pivot table
-        data_frame = pd.pivot_table(data_frame,
-                                    values='data',
-                                    index='lat',
-                                    columns='lon',
-                                    aggfunc=np.mean,
-                                    dropna=False)
-        data_frame = data_frame.reindex(index=ALL_LATS, columns=ALL_LONS)
-        gridded_data.append(data_frame.values)
-    gridded_data = np.expand_dims(np.array(gridded_data), 0)
-    gridded_data = np.ma.masked_invalid(gridded_data)
+    gridded_data = utils.bin_to_grid(lat, lon, data, ALL_LATS, ALL_LONS)
+    gridded_data = np.expand_dims(gridded_data, 0)
 
     return (gridded_data, time, pressure)
 
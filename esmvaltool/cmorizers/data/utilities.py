@@ -1,15 +1,23 @@
 """Utils module for Python cmorizers."""
 import datetime
+import functools
 import gzip
 import logging
+import logging.handlers
+import multiprocessing
 import os
 import re
 import shutil
+import tarfile
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from contextlib import contextmanager
 from pathlib import Path
 
 import iris
 import numpy as np
+import psutil
 import yaml
 from cf_units import Unit
 from dask import array as da
@@ -296,11 +304,127 @@ def read_cmor_config(dataset):
     return cfg
 
 
-def save_variable(cube, var, outdir, attrs, **kwargs):
+OUTPUT_PROFILES = {
+    'default': {},
+    'compressed': {
+        'zlib': True,
+        'complevel': 4,
+        'shuffle': True,
+    },
+    'timeseries': {
+        'zlib': True,
+        'complevel': 4,
+        'shuffle': True,
+        'chunks': 'timeseries',
+    },
+    'map': {
+        'zlib': True,
+        'complevel': 4,
+        'shuffle': True,
+        'chunks': 'map',
+    },
+}
+"""Predefined output profiles for :func:`save_variable`."""
+
+_CHUNK_BYTES = 2**22
+
+
+@functools.lru_cache()
+def get_output_profile(dataset):
+    """Get the output profile of a dataset.
+
+    The profile is selected in the ``output`` section of the dataset's
+    configuration file in ``cmor_config``, e.g.
+
+    .. code-block:: yaml
+
+        output:
+          profile: timeseries
+          complevel: 6
+          split_by_year: true
+
+    ``profile`` is one of the names in :data:`OUTPUT_PROFILES`. The other
+    keys override the settings of the profile: ``zlib``, ``complevel`` and
+    ``shuffle`` are passed to :func:`iris.save`, ``chunks`` is either
+    ``timeseries``, ``map`` or a mapping from coordinate names to chunk
+    sizes (-1 for the full dimension), and ``split_by_year`` saves one
+    file per year.
+
+    Parameters
+    ----------
+    dataset: str
+        Name of the dataset.
+
+    Returns
+    -------
+    dict
+        Output settings.
+    """
+    cfg_file = os.path.join(os.path.dirname(__file__), 'cmor_config',
+                            f'{dataset}.yml')
+    output = {}
+    if os.path.isfile(cfg_file):
+        with open(cfg_file, 'r', encoding='utf-8') as file:
+            output = dict((yaml.safe_load(file) or {}).get('output', {}))
+    profile_name = output.pop('profile', 'default')
+    if profile_name not in OUTPUT_PROFILES:
+        raise ValueError(
+            f"Unknown output profile '{profile_name}' for dataset "
+            f"{dataset}, choose from {', '.join(OUTPUT_PROFILES)}")
+    profile = dict(OUTPUT_PROFILES[profile_name])
+    profile.update(output)
+    return profile
+
+
+def _get_chunksizes(cube, chunks):
+    """Get the netCDF chunk shape of a cube."""
+    if not cube.ndim:
+        return None
+    shape = list(cube.shape)
+    try:
+        time_dims = cube.coord_dims('time')
+    except iris.exceptions.CoordinateNotFoundError:
+        time_dims = ()
+    if isinstance(chunks, dict):
+        chunksizes = list(shape)
+        for (name, size) in chunks.items():
+            for dim in cube.coord_dims(name):
+                if size != -1:
+                    chunksizes[dim] = min(size, shape[dim])
+        return chunksizes
+    if not time_dims:
+        return None
+    time_dim = time_dims[0]
+    if chunks == 'map':
+        chunksizes = list(shape)
+        chunksizes[time_dim] = 1
+        return chunksizes
+    if chunks != 'timeseries':
+        raise ValueError(f"Unknown chunks '{chunks}', expected 'map', "
+                         f"'timeseries' or a mapping of coordinate names to "
+                         f"sizes")
+    # Full time series in each chunk, split other dimensions until the
+    # chunk is small enough to be read efficiently
+    chunksizes = list(shape)
+    max_elements = max(_CHUNK_BYTES // cube.dtype.itemsize, 1)
+    other_dims = [d for d in range(len(shape)) if d != time_dim]
+    while np.prod(chunksizes) > max_elements:
+        dim = max(other_dims, key=lambda d: chunksizes[d], default=None)
+        if dim is None or chunksizes[dim] == 1:
+            chunksizes[time_dim] = max(max_elements, 1)
+            break
+        chunksizes[dim] = (chunksizes[dim] + 1) // 2
+    return chunksizes
+
+
+def save_variable(cube, var, outdir, attrs, output_profile=None, **kwargs):
     """Saver function.
 
     Saves iris cubes (data variables) in CMOR-standard named files.
 
+    The compression, chunking and splitting of the files are selected by
+    the output profile of the dataset, see :func:`get_output_profile`.
+
     Parameters
     ----------
     cube: iris.cube.Cube
@@ -316,9 +440,46 @@ def save_variable(cube, var, outdir, attrs, **kwargs):
         dictionary holding cube metadata attributes like
         project_id, version etc.
 
+    output_profile: dict, optional
+        Output settings to use instead of the profile of the dataset.
+
     **kwargs: kwargs
-        Keyword arguments to be passed to `iris.save`
+        Keyword arguments to be passed to `iris.save`. These take precedence
+        over the settings of the output profile.
     """
+    if output_profile is None:
+        output_profile = get_output_profile(attrs.get('dataset_id'))
+    profile = dict(output_profile)
+    split_by_year = profile.pop('split_by_year', False)
+    chunks = profile.pop('chunks', None)
+    profile.update(kwargs)
+    cubes = [cube]
+    if split_by_year and cube.coords('time', dim_coords=True):
+        cubes = _split_by_year(cube)
+    for sub_cube in cubes:
+        save_kwargs = dict(profile)
+        if chunks is not None and 'chunksizes' not in save_kwargs:
+            chunksizes = _get_chunksizes(sub_cube, chunks)
+            if chunksizes is not None:
+                save_kwargs['chunksizes'] = chunksizes
+        _save_variable(sub_cube, var, outdir, attrs, **save_kwargs)
+
+
+def _split_by_year(cube):
+    """Split a cube into one cube per year."""
+    years = np.array(
+        [cell.point.year for cell in cube.coord('time').cells()])
+    time_dim = cube.coord_dims('time')[0]
+    cubes = []
+    for year in np.unique(years):
+        index = [slice(None)] * cube.ndim
+        index[time_dim] = np.flatnonzero(years == year)
+        cubes.append(cube[tuple(index)])
+    return cubes
+
+
+def _save_variable(cube, var, outdir, attrs, **kwargs):
+    """Save a cube in a CMOR-standard named file using `iris.save`."""
     fix_dtype(cube)
     # CMOR standard
     try:
@@ -356,6 +517,244 @@ def save_variable(cube, var, outdir, attrs, **kwargs):
     iris.save(cube, file_path, fill_value=1e20, **kwargs)
 
 
+def get_n_workers(cfg_user, n_jobs=None):
+    """Get the number of worker processes for CMORization jobs.
+
+    Parameters
+    ----------
+    cfg_user: dict
+        User configuration. The number of workers is given by
+        ``max_parallel_tasks``; if this is not set, jobs are run serially
+        (one worker).
+    n_jobs: int, optional
+        Number of jobs to run. If given, no more workers than jobs are
+        used.
+
+    Returns
+    -------
+    int
+        Number of worker processes.
+    """
+    n_workers = cfg_user.get('max_parallel_tasks')
+    if n_workers is None:
+        n_workers = 1
+    if n_jobs is not None:
+        n_workers = min(n_workers, n_jobs)
+    return max(n_workers, 1)
+
+
+def estimate_memory(in_files, factor=2.0):
+    """Estimate the memory needed to CMORize a set of input files.
+
+    Parameters
+    ----------
+    in_files: str or list of str
+        Input file(s).
+    factor: float, optional (default: 2.0)
+        Ratio between the memory used during CMORization and the size of
+        the input files on disk.
+
+    Returns
+    -------
+    int
+        Estimated memory in bytes.
+    """
+    if isinstance(in_files, (str, Path)):
+        in_files = [in_files]
+    return int(factor * sum(os.path.getsize(f) for f in in_files))
+
+
+def _get_log_level():
+    """Get lowest level of log messages handled by the root logger."""
+    root_logger = logging.getLogger()
+    handler_levels = [handler.level for handler in root_logger.handlers]
+    return max(root_logger.getEffectiveLevel(),
+               min(handler_levels, default=logging.NOTSET))
+
+
+def _configure_worker_logging(queue, log_level):
+    """Send all log records of a worker process to the main process."""
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.addHandler(logging.handlers.QueueHandler(queue))
+    root_logger.setLevel(log_level)
+
+
+class _LogRecordForwarder(logging.Handler):
+    """Handle log records of worker processes by their original loggers."""
+
+    def emit(self, record):
+        """Pass record to the handlers of the logger that created it."""
+        record_logger = logging.getLogger(record.name)
+        if record_logger.isEnabledFor(record.levelno):
+            record_logger.handle(record)
+
+
+def run_jobs(function, jobs, cfg_user, job_memory=None):
+    """Run CMORization jobs in parallel.
+
+    Jobs are run in a pool of worker processes whose size is given by
+    :func:`get_n_workers`. Log messages of the workers are passed to the
+    handlers of the calling process (e.g., the console and the log file of
+    the dataset). If an estimate of the memory needed by each job
+    is given, a new job is only started if it fits into the memory that is
+    available next to the jobs that are already running.
+
+    Note
+    ----
+    The available memory is only determined once when this function is
+    called, i.e., the memory limit only covers the memory that was free at
+    that time. Memory used by other processes afterwards (e.g., by other
+    datasets CMORized in parallel) is not taken into account. Since the
+    pool is created within each dataset, CMORizing multiple datasets in
+    parallel (option ``--jobs``) may start up to ``jobs`` times
+    ``max_parallel_tasks`` worker processes; reduce ``max_parallel_tasks``
+    accordingly in this case.
+
+    Parameters
+    ----------
+    function: callable
+        Function that CMORizes a single unit of work, e.g. one variable for
+        one year. Needs to be defined at module level so it can be pickled.
+    jobs: dict
+        Jobs to run. Keys describe the job, e.g. ``(short_name, year)``,
+        values are the :obj:`tuple` of arguments for `function`.
+    cfg_user: dict
+        User configuration.
+    job_memory: callable, optional
+        Function that returns the estimated memory (in bytes) needed by a
+        job given its arguments, see e.g. :func:`estimate_memory`.
+
+    Raises
+    ------
+    Exception
+        The first exception raised by any of the jobs.
+    """
+    n_workers = get_n_workers(cfg_user, len(jobs))
+    logger.info("Running %i CMORization jobs using %i workers", len(jobs),
+                n_workers)
+    if n_workers == 1:
+        for args in jobs.values():
+            function(*args)
+        return
+
+    # Use fresh interpreters, forking a process that has already used
+    # threads (e.g. through dask) may deadlock
+    mp_context = multiprocessing.get_context('spawn')
+    log_queue = mp_context.Queue()
+    listener = logging.handlers.QueueListener(log_queue,
+                                              _LogRecordForwarder())
+    listener.start()
+    try:
+        _run_jobs_in_pool(function, jobs, n_workers, job_memory, mp_context,
+                          log_queue)
+    finally:
+        listener.stop()
+
+
+def _run_jobs_in_pool(function, jobs, n_workers, job_memory, mp_context,
+                      log_queue):
+    """Run CMORization jobs in a pool of worker processes."""
+    pending = deque(jobs.items())
+    running = {}
+    available_memory = psutil.virtual_memory().available
+    with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=mp_context,
+            initializer=_configure_worker_logging,
+            initargs=(log_queue, _get_log_level()),
+    ) as executor:
+        while pending or running:
+            while pending and len(running) < n_workers:
+                (name, args) = pending[0]
+                memory = 0 if job_memory is None else job_memory(*args)
+                used_memory = sum(m for (_, m) in running.values())
+                if running and used_memory + memory > available_memory:
+                    logger.debug(
+                        "Delaying job %s, estimated memory %.1f GiB does "
+                        "not fit into available memory", name, memory / 2**30)
+                    break
+                pending.popleft()
+                future = executor.submit(function, *args)
+                running[future] = (name, memory)
+
+            (done, _) = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                (name, _) = running.pop(future)
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("Failed to CMORize %s", name)
+                    for pending_future in running:
+                        pending_future.cancel()
+                    raise
+
+
+def _get_grid_index(values, grid):
+    """Get index of `values` in sorted `grid`, -1 for values not in grid."""
+    values = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+    grid = np.asarray(grid)
+    idx = np.clip(np.searchsorted(grid, values), 0, len(grid) - 1)
+    return np.where(grid[idx] == values, idx, -1)
+
+
+def bin_to_grid(lat, lon, data, grid_lats, grid_lons):
+    """Average point (e.g. swath) data on a regular latitude-longitude grid.
+
+    Each point is assigned to the grid cell whose coordinates are equal to
+    the latitude and longitude of the point, so the coordinates usually need
+    to be rounded to the grid first. Points that do not lie on the grid and
+    masked or NaN values are ignored. All levels are binned at once.
+
+    Parameters
+    ----------
+    lat: numpy.ndarray
+        Latitudes of the points, shape ``(n_points,)``.
+    lon: numpy.ndarray
+        Longitudes of the points, shape ``(n_points,)``.
+    data: numpy.ndarray or numpy.ma.MaskedArray
+        Data of the points, shape ``(n_points,)`` or
+        ``(n_points, n_levels)``.
+    grid_lats: numpy.ndarray
+        Sorted latitudes of the grid.
+    grid_lons: numpy.ndarray
+        Sorted longitudes of the grid.
+
+    Returns
+    -------
+    numpy.ma.MaskedArray
+        Mean of all points in each grid cell with shape
+        ``(n_levels, n_lats, n_lons)`` (``(n_lats, n_lons)`` for
+        one-dimensional `data`). Empty grid cells are masked.
+    """
+    data = np.ma.filled(np.ma.asarray(data, dtype=np.float64), np.nan)
+    squeeze = data.ndim == 1
+    if squeeze:
+        data = data[:, np.newaxis]
+    (n_lats, n_lons) = (len(grid_lats), len(grid_lons))
+    n_cells = n_lats * n_lons
+    n_levels = data.shape[1]
+
+    lat_idx = _get_grid_index(lat, grid_lats)
+    lon_idx = _get_grid_index(lon, grid_lons)
+    on_grid = (lat_idx >= 0) & (lon_idx >= 0)
+    cells = lat_idx[on_grid] * n_lons + lon_idx[on_grid]
+    data = data[on_grid]
+
+    # Combined index of level and grid cell of every valid value
+    valid = ~np.isnan(data)
+    index = (np.arange(n_levels) * n_cells + cells[:, np.newaxis])[valid]
+    size = n_levels * n_cells
+    sums = np.bincount(index, weights=data[valid], minlength=size)
+    counts = np.bincount(index, minlength=size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+    mean = np.ma.masked_invalid(mean.reshape(n_levels, n_lats, n_lons))
+    if squeeze:
+        mean = mean[0]
+    return mean
+
+
 def extract_doi_value(tags):
     """Extract doi(s) from a bibtex entry."""
     reference_doi = []
@@ -525,54 +924,190 @@ def set_units(cube, units):
     return cube
 
 
-def unpack_files_in_folder(folder):
+_ARCHIVE_EXTENSIONS = ('.gz', '.tgz', '.tar')
+_COPY_BUFFER_SIZE = 2**20
+
+
+def _is_archive(filename):
+    filename = os.path.basename(filename)
+    return (not filename.startswith('.')
+            and filename.endswith(_ARCHIVE_EXTENSIONS))
+
+
+def _get_gzip_info(archive):
+    """Get uncompressed size and modification time of a gzip file.
+
+    Both are read from the header and trailer of the file without
+    decompressing it. The modification time is None if it is not stored.
+    """
+    with open(archive, 'rb') as file:
+        header = file.read(8)
+        file.seek(-4, os.SEEK_END)
+        size = int.from_bytes(file.read(4), 'little')
+    mtime = int.from_bytes(header[4:8], 'little') or None
+    return size, mtime
+
+
+def _is_unpacked(target, size, mtime):
+    """Check if `target` is a complete copy of an archive member."""
+    if not os.path.isfile(target):
+        return False
+    # The gzip format only stores the size modulo 2**32
+    if os.path.getsize(target) % 2**32 != size % 2**32:
+        return False
+    return mtime is None or int(os.path.getmtime(target)) == int(mtime)
+
+
+def _write_stream(f_in, target, mtime):
+    """Write a stream to `target` atomically, so complete files exist.
+
+    The data is first written to a temporary file unique to this process,
+    which then replaces `target` (e.g., an outdated file from a previous
+    run).
+    """
+    (handle, part_file) = tempfile.mkstemp(
+        suffix='.part',
+        prefix=f'.{os.path.basename(target)}.',
+        dir=os.path.dirname(target),
+    )
+    try:
+        with os.fdopen(handle, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out, _COPY_BUFFER_SIZE)
+        if mtime is not None:
+            os.utime(part_file, (mtime, mtime))
+        os.replace(part_file, target)
+    except BaseException:
+        os.remove(part_file)
+        raise
+
+
+def _unpack_archive(archive, folder):
+    """Unpack a single archive into `folder` and remove it.
+
+    Members of tar files are streamed directly to their flattened
+    destination. Outputs that already exist are not unpacked again if their
+    size and modification time match the ones in the archive; otherwise,
+    they are replaced. An error is raised if several members of a tar file
+    have the same name.
+
+    Returns
+    -------
+    list of str
+        Paths of the unpacked files.
+    """
+    unpacked = []
+    if archive.endswith(('.tar', '.tgz', '.tar.gz')):
+        with tarfile.open(archive, 'r|*') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                target = os.path.join(folder, os.path.basename(member.name))
+                if target in unpacked:
+                    raise FileExistsError(
+                        f"Archive '{archive}' contains several files named "
+                        f"'{os.path.basename(target)}'")
+                unpacked.append(target)
+                if not _is_unpacked(target, member.size, member.mtime):
+                    _write_stream(tar.extractfile(member), target,
+                                  member.mtime)
+    else:
+        target = os.path.join(
+            folder,
+            re.sub(r"\.gz$", "", os.path.basename(archive),
+                   flags=re.IGNORECASE))
+        unpacked.append(target)
+        (size, mtime) = _get_gzip_info(archive)
+        if not _is_unpacked(target, size, mtime):
+            with gzip.open(archive, 'rb') as f_in:
+                _write_stream(f_in, target, mtime)
+    os.remove(archive)
+    return unpacked
+
+
+def _add_unpacked(all_unpacked, archive, unpacked):
+    """Add unpacked files of `archive`, raise if they were already unpacked.
+
+    Two archives unpacked in a single call of
+    :func:`unpack_files_in_folder` must not contain files with the same
+    name, since one would replace the other.
+    """
+    for target in unpacked:
+        if target in all_unpacked:
+            raise FileExistsError(
+                f"Cannot unpack '{os.path.basename(target)}' from archive "
+                f"'{os.path.basename(archive)}', a file with the same name "
+                f"was already unpacked from archive "
+                f"'{os.path.basename(all_unpacked[target])}'")
+        all_unpacked[target] = archive
+    return [f for f in unpacked if _is_archive(f)]
+
+
+def _flatten_folder(folder):
+    """Move all files in subfolders of `folder` to `folder`."""
+    for filename in sorted(os.listdir(folder)):
+        full_path = os.path.join(folder, filename)
+        if not os.path.isdir(full_path):
+            continue
+        logger.info('Moving files from folder %s', filename)
+        for root, _, files in os.walk(full_path):
+            for file_path in files:
+                target = os.path.join(folder, file_path)
+                if os.path.exists(target):
+                    raise shutil.Error(
+                        f"Destination path '{target}' already exists")
+                os.replace(os.path.join(root, file_path), target)
+        shutil.rmtree(full_path)
+
+
+def unpack_files_in_folder(folder, n_workers=1):
     """Unpack all compressed and tarred files in a given folder.
 
     This function flattens the folder hierarchy, both outside
-    and inside the given folder. It also unpack nested files
+    and inside the given folder. It also unpack nested files.
+
+    Archives are optionally unpacked concurrently in a pool of worker
+    processes and nested archives are added to the work queue as soon as
+    they are found. Existing files from previous runs are replaced (or kept
+    if they are identical to the archive member), but an error is raised if
+    two archives contain files with the same name.
 
     Parameters
     ----------
     folder : str
         Path to the folder to unpack
+    n_workers : int, optional (default: 1)
+        Number of worker processes, e.g. given by :func:`get_n_workers`
     """
-    decompress = True
-    while decompress:
-        decompress = False
-        files = os.listdir(folder)
-        files.sort()
-        for filename in files:
-            full_path = os.path.join(folder, filename)
-            if os.path.isdir(full_path):
-                logger.info('Moving files from folder %s', filename)
-                folder_files = os.listdir(full_path)
-                for file_path in folder_files:
-                    shutil.move(os.path.join(full_path, file_path), folder)
-                os.rmdir(full_path)
-                decompress = True
-                continue
-            if filename.startswith('.'):
-                continue
-            if not filename.endswith(('.gz', '.tgz', '.tar')):
-                continue
-            logger.info('Unpacking %s', filename)
-            shutil.unpack_archive(full_path, folder)
-            os.remove(full_path)
-            decompress = True
-
-
-def _gunzip(file_name, work_dir):
-    filename = os.path.split(file_name)[-1]
-    filename = re.sub(r"\.gz$", "", filename, flags=re.IGNORECASE)
-
-    with gzip.open(file_name, 'rb') as f_in:
-        with open(os.path.join(work_dir, filename), 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
-
-
-try:
-    shutil.register_unpack_format('gz', [
-        '.gz',
-    ], _gunzip)
-except shutil.RegistryError:
-    logger.debug('Format gz already registered. Skipping...')
+    _flatten_folder(folder)
+    pending = deque(
+        os.path.join(folder, f) for f in sorted(os.listdir(folder))
+        if _is_archive(f))
+    all_unpacked = {}
+
+    if n_workers <= 1:
+        while pending:
+            archive = pending.popleft()
+            logger.info('Unpacking %s', os.path.basename(archive))
+            pending.extend(
+                _add_unpacked(all_unpacked, archive,
+                              _unpack_archive(archive, folder)))
+        return
+
+    if not pending:
+        return
+    running = {}
+    with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+    ) as executor:
+        while pending or running:
+            while pending:
+                archive = pending.popleft()
+                logger.info('Unpacking %s', os.path.basename(archive))
+                running[executor.submit(_unpack_archive, archive,
+                                        folder)] = archive
+            (done, _) = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive = running.pop(future)
+                pending.extend(
+                    _add_unpacked(all_unpacked, archive, future.result()))
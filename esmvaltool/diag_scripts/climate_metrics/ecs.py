@@ -48,7 +48,6 @@ y_lim : list of float, optional (default: [0.5, 3.5])
 import logging
 import os
 from copy import deepcopy
-from functools import partial
 from pprint import pformat
 
 import cf_units
@@ -130,18 +129,6 @@ def _get_data_time_last(cube):
     return np.moveaxis(cube.data, cube.coord_dims('time')[0], -1)
 
 
-@partial(np.vectorize, excluded=['x_arr'], signature='(n),(n)->()')
-def _get_intercept(x_arr, y_arr):
-    """Get intercept of linear regression of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.intercept
-
-
 def _get_multi_model_mean(input_data):
     """Get multi-model mean for all variables."""
     logger.info("Calculating multi-model means")
@@ -197,18 +184,6 @@ def _get_multi_model_mean(input_data):
     return input_data
 
 
-@partial(np.vectorize, excluded=['x_arr'], signature='(n),(n)->()')
-def _get_slope(x_arr, y_arr):
-    """Get slope of linear regression of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.slope
-
-
 def _plot_complex_gregroy_plot(cfg, axes, tas_cube, rtnt_cube, reg_all):
     """Plot complex Gregory plot."""
     sep = cfg['sep_year']
@@ -35,7 +35,6 @@ import logging
 import os
 from collections import OrderedDict
 from copy import deepcopy
-from functools import partial
 
 import cf_units
 import iris
@@ -46,6 +45,7 @@ import seaborn as sns
 from scipy import stats
 
 from esmvaltool.diag_scripts.shared import (
+    MetadataIndex,
     ProvenanceLogger,
     extract_variables,
     get_diagnostic_filename,
@@ -57,6 +57,7 @@ from esmvaltool.diag_scripts.shared import (
     select_metadata,
     sorted_metadata,
     variables_available,
+    vectorized_linregress,
 )
 
 logger = logging.getLogger(os.path.basename(__file__))
@@ -153,16 +154,13 @@ def calculate_anomaly(data_4x, data_pic):
     iris.coord_categorisation.add_year(cube_pic, 'time')
     cube_pic = cube_pic.aggregated_by('year', iris.analysis.MEAN)
 
-    # Anomaly
+    # Anomaly (lazy if possible)
     x_data = cube_pic.coord('year').points
-    y_data = _get_data_time_last(cube_pic)
-    slope = _get_slope(x_data, y_data)
-    intercept = _get_intercept(x_data, y_data)
+    reg = vectorized_linregress(x_data, cube_pic.core_data(), axis=0)
     for _ in range(cube_pic.ndim - 1):
         x_data = np.expand_dims(x_data, -1)
-    new_x_data = np.broadcast_to(x_data, cube_pic.shape)
-    new_data = slope * new_x_data + intercept
-    cube_4x.data -= np.ma.masked_invalid(new_data)
+    new_data = reg.slope * x_data + reg.intercept
+    cube_4x.data = cube_4x.core_data() - new_data.astype(cube_4x.dtype)
     return cube_4x
 
 
@@ -267,7 +265,8 @@ def _create_feedback_plot(tas_cube, cube, dataset_name, cfg, description=None):
     coords = [(coord, idx - 1)
               for (idx, coord) in enumerate(cube.coords(dim_coords=True))
               if coord.name() != 'time']
-    feedback_cube = iris.cube.Cube(_get_slope(x_data, y_data),
+    feedback_cube = iris.cube.Cube(vectorized_linregress(x_data,
+                                                         y_data).slope,
                                    var_name=var,
                                    dim_coords_and_dims=coords,
                                    units='W m-2 K-1')
@@ -557,19 +556,7 @@ def _get_cube_list_for_table(cell_data, row_labels, col_labels, col_units):
 
 def _get_data_time_last(cube):
     """Get data of :class:`iris.cube.Cube` with time axis as last dimension."""
-    return np.moveaxis(cube.data, cube.coord_dims('time')[0], -1)
-
-
-@partial(np.vectorize, excluded=['x_arr'], signature='(n),(n)->()')
-def _get_intercept(x_arr, y_arr):
-    """Get intercept of linear regression of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.intercept
+    return np.moveaxis(cube.core_data(), cube.coord_dims('time')[0], -1)
 
 
 def _get_levels():
@@ -648,7 +635,7 @@ def _get_multi_model_mean(input_data):
     """Get multi-model mean for all variables."""
     logger.info("Calculating multi-model means")
     mmm_data = []
-    tas_data = select_metadata(input_data, short_name='tas')
+    tas_data = MetadataIndex(select_metadata(input_data, short_name='tas'))
     for (var, datasets) in group_metadata(input_data, 'short_name').items():
         if var == 'tas':
             continue
@@ -674,18 +661,6 @@ def _get_provenance_record(caption):
     return record
 
 
-@partial(np.vectorize, excluded=['x_arr'], signature='(n),(n)->()')
-def _get_slope(x_arr, y_arr):
-    """Get slope of linear regression of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.slope
-
-
 def _get_tas_var(dataset_name, rad_var):
     """Get correct tas data for a certain radiation variable."""
     if dataset_name == 'MultiModelMean':
@@ -693,15 +668,6 @@ def _get_tas_var(dataset_name, rad_var):
     return 'tas'
 
 
-def _vectorized_linregress(x_arr, y_arr):
-    """Vectorized version if :func:`scipy.stats.linregress`."""
-    slope = np.vectorize(lambda x, y: stats.linregress(x, y).slope,
-                         signature='(n),(n)->()')
-    intercept = np.vectorize(lambda x, y: stats.linregress(x, y).intercept,
-                             signature='(n),(n)->()')
-    return (slope(x_arr, y_arr), intercept(x_arr, y_arr))
-
-
 def _write_scalar_data(data, ancestor_files, cfg, description=None):
     """Write scalar data for multiple datasets."""
     var_attrs = [
@@ -814,12 +780,12 @@ def calculate_ecs(input_data, cfg, description=None):
                   if coord.name() != 'time']
 
         # Calculate ECS (using linear regression)
-        reg = _vectorized_linregress(_get_data_time_last(tas_cube),
-                                     _get_data_time_last(rtnt_cube))
-        ecs[dataset_name] = iris.cube.Cube(-reg[1] / (2 * reg[0]),
+        reg = vectorized_linregress(_get_data_time_last(tas_cube),
+                                    _get_data_time_last(rtnt_cube))
+        ecs[dataset_name] = iris.cube.Cube(-reg.intercept / (2 * reg.slope),
                                            dim_coords_and_dims=coords)
         feedback_parameter[dataset_name] = iris.cube.Cube(
-            reg[0], dim_coords_and_dims=coords)
+            reg.slope, dim_coords_and_dims=coords)
     ancestors = list(set(ancestors))
     if not ecs:
         logger.info(
@@ -999,7 +965,8 @@ def preprocess_data(cfg, year_idx=None):
             input_data = [d for d in input_data if d['dataset'] ==
                           'MultiModelMean']
 
-    return input_data
+    # Index for the per-dataset queries of the calculations and plots
+    return MetadataIndex(input_data)
 
 
 def set_default_cfg(cfg):
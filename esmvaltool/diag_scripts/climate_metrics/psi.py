@@ -5,7 +5,8 @@
 Description
 -----------
 Calculate global temperature variability metric psi following Cox et al.
-(2018).
+(2018). If the input data contains additional dimensions (e.g., latitude and
+longitude), psi is calculated for every grid cell.
 
 Author
 ------
@@ -33,7 +34,6 @@ import cf_units
 import iris
 import iris.coord_categorisation
 import numpy as np
-from scipy import stats
 
 from esmvaltool.diag_scripts.shared import (
     ProvenanceLogger,
@@ -48,39 +48,97 @@ from esmvaltool.diag_scripts.shared import (
 logger = logging.getLogger(os.path.basename(__file__))
 
 
+def _get_moving_sums(data, window_length, n_windows):
+    """Get sums over moving windows along last axis (using cumulative sums)."""
+    cumsum = np.cumsum(data, axis=-1)
+    cumsum = np.concatenate([np.zeros_like(cumsum[..., :1]), cumsum], axis=-1)
+    return (cumsum[..., window_length:window_length + n_windows] -
+            cumsum[..., :n_windows])
+
+
+def _get_psi(years, tas, window_length, lag):
+    """Calculate psi for all moving windows along last axis of ``tas``.
+
+    For every window, the data is de-trended with a linear regression and the
+    lag-autocorrelation of the residuals is calculated. Instead of looping
+    over the windows, all necessary sums are derived from cumulative sums of
+    the (lagged) data, which yields identical results.
+
+    """
+    n_windows = years.shape[0] - window_length
+    mask = _get_moving_sums(np.ma.getmaskarray(tas).astype(int),
+                            window_length, n_windows) > 0
+
+    # Center data to avoid loss of precision in cumulative sums
+    x_data = years.astype(np.float64) - np.mean(years)
+    y_data = np.ma.filled(tas.astype(np.float64) -
+                          np.ma.mean(tas, axis=-1, keepdims=True), 0.0)
+
+    def moving_sum(data, length=window_length):
+        """Get moving sums for all windows."""
+        return _get_moving_sums(data, length, n_windows)
+
+    # Linear regression for every window
+    sum_x = moving_sum(x_data)
+    sum_y = moving_sum(y_data)
+    ss_xx = moving_sum(x_data**2) - sum_x**2 / window_length
+    ss_xy = moving_sum(x_data * y_data) - sum_x * sum_y / window_length
+    ss_yy = moving_sum(y_data**2) - sum_y**2 / window_length
+    slope = ss_xy / ss_xx
+    intercept = (sum_y - slope * sum_x) / window_length
+
+    # Sum of squared residuals and lagged products of residuals (expansion of
+    # sum_i (y_i - a - b x_i) * (y_{i+lag} - a - b x_{i+lag}))
+    ss_res = np.maximum(ss_yy - slope * ss_xy, 0.0)
+    (x_0, x_1) = (x_data[:-lag], x_data[lag:])
+    (y_0, y_1) = (y_data[..., :-lag], y_data[..., lag:])
+    length = window_length - lag
+    lag_res = (moving_sum(y_0 * y_1, length) -
+               intercept * moving_sum(y_0 + y_1, length) -
+               slope * moving_sum(x_0 * y_1 + x_1 * y_0, length) +
+               intercept**2 * length +
+               intercept * slope * moving_sum(x_0 + x_1, length) +
+               slope**2 * moving_sum(x_0 * x_1, length))
+
+    # Psi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        autocorr = lag_res / ss_res
+        psi = np.sqrt(ss_res / window_length) / np.sqrt(-np.log(autocorr))
+    return np.ma.masked_array(psi, mask=mask)
+
+
 def calculate_psi(cube, cfg):
     """Calculate temperature variability metric psi for a given cube."""
     window_length = cfg.get('window_length', 55)
     lag = cfg.get('lag', 1)
-    psi_years = []
-    psis = []
-
-    # Moving average
-    for yr_idx in range(cube.shape[0] - window_length):
-        slc = slice(yr_idx, yr_idx + window_length)
-        years = cube.coord('year').points[slc]
-        tas = np.copy(cube.data[slc])
-
-        # De-trend data
-        reg = stats.linregress(years, tas)
-        tas -= reg.slope * years + reg.intercept
-
-        # Autocorrelation
-        norm = np.sum(np.square(tas))
-        [autocorr] = np.correlate(tas[:-lag], tas[lag:], mode='valid') / norm
-
-        # Psi
-        psi_years.append(years[-1])
-        psis.append(np.std(tas) / np.sqrt(-np.log(autocorr)))
+    [time_dim] = cube.coord_dims('year')
+    years = cube.coord('year').points
+    if years.shape[0] <= window_length:
+        raise ValueError(
+            f"Expected more than {window_length:d} years for psi calculation "
+            f"with window length {window_length:d}, got {years.shape[0]:d}")
+
+    # Psi for all windows (and all other dimensions at once)
+    psis = _get_psi(years, np.moveaxis(cube.data, time_dim, -1),
+                    window_length, lag)
+    psis = np.moveaxis(psis, -1, time_dim)
+    if not np.ma.is_masked(psis):
+        psis = psis.filled()
+    psi_years = years[window_length - 1:-1]
 
     # Return new cube
     year_coord = iris.coords.DimCoord(np.array(psi_years),
                                       var_name='year',
                                       long_name='year',
                                       units=cf_units.Unit('year'))
+    dim_coords = [(year_coord, time_dim)]
+    for coord in cube.coords(dim_coords=True):
+        [dim] = cube.coord_dims(coord)
+        if dim != time_dim:
+            dim_coords.append((coord.copy(), dim))
     psi_cube = iris.cube.Cube(
-        np.array(psis),
-        dim_coords_and_dims=[(year_coord, 0)],
+        psis,
+        dim_coords_and_dims=dim_coords,
         attributes={
             'window_length': window_length,
             'lag': lag,
@@ -42,9 +42,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 import yaml
-from scipy import stats
 
 from esmvaltool.diag_scripts.shared import (
+    MetadataIndex,
     ProvenanceLogger,
     get_diagnostic_filename,
     get_plot_filename,
@@ -54,6 +54,7 @@ from esmvaltool.diag_scripts.shared import (
     select_metadata,
     sorted_metadata,
     variables_available,
+    vectorized_linregress,
 )
 
 logger = logging.getLogger(os.path.basename(__file__))
@@ -89,9 +90,11 @@ def _get_anomaly_cube(onepct_cube, pi_cube):
             f"calculation, got only {onepct_cube.shape[0]:d}")
 
     # Calculate anomaly
-    reg = stats.linregress(pi_cube.coord('year').points, pi_cube.data)
-    onepct_cube.data -= (reg.slope * pi_cube.coord('year').points +
-                         reg.intercept)
+    reg = vectorized_linregress(pi_cube.coord('year').points,
+                                pi_cube.core_data())
+    trend = reg.slope * pi_cube.coord('year').points + reg.intercept
+    onepct_cube.data = onepct_cube.core_data() - trend.astype(
+        onepct_cube.dtype)
 
     # Adapt metadata
     onepct_cube.standard_name = None
@@ -109,7 +112,8 @@ def _get_anomaly_cubes(cfg):
     cubes = {}
     ancestors = {}
     input_data = cfg['input_data'].values()
-    input_data = sorted_metadata(input_data, ['short_name', 'exp', 'dataset'])
+    input_data = MetadataIndex(
+        sorted_metadata(input_data, ['short_name', 'exp', 'dataset']))
     onepct_data = select_metadata(input_data, short_name='tas', exp='1pctCO2')
 
     # Process data
@@ -328,9 +332,9 @@ def write_data(cfg, tcr, external_file=None):
     caption = "{long_name} for multiple climate models.".format(**var_attr)
     provenance_record = get_provenance_record(caption)
     ancestor_files = []
+    input_data = MetadataIndex(cfg['input_data'].values())
     for dataset_name in tcr.keys():
-        datasets = select_metadata(cfg['input_data'].values(),
-                                   dataset=dataset_name)
+        datasets = select_metadata(input_data, dataset=dataset_name)
         ancestor_files.extend(sorted([d['filename'] for d in datasets]))
     if external_file is not None:
         ancestor_files.append(external_file)
@@ -11,6 +11,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import yaml
+from joblib import Parallel, delayed
 from scipy import integrate
 from scipy.stats import linregress
 
@@ -19,6 +20,7 @@ from esmvaltool.diag_scripts.shared import (
     get_diagnostic_filename,
     get_plot_filename,
     io,
+    vectorized_linregress,
 )
 
 logger = logging.getLogger(__name__)
@@ -603,6 +605,100 @@ def _gaussian_pdf(x_val, x_mean, x_std):
     return np.exp(-(x_val - x_mean)**2 / 2.0 / x_std**2) / norm
 
 
+def _get_constraint_info(x_data, y_data, obs_mean, obs_std, n_points=1000,
+                         necessary_p_value=None):
+    """Get constraint information for multiple samples (along last axis)."""
+    reg = _get_regression(x_data, y_data)
+    y_lin = _get_y_lin(y_data, n_points)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_pdf = _get_target_pdf_values(y_lin, reg, obs_mean, obs_std)
+
+    # Use unconstrained value of desired and necessary
+    y_mean = np.mean(y_data, axis=-1, keepdims=True)
+    y_std = np.std(y_data, axis=-1, keepdims=True)
+    if necessary_p_value is not None:
+        y_pdf = np.where(reg['pvalue'] > necessary_p_value,
+                         _gaussian_pdf(y_lin, y_mean, y_std), y_pdf)
+
+    # Constrained mean and standard deviation
+    norm = np.sum(y_pdf, axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        constrained_mean = np.sum(y_lin * y_pdf, axis=-1,
+                                  keepdims=True) / norm
+        constrained_std = np.sqrt(
+            np.sum((y_lin - constrained_mean)**2 * y_pdf, axis=-1,
+                   keepdims=True) / norm)
+    info = [
+        constrained_mean, constrained_std, y_mean, y_std, reg['slope'],
+        reg['intercept'], reg['rvalue'], reg['pvalue']
+    ]
+    return np.concatenate(info, axis=-1)
+
+
+def _get_quadrature(y_lin, reg, obs_mean, obs_std, n_panels=4, n_nodes=20):
+    """Get nodes and weights to integrate P(x) * P(y|x) over x for every y.
+
+    For every y, the integrand is approximately a Gaussian whose mean and
+    width are given by the product of the PDF of the observations P(x) and
+    the conditional PDF P(y|x). A composite Gauss-Legendre quadrature is used
+    on the range +/- 12 widths around this mean (cropped to the integration
+    limits +/- 3 obs_std), which resolves arbitrarily narrow integrands.
+
+    """
+    x_min = obs_mean - 3.0 * obs_std
+    x_max = obs_mean + 3.0 * obs_std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cond = (y_lin - reg['intercept']) / reg['slope']
+        cond_std = _get_spe(x_cond, reg) / np.abs(reg['slope'])
+        comb_var = 1.0 / (1.0 / obs_std**2 + 1.0 / cond_std**2)
+        center = comb_var * (obs_mean / obs_std**2 + x_cond / cond_std**2)
+    center = np.where(reg['slope'] == 0.0, obs_mean, center)
+    width = np.where(reg['slope'] == 0.0, obs_std, np.sqrt(comb_var))
+    lower = np.clip(center - 12.0 * width, x_min, x_max)
+    upper = np.clip(center + 12.0 * width, x_min, x_max)
+
+    # Composite Gauss-Legendre quadrature, shape (..., n_y, n_panels *
+    # n_nodes)
+    (nodes, weights) = np.polynomial.legendre.leggauss(n_nodes)
+    half_width = (upper - lower)[..., np.newaxis] / n_panels / 2.0
+    centers = (lower[..., np.newaxis] + half_width *
+               (2.0 * np.arange(n_panels) + 1.0))
+    x_nodes = centers[..., np.newaxis] + half_width[..., np.newaxis] * nodes
+    x_weights = np.broadcast_to(half_width[..., np.newaxis] * weights,
+                                x_nodes.shape)
+    new_shape = y_lin.shape + (n_panels * n_nodes, )
+    return (x_nodes.reshape(new_shape), x_weights.reshape(new_shape))
+
+
+def _get_regression(x_data, y_data):
+    """Get linear regressions along last axis (as :obj:`dict` of arrays).
+
+    Uses :func:`esmvaltool.diag_scripts.shared.vectorized_linregress` and adds
+    the parameters of the standard prediction error. The last axis of all
+    arrays has length 1 so that they can be broadcasted to sampled y values.
+    Degenerate regressions (e.g., constant X data) are given by NaNs.
+
+    """
+    linreg = vectorized_linregress(x_data, y_data)
+    reg = {
+        key: np.ma.filled(getattr(linreg, key), np.nan)[..., np.newaxis]
+        for key in ('slope', 'intercept', 'rvalue', 'pvalue', 'see')
+    }
+    x_mean = np.mean(x_data, axis=-1, keepdims=True)
+    reg.update({
+        'n_data': x_data.shape[-1],
+        'x_mean': x_mean,
+        'ssx': np.sum((x_data - x_mean)**2, axis=-1, keepdims=True),
+    })
+    return reg
+
+
+def _get_spe(x_new, reg):
+    """Get standard prediction error for regression(s) from dictionary."""
+    return reg['see'] * np.sqrt(1.0 + 1.0 / reg['n_data'] +
+                                (x_new - reg['x_mean'])**2 / reg['ssx'])
+
+
 def _get_target_pdf(x_data,
                     y_data,
                     obs_mean,
@@ -611,14 +707,8 @@ def _get_target_pdf(x_data,
                     necessary_p_value=None):
     """Get PDF of target variable including linear regression information."""
     (x_data, y_data) = _check_x_y_arrays(x_data, y_data)
-    spe = standard_prediction_error(x_data, y_data)
     reg = linregress(x_data, y_data)
-
-    # Get evenly spaced range of y
-    y_range = 1.5 * (np.max(y_data) - np.min(y_data))
-    y_lin = np.linspace(
-        np.min(y_data) - y_range,
-        np.max(y_data) + y_range, n_points)
+    y_lin = _get_y_lin(y_data, n_points)
 
     # Use unconstrained value of desired and necessary
     if necessary_p_value is not None:
@@ -626,30 +716,42 @@ def _get_target_pdf(x_data,
             y_pdf = _gaussian_pdf(y_lin, np.mean(y_data), np.std(y_data))
             return (y_lin, y_pdf, reg)
 
-    # Helper functions for calculation of constrained target variable
-    def obs_pdf(x_new):
-        """Return PDF of observations P(x)."""
-        return _gaussian_pdf(x_new, obs_mean, obs_std)
-
-    def cond_pdf(x_new, y_new):
-        """Return conditional PDF P(y|x)."""
-        y_pred = reg.slope * x_new + reg.intercept
-        y_std = spe(x_new)
-        return _gaussian_pdf(y_new, y_pred, y_std)
-
-    def comb_pdf(x_new, y_new):
-        """Return combined PDF P(y,x)."""
-        return obs_pdf(x_new) * cond_pdf(x_new, y_new)
-
-    # PDF of target variable P(y)
-    x_range = 3 * obs_std
-    y_pdf = [
-        integrate.quad(comb_pdf,
-                       obs_mean - x_range,
-                       obs_mean + x_range,
-                       args=(y, ))[0] for y in y_lin
-    ]
-    return (y_lin, np.array(y_pdf), reg)
+    y_pdf = _get_target_pdf_values(y_lin, _get_regression(x_data, y_data),
+                                   obs_mean, obs_std)
+    return (y_lin, y_pdf, reg)
+
+
+def _get_target_pdf_values(y_lin, reg, obs_mean, obs_std):
+    """Get PDF of target variable P(y) evaluated at ``y_lin`` (last axis).
+
+    P(y) is the integral of P(x) * P(y|x) over x, where P(x) is the PDF of
+    the observations and P(y|x) the conditional PDF given by the regression.
+    All arguments except ``y_lin`` need to have the length 1 along the last
+    axis.
+
+    """
+    (x_nodes, x_weights) = _get_quadrature(y_lin, reg, obs_mean, obs_std)
+    reg = {key: np.expand_dims(val, -1) for (key, val) in reg.items()}
+    obs_mean = np.expand_dims(obs_mean, -1)
+    obs_std = np.expand_dims(obs_std, -1)
+
+    # Product of both Gaussian PDFs P(x) and P(y|x) (with a single exp)
+    obs_var = obs_std**2
+    cond_var = reg['see']**2 * (1.0 + 1.0 / reg['n_data'] +
+                                (x_nodes - reg['x_mean'])**2 / reg['ssx'])
+    exponent = ((x_nodes - obs_mean)**2 / obs_var +
+                (y_lin[..., np.newaxis] - reg['slope'] * x_nodes -
+                 reg['intercept'])**2 / cond_var)
+    pdf = np.exp(-0.5 * exponent) / (2.0 * np.pi * np.sqrt(obs_var * cond_var))
+    return np.sum(pdf * x_weights, axis=-1)
+
+
+def _get_y_lin(y_data, n_points):
+    """Get evenly spaced range of y (for all samples along last axis)."""
+    y_min = np.min(y_data, axis=-1)
+    y_max = np.max(y_data, axis=-1)
+    y_range = 1.5 * (y_max - y_min)
+    return np.linspace(y_min - y_range, y_max + y_range, n_points, axis=-1)
 
 
 def check_metadata(metadata, allowed_var_types=None):
@@ -1662,9 +1764,7 @@ def cdf(data, pdf):
         Corresponding cumulative distribution function (CDF).
 
     """
-    idx_range = range(1, len(data) + 1)
-    cum_dens = [integrate.simps(pdf[:idx], data[:idx]) for idx in idx_range]
-    return np.array(cum_dens)
+    return integrate.cumulative_trapezoid(pdf, data, initial=0.0)
 
 
 def constraint_info_array(x_data,
@@ -1723,6 +1823,113 @@ def constraint_info_array(x_data,
     return np.array(info)
 
 
+def bootstrap_constraint_info_array(x_data,
+                                    y_data,
+                                    obs_mean,
+                                    obs_std,
+                                    n_samples=1000,
+                                    resample_indices=None,
+                                    n_points=1000,
+                                    necessary_p_value=None,
+                                    random_state=None,
+                                    batch_size=50,
+                                    n_jobs=1):
+    """Get parameters of emergent constraint for many resampled model sets.
+
+    Evaluates :func:`constraint_info_array` for many resamplings of the models
+    (e.g., bootstrapping) at once using array broadcasting. Regressions,
+    standard prediction errors and constrained PDFs of all samples in a batch
+    are calculated simultaneously. Batches can optionally be distributed to
+    multiple processes.
+
+    Parameters
+    ----------
+    x_data : numpy.ndarray
+        X data of the emergent constraint.
+    y_data : numpy.ndarray
+        Y data of the emergent constraint.
+    obs_mean : float or numpy.ndarray
+        Mean of observational data. If an array of shape (`n_samples`,) is
+        given, use individual values for every sample (e.g., for Monte-Carlo
+        sampling of observational uncertainty).
+    obs_std : float or numpy.ndarray
+        Standard deviation of observational data. If an array of shape
+        (`n_samples`,) is given, use individual values for every sample.
+    n_samples : int, optional (default: 1000)
+        Number of samples. Ignored if `resample_indices` is given.
+    resample_indices : numpy.ndarray, optional
+        Integer array of shape (`n_samples`, `n_models`) with the indices of
+        the models used in each sample (`n_models` does not need to match the
+        number of models in the input data, e.g., to evaluate subsets). If not
+        given, draw `n_samples` bootstrap samples (random sampling with
+        replacement).
+    n_points : int, optional (default: 1000)
+        Number of sampled points for PDF of target variable.
+    necessary_p_value : float, optional
+        If given, replace constrained mean and standard deviation with
+        unconstrained values when `p`-value of emergent relationship is greater
+        than the given necessary `p`-value.
+    random_state : int or numpy.random.Generator, optional
+        Seed or random number generator used to draw the bootstrap samples.
+        Ignored if `resample_indices` is given.
+    batch_size : int, optional (default: 50)
+        Number of samples that are evaluated at once. Memory usage scales with
+        `batch_size` * `n_points`.
+    n_jobs : int, optional (default: 1)
+        Number of processes used to evaluate the batches.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (`n_samples`, 8) with the elements described in
+        :func:`constraint_info_array` for every sample. Samples with
+        degenerate regressions (e.g., constant X data) contain NaNs.
+
+    Raises
+    ------
+    ValueError
+        Shapes of `obs_mean`, `obs_std` or `resample_indices` are invalid.
+
+    """
+    (x_data, y_data) = _check_x_y_arrays(x_data, y_data)
+    if resample_indices is None:
+        rng = np.random.default_rng(random_state)
+        resample_indices = rng.integers(len(x_data),
+                                        size=(n_samples, len(x_data)))
+    resample_indices = np.asarray(resample_indices)
+    if resample_indices.ndim != 2:
+        raise ValueError(
+            f"Expected 2D array for 'resample_indices', got "
+            f"{resample_indices.ndim:d}D array")
+    n_samples = resample_indices.shape[0]
+    obs = []
+    for (name, val) in zip(('obs_mean', 'obs_std'), (obs_mean, obs_std)):
+        val = np.asarray(val, dtype=float)
+        if val.shape not in ((), (n_samples, )):
+            raise ValueError(
+                f"Expected scalar or array of shape ({n_samples:d},) for "
+                f"'{name}', got shape {val.shape}")
+        obs.append(np.broadcast_to(val, (n_samples, ))[:, np.newaxis])
+    logger.debug("Evaluating emergent constraint for %i samples",
+                 n_samples)
+
+    # Evaluate batches
+    batches = [
+        slice(idx, idx + batch_size)
+        for idx in range(0, n_samples, batch_size)
+    ]
+    infos = Parallel(n_jobs=n_jobs)(
+        delayed(_get_constraint_info)(
+            x_data[resample_indices[batch]],
+            y_data[resample_indices[batch]],
+            obs[0][batch],
+            obs[1][batch],
+            n_points=n_points,
+            necessary_p_value=necessary_p_value,
+        ) for batch in batches)
+    return np.concatenate(infos, axis=0)
+
+
 def get_constraint(x_data, y_data, obs_mean, obs_std, confidence_level=0.66):
     """Get constraint on target variable.
 
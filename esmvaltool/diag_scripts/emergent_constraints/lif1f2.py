@@ -35,7 +35,7 @@ from scipy import stats
 
 import esmvaltool.diag_scripts.shared as e
 import esmvaltool.diag_scripts.shared.names as n
-from esmvaltool.diag_scripts.shared import (ProvenanceLogger,
+from esmvaltool.diag_scripts.shared import (MetadataIndex, ProvenanceLogger,
                                             get_diagnostic_filename,
                                             get_plot_filename, group_metadata,
                                             select_metadata)
@@ -452,9 +452,9 @@ def plot_reg_li(cfg, data_ar, future_exp):
 
     axx.plot(np.linspace(5.5, 8.8, 2), y_reg, color='k')
 
+    input_data = MetadataIndex(cfg['input_data'].values())
     for iii, model in enumerate(data_ar["datasets"]):
-        proj = (select_metadata(cfg['input_data'].values(),
-                                dataset=model))[0]['project']
+        proj = (select_metadata(input_data, dataset=model))[0]['project']
         style = e.plot.get_dataset_style(model, style_file=proj.lower())
         axx.plot(
             data_ar["mwp_hist_rain"][iii],
@@ -532,10 +532,10 @@ def plot_reg_li2(cfg, datasets, mdiff_ism, mdiff_ism_cor, hist_ism):
         markeredgewidth=3.0,
         label='multi-model mean')
 
+    input_data = MetadataIndex(cfg['input_data'].values())
     for iii, model in enumerate(datasets):
 
-        proj = (select_metadata(cfg['input_data'].values(),
-                                dataset=model))[0]['project']
+        proj = (select_metadata(input_data, dataset=model))[0]['project']
         style = e.plot.get_dataset_style(model, style_file=proj.lower())
         axx.plot(
             mdiff_ism[iii] / hist_ism[iii] * 100.0,
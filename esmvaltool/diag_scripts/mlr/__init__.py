@@ -1,5 +1,6 @@
 """Convenience functions for MLR diagnostics."""
 
+import hashlib
 import logging
 import os
 import re
@@ -86,33 +87,84 @@ def _get_datasets(input_data, **kwargs):
     return datasets
 
 
+def _rasterize_ne_land_mask(ne_file, lats, lons):
+    """Rasterize Natural Earth land polygons (1: land, 0: sea)."""
+    reader = shapereader.Reader(ne_file)
+    (lat_grid, lon_grid) = np.meshgrid(lats, lons, indexing='ij')
+    mask = np.full(lat_grid.shape, False, dtype=bool)
+    for geometry in reader.geometries():
+        mask |= shp_vect.contains(geometry, lon_grid, lat_grid)
+    return mask
+
+
+def _save_ne_land_mask(land_mask, cache_file):
+    """Save rasterized land mask atomically (failures are not critical)."""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f'{cache_file}.{os.getpid()}.npy'
+        np.save(tmp_file, land_mask)
+        os.replace(tmp_file, cache_file)
+    except OSError as exc:
+        logger.debug("Could not cache land mask in %s: %s", cache_file, exc)
+
+
+def _get_ne_land_mask_cache_file(cache_dir, ne_file, n_lats, n_lons):
+    """Get cache file of rasterized land mask.
+
+    The name contains the resolution and a hash of the path, size and
+    modification time of the shapefile, so that a changed shapefile is
+    rasterized again.
+
+    """
+    stat = os.stat(ne_file)
+    file_id = f'{os.path.realpath(ne_file)}:{stat.st_size}:{stat.st_mtime_ns}'
+    file_hash = hashlib.sha1(file_id.encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(ne_file))[0]
+    return os.path.join(cache_dir,
+                        f'{name}_{n_lats}x{n_lons}_{file_hash}.npy')
+
+
 @lru_cache
-def _get_ne_land_mask_cube(n_lats=1000, n_lons=2000):
-    """Get Natural Earth land mask."""
+def _get_ne_land_mask_cube(n_lats=1000, n_lons=2000, cache_dir=None):
+    """Get Natural Earth land mask.
+
+    If ``cache_dir`` is given, the rasterized mask is cached on disk in this
+    directory.
+
+    """
     ne_dir = os.path.join(
         os.path.dirname(os.path.realpath(esmvalcore.preprocessor.__file__)),
         'ne_masks',
     )
     ne_file = os.path.join(ne_dir, 'ne_10m_land.shp')
-    reader = shapereader.Reader(ne_file)
-    geometries = list(reader.geometries())
+    lats = np.linspace(-90.0, 90.0, n_lats)
+    lons = np.linspace(-180.0, 180.0, n_lons)
+
+    # Setup mask (1: land, 0: sea)
+    cache_file = None
+    land_mask = None
+    if cache_dir is not None:
+        cache_file = _get_ne_land_mask_cache_file(cache_dir, ne_file, n_lats,
+                                                  n_lons)
+        try:
+            land_mask = np.load(cache_file)
+        except (OSError, ValueError):
+            land_mask = None
+    if land_mask is None or land_mask.shape != (n_lats, n_lons):
+        logger.debug("Rasterizing Natural Earth land mask on %ix%i grid",
+                     n_lats, n_lons)
+        land_mask = _rasterize_ne_land_mask(ne_file, lats, lons)
+        if cache_file is not None:
+            _save_ne_land_mask(land_mask, cache_file)
+    land_mask = land_mask.astype(int)
 
-    # Setup grid
+    # Setup cube
     lat_coord = iris.coords.DimCoord(
-        np.linspace(-90.0, 90.0, n_lats), var_name='lat',
+        lats, var_name='lat',
         standard_name='latitude', long_name='latitude', units='degrees')
     lon_coord = iris.coords.DimCoord(
-        np.linspace(-180.0, 180.0, n_lons), var_name='lon',
+        lons, var_name='lon',
         standard_name='longitude', long_name='longitude', units='degrees')
-    (lats, lons) = np.meshgrid(lat_coord.points, lon_coord.points)
-
-    # Setup mask (1: land, 0: sea)
-    mask = np.full(lats.shape, False, dtype=bool)
-    for geometry in geometries:
-        mask |= shp_vect.contains(geometry, lons, lats)
-    land_mask = np.swapaxes(np.where(mask, 1, 0), 0, 1)
-
-    # Setup cube
     cube = iris.cube.Cube(land_mask,
                           var_name='land_mask',
                           long_name='Land mask (1: land, 0: sea)',
@@ -330,7 +382,8 @@ def get_alias(dataset):
 
 
 def get_all_weights(cube, area_weighted=True, time_weighted=True,
-                    landsea_fraction_weighted=None, normalize=False):
+                    landsea_fraction_weighted=None, normalize=False,
+                    land_mask_cache_dir=None):
     """Get all desired weights for a cube.
 
     Parameters
@@ -349,6 +402,10 @@ def get_all_weights(cube, area_weighted=True, time_weighted=True,
         grids.
     normalize : bool, optional (default: False)
         Normalize weights with total area and total time range.
+    land_mask_cache_dir : str, optional
+        Directory in which the rasterized Natural Earth land mask used for
+        ``landsea_fraction_weighted`` is cached. If not given, the mask is
+        only cached in memory.
 
     Returns
     -------
@@ -359,7 +416,8 @@ def get_all_weights(cube, area_weighted=True, time_weighted=True,
     ------
     iris.exceptions.CoordinateMultiDimError
         Dimension of ``latitude`` or ``longitude`` coordinate is greater than
-        1.
+        2 or only one of them is 2D or 2D coordinates do not span the same
+        dimensions.
     iris.exceptions.CoordinateNotFoundError
         Cube does not contain the coordinates ``latitude`` and ``longitude``
         (if used with ``area_weighted`` or ``landsea_fraction_weighted``) or
@@ -379,7 +437,7 @@ def get_all_weights(cube, area_weighted=True, time_weighted=True,
     horizontal_weights = get_horizontal_weights(
         cube, area_weighted=area_weighted,
         landsea_fraction_weighted=landsea_fraction_weighted,
-        normalize=normalize)
+        normalize=normalize, land_mask_cache_dir=land_mask_cache_dir)
     weights *= horizontal_weights
 
     # Time weights
@@ -425,7 +483,8 @@ def get_area_weights(cube, normalize=False):
 
 
 def get_horizontal_weights(cube, area_weighted=True,
-                           landsea_fraction_weighted=None, normalize=False):
+                           landsea_fraction_weighted=None, normalize=False,
+                           land_mask_cache_dir=None):
     """Get horizontal (latitude/longitude) weights of cube.
 
     Parameters
@@ -443,6 +502,10 @@ def get_horizontal_weights(cube, area_weighted=True,
     normalize : bool, optional (default: False)
         Normalize weights with sum of weights over latitude and longitude (i.e.
         if only ``area_weighted`` is given, this is equal to the total area).
+    land_mask_cache_dir : str, optional
+        Directory in which the rasterized Natural Earth land mask used for
+        ``landsea_fraction_weighted`` is cached. If not given, the mask is
+        only cached in memory.
 
     Returns
     -------
@@ -453,7 +516,8 @@ def get_horizontal_weights(cube, area_weighted=True,
     ------
     iris.exceptions.CoordinateMultiDimError
         Dimension of ``latitude`` or ``longitude`` coordinate is greater than
-        1.
+        2 or only one of them is 2D or 2D coordinates do not span the same
+        dimensions.
     iris.exceptions.CoordinateNotFoundError
         Cube does not contain the coordinates ``latitude`` and ``longitude``.
     ValueError
@@ -470,7 +534,8 @@ def get_horizontal_weights(cube, area_weighted=True,
         weights *= get_area_weights(cube, normalize=False)
     if landsea_fraction_weighted is not None:
         weights *= get_landsea_fraction_weights(
-            cube, landsea_fraction_weighted, normalize=False)
+            cube, landsea_fraction_weighted, normalize=False,
+            land_mask_cache_dir=land_mask_cache_dir)
 
     # No normalization
     if not normalize:
@@ -549,14 +614,108 @@ def get_input_data(cfg, pattern=None, check_mlr_attributes=True, ignore=None):
     return valid_data
 
 
-def get_landsea_fraction_weights(cube, area_type, normalize=False):
+def _get_cell_bounds(coord):
+    """Get bounds of a 0D, 1D or 2D coordinate with shape ``(..., n)``."""
+    if coord.has_bounds():
+        return coord.bounds
+    if coord.ndim == 1 and coord.shape[0] > 1:
+        coord = coord.copy()
+        coord.guess_bounds()
+        return coord.bounds
+    raise ValueError(
+        f"Calculating land/sea fraction weights needs bounds for coordinate "
+        f"'{coord.name()}'")
+
+
+def _get_cell_ranges(lat_coord, lon_coord):
+    """Get latitude and longitude ranges covered by all grid cells.
+
+    Returns arrays ``(lat_min, lat_max, lon_min, lon_max)`` with shape
+    ``(n_lats, n_lons)`` for 1D coordinates and the shape of the
+    coordinates for 2D coordinates. Longitudes of a cell are unwrapped
+    relative to its first vertex so that cells crossing the dateline have
+    ``lon_max - lon_min < 360``.
+
+    """
+    lat_bounds = _get_cell_bounds(lat_coord)
+    lon_bounds = _get_cell_bounds(lon_coord)
+    if lat_coord.ndim == 2:
+        ref = lon_bounds[..., :1]
+        lon_bounds = ref + (lon_bounds - ref + 180.0) % 360.0 - 180.0
+        return (lat_bounds.min(axis=-1), lat_bounds.max(axis=-1),
+                lon_bounds.min(axis=-1), lon_bounds.max(axis=-1))
+    lat_bounds = lat_bounds.reshape(-1, 1, lat_bounds.shape[-1])
+    lon_bounds = lon_bounds.reshape(1, -1, lon_bounds.shape[-1])
+    return (lat_bounds.min(axis=-1), lat_bounds.max(axis=-1),
+            lon_bounds.min(axis=-1), lon_bounds.max(axis=-1))
+
+
+def _get_land_fraction(lat_min, lat_max, lon_min, lon_max, cache_dir=None):
+    """Get land fraction of grid cells from Natural Earth land mask.
+
+    The land fraction of a cell is the fraction of points of the land mask
+    that lie within the latitude and longitude range of the cell. Sums over
+    these rectangles are calculated for all cells at once from a
+    cumulative sum (summed-area table) of the mask.
+
+    """
+    mask_cube = _get_ne_land_mask_cube(cache_dir=cache_dir)
+    mask_lats = mask_cube.coord('latitude').points
+    mask_lons = mask_cube.coord('longitude').points
+    table = np.zeros((mask_lats.size + 1, mask_lons.size + 1))
+    table[1:, 1:] = mask_cube.data.cumsum(axis=0).cumsum(axis=1)
+
+    def rectangle_sum(lat_0, lat_1, lon_0, lon_1):
+        return (table[lat_1, lon_1] - table[lat_0, lon_1] -
+                table[lat_1, lon_0] + table[lat_0, lon_0])
+
+    (lat_min, lat_max, lon_min, lon_max) = np.broadcast_arrays(
+        lat_min, lat_max, lon_min, lon_max)
+    lat_0 = np.searchsorted(mask_lats, lat_min, side='left')
+    lat_1 = np.searchsorted(mask_lats, lat_max, side='right')
+
+    # Longitude ranges are shifted to [-180, 180), ranges that cross the
+    # dateline are split into two parts
+    width = lon_max - lon_min
+    lon_min = (lon_min + 180.0) % 360.0 - 180.0
+    lon_max = lon_min + width
+    full_circle = width >= 360.0
+    lon_0 = np.where(full_circle, 0,
+                     np.searchsorted(mask_lons, lon_min, side='left'))
+    lon_1 = np.where(
+        full_circle, mask_lons.size,
+        np.searchsorted(mask_lons, np.minimum(lon_max, 180.0), side='right'))
+    lon_2 = np.zeros_like(lon_0)
+    lon_3 = np.where(
+        (lon_max > 180.0) & ~full_circle,
+        np.searchsorted(mask_lons, lon_max - 360.0, side='right'), 0)
+
+    land = (rectangle_sum(lat_0, lat_1, lon_0, lon_1) +
+            rectangle_sum(lat_0, lat_1, lon_2, lon_3))
+    n_points = (lat_1 - lat_0) * ((lon_1 - lon_0) + (lon_3 - lon_2))
+
+    # Cells smaller than the resolution of the mask use the nearest point
+    empty = n_points == 0
+    if np.any(empty):
+        lat_idx = np.abs(mask_lats - ((lat_min + lat_max) / 2.0)[empty][
+            ..., np.newaxis]).argmin(axis=-1)
+        lon_center = ((lon_min + lon_max) / 2.0 + 180.0) % 360.0 - 180.0
+        lon_idx = np.abs(mask_lons - lon_center[empty][..., np.newaxis]
+                         ).argmin(axis=-1)
+        land[empty] = mask_cube.data[lat_idx, lon_idx]
+        n_points = np.where(empty, 1, n_points)
+    return land / n_points
+
+
+def get_landsea_fraction_weights(cube, area_type, normalize=False,
+                                 land_mask_cache_dir=None):
     """Get land/sea fraction weights calculated from Natural Earth files.
 
-    Note
-    ----
-    The implementation of this feature is not optimal. For large cubes,
-    calculating the land/sea fraction weights might be very slow. Only works
-    for regular grids.
+    The land fraction of each grid cell is the fraction of points of a
+    rasterized Natural Earth land mask that lie within the latitude and
+    longitude range of the cell. Regular grids with 0D or 1D coordinates and
+    curvilinear grids with 2D coordinates (using the range of the cell
+    vertices) are supported.
 
     Parameters
     ----------
@@ -567,12 +726,16 @@ def get_landsea_fraction_weights(cube, area_type, normalize=False):
         ``'sea'`` (sea fraction weighting).
     normalize : bool, optional (default: False)
         Normalize weights with total land/sea fraction.
+    land_mask_cache_dir : str, optional
+        Directory in which the rasterized Natural Earth land mask is cached.
+        If not given, the mask is only cached in memory.
 
     Raises
     ------
     iris.exceptions.CoordinateMultiDimError
         Dimension of ``latitude`` or ``longitude`` coordinate is greater than
-        1.
+        2 or only one of them is 2D or 2D coordinates do not span the same
+        dimensions.
     iris.exceptions.CoordinateNotFoundError
         Cube does not contain the coordinates ``latitude`` and ``longitude``.
     ValueError
@@ -590,12 +753,16 @@ def get_landsea_fraction_weights(cube, area_type, normalize=False):
                   f'{area_type} fraction weights')
     lat_coord = cube.coord('latitude')
     lon_coord = cube.coord('longitude')
+    curvilinear = (lat_coord.ndim == 2 and lon_coord.ndim == 2 and
+                   cube.coord_dims(lat_coord) == cube.coord_dims(lon_coord))
     for coord in (lat_coord, lon_coord):
-        if coord.ndim > 1:
+        if coord.ndim > 1 and not curvilinear:
             raise iris.exceptions.CoordinateMultiDimError(
                 f"Calculating {area_type} fraction weights for "
-                f"multidimensional coordinate '{coord.name}' is not supported")
-    if cube.coord_dims(lat_coord) != ():
+                f"multidimensional coordinate '{coord.name}' is only "
+                f"supported for 2D latitude and longitude coordinates that "
+                f"span the same dimensions")
+    if cube.coord_dims(lat_coord) != () and not curvilinear:
         if cube.coord_dims(lat_coord) == cube.coord_dims(lon_coord):
             raise ValueError(
                 f"1D latitude and longitude coordinates share dimensions "
@@ -604,17 +771,9 @@ def get_landsea_fraction_weights(cube, area_type, normalize=False):
                 "longitude that share dimensions is not possible")
 
     # Calculate land fractions on coordinate grid of cube
-    ne_land_mask_cube = _get_ne_land_mask_cube()
-    land_fraction = np.empty((lat_coord.shape[0], lon_coord.shape[0]),
-                             dtype=np.float64)
-    for lat_idx in range(lat_coord.shape[0]):
-        for lon_idx in range(lon_coord.shape[0]):
-            lat_bounds = lat_coord.bounds[lat_idx]
-            lon_bounds = lon_coord.bounds[lon_idx]
-            submask = ne_land_mask_cube.intersection(latitude=lat_bounds,
-                                                     longitude=lon_bounds)
-            land_fraction[lat_idx, lon_idx] = (submask.data.sum() /
-                                               submask.data.size)
+    land_fraction = _get_land_fraction(
+        *_get_cell_ranges(lat_coord, lon_coord),
+        cache_dir=land_mask_cache_dir)
     if area_type == 'sea':
         fraction_weights = 1.0 - land_fraction
     else:
@@ -623,6 +782,9 @@ def get_landsea_fraction_weights(cube, area_type, normalize=False):
         fraction_weights /= np.ma.sum(fraction_weights)
 
     # Broadcast to original shape
+    if curvilinear:
+        return iris.util.broadcast_to_shape(fraction_weights, cube.shape,
+                                            cube.coord_dims(lat_coord))
     coord_dims = []
     if cube.coord_dims(lon_coord):
         coord_dims.append(cube.coord_dims(lon_coord)[0])
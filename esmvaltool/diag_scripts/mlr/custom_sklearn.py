@@ -66,15 +66,21 @@ from traceback import format_exc
 import numpy as np
 import scipy.sparse as sp
 from joblib import Parallel, delayed, effective_n_jobs
-from sklearn.base import BaseEstimator, clone, is_classifier
+from sklearn.base import (
+    BaseEstimator,
+    TransformerMixin,
+    clone,
+    is_classifier,
+)
 from sklearn.compose import ColumnTransformer, TransformedTargetRegressor
 from sklearn.exceptions import FitFailedWarning, NotFittedError
 from sklearn.feature_selection import RFE, SelectorMixin
+from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import check_scoring
 from sklearn.model_selection import check_cv
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import FunctionTransformer
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
 from sklearn.utils import check_array, check_X_y, indexable, safe_sqr
 from sklearn.utils.fixes import np_version, parse_version
 from sklearn.utils.metaestimators import available_if
@@ -407,20 +413,7 @@ def _fit_and_score_weighted(estimator, x_data, y_data, scorer, train, test,
         else:
             estimator.fit(x_train, y_train, **fit_params)
     except Exception as exc:
-        if error_score == 'raise':
-            raise
-        if isinstance(error_score, numbers.Number):
-            test_score = error_score
-            warnings.warn(
-                f"Estimator fit failed. The score on this train-test "
-                f"partition for these parameters will be set to "
-                f"{error_score:f}. Details: \n{format_exc()}",
-                FitFailedWarning)
-        else:
-            raise ValueError(
-                "error_score must be the string 'raise' or a "
-                "numeric value. (Hint: if using 'raise', please "
-                "make sure that it has been spelled correctly.)") from exc
+        test_score = _get_failed_fit_score(error_score, exc)
     else:
         test_score = _score_weighted(estimator, x_test, y_test, scorer,
                                      sample_weights=sample_weights_test)
@@ -428,6 +421,123 @@ def _fit_and_score_weighted(estimator, x_data, y_data, scorer, train, test,
     return test_score
 
 
+def _efecv_single_fold(estimator, x_data, y_data, scorer, train, test,
+                       supports, fit_params, error_score=np.nan,
+                       sample_weights=None):
+    """Return the scores of all feature combinations for one fold."""
+    fit_params = fit_params if fit_params is not None else {}
+    (x_train, y_train) = _safe_split(estimator, x_data, y_data, train)
+    cached_transformers = _get_cached_transformers(
+        estimator, x_train, y_train,
+        **_check_fit_params(x_data, fit_params, train))
+
+    # Fall back to fitting the whole pipeline for every feature combination
+    if cached_transformers is None:
+        scores = []
+        for support in supports:
+            new_estimator = clone(estimator)
+            _update_transformers_param(new_estimator, support)
+            scores.append(_fit_and_score_weighted(
+                new_estimator, x_data[:, support], y_data, scorer, train,
+                test, None, fit_params, error_score=error_score,
+                sample_weights=sample_weights))
+        return scores
+
+    # Only fit final step for every feature combination
+    (x_test, y_test) = _safe_split(estimator, x_data, y_data, test, train)
+    if sample_weights is not None:
+        sample_weights_test = sample_weights[test]
+    else:
+        sample_weights_test = None
+    scores = []
+    for support in supports:
+        try:
+            new_estimator = cached_transformers.fit_estimator(support, y_train)
+        except Exception as exc:
+            scores.append(_get_failed_fit_score(error_score, exc))
+        else:
+            scores.append(_score_weighted(new_estimator, x_test[:, support],
+                                          y_test, scorer,
+                                          sample_weights=sample_weights_test))
+    return scores
+
+
+def _get_cached_transformers(estimator, x_data, y_data, **fit_kwargs):
+    """Fit transformer steps of ``estimator`` only once on all features.
+
+    Returns ``None`` if this is not possible, i.e., if ``estimator`` is not an
+    :class:`AdvancedPipeline`, contains transformer steps that do not
+    transform every feature independently (e.g., PCA) or fit parameters for
+    transformer steps are given.
+
+    """
+    if not isinstance(estimator, AdvancedPipeline) or sp.issparse(x_data):
+        return None
+    if len(estimator.steps) < 2:
+        return None
+    if not all(_is_columnwise(step) for (_, step) in estimator.steps[:-1]):
+        return None
+    fit_params = _get_fit_parameters(fit_kwargs, estimator.steps,
+                                     estimator.__class__)
+    final_name = estimator.steps[-1][0]
+    if any(params for (name, params) in fit_params.items()
+           if name != final_name):
+        return None
+    pipeline = clone(estimator)
+    x_trans = pipeline.fit_transformers_only(x_data, y_data, **fit_kwargs)
+    columns = _get_columnwise_output(pipeline, x_data.shape[1])
+    if columns is None:
+        return None
+    return _CachedTransformers(pipeline, x_trans, columns,
+                               fit_params[final_name])
+
+
+def _get_columnwise_output(pipeline, n_features):
+    """Get output column of every feature for fitted column-wise steps."""
+    columns = np.arange(n_features)
+    n_columns = n_features
+    for (_, step) in pipeline.steps[:-1]:
+        if isinstance(step, ColumnTransformer):
+            new_columns = np.full(n_columns, -1)
+            idx = 0
+            for (_, transformer, step_columns) in step.transformers_:
+                if isinstance(transformer, str) and transformer == 'drop':
+                    continue
+                step_columns = np.asarray(step_columns, dtype=object)
+                if step_columns.size and not all(
+                        isinstance(col, numbers.Integral)
+                        for col in step_columns):
+                    return None
+                if not _keeps_all_columns(transformer):
+                    return None
+                for col in step_columns:
+                    new_columns[col] = idx
+                    idx += 1
+            if (new_columns < 0).any():
+                return None
+            columns = new_columns[columns]
+        elif not _keeps_all_columns(step):
+            return None
+    return columns
+
+
+def _get_failed_fit_score(error_score, exc):
+    """Get score for failed fit (or raise error) depending on settings."""
+    if error_score == 'raise':
+        raise exc
+    if isinstance(error_score, numbers.Number):
+        warnings.warn(
+            f"Estimator fit failed. The score on this train-test "
+            f"partition for these parameters will be set to "
+            f"{error_score:f}. Details: \n{format_exc()}",
+            FitFailedWarning)
+        return error_score
+    raise ValueError(
+        "error_score must be the string 'raise' or a "
+        "numeric value. (Hint: if using 'raise', please "
+        "make sure that it has been spelled correctly.)") from exc
+
+
 def _get_fit_parameters(fit_kwargs, steps, cls):
     """Retrieve fit parameters from ``fit_kwargs``."""
     params = {name: {} for (name, step) in steps if step is not None}
@@ -448,6 +558,29 @@ def _get_fit_parameters(fit_kwargs, steps, cls):
     return params
 
 
+def _is_columnwise(transformer):
+    """Check if (unfitted) transformer transforms every feature separately."""
+    if transformer is None or isinstance(transformer, str):
+        return transformer in (None, 'passthrough', 'drop')
+    if isinstance(transformer, ColumnTransformer):
+        return (_is_columnwise(transformer.remainder) and all(
+            _is_columnwise(trans)
+            for (_, trans, _) in transformer.transformers))
+    if isinstance(transformer, SimpleImputer):
+        return not transformer.add_indicator
+    return isinstance(transformer, StandardScaler)
+
+
+def _keeps_all_columns(transformer):
+    """Check if fitted column-wise transformer does not drop features."""
+    if not isinstance(transformer, SimpleImputer):
+        return True
+    if transformer.keep_empty_features:
+        return True
+    statistics = np.asarray(transformer.statistics_)
+    return not (statistics.dtype.kind == 'f' and np.isnan(statistics).any())
+
+
 def _score_weighted(estimator, x_test, y_test, scorer, sample_weights=None):
     """Expand :func:`sklearn.model_selection._validation._score`."""
     if y_test is None:
@@ -600,24 +733,36 @@ def perform_efecv(estimator, x_data, y_data, **kwargs):
     logger.info(
         "Testing all %i possible feature combinations for exhaustive feature "
         "selection", len(supports))
-    grid_scores = []
-    for support in supports:
-        support = np.array(support)
-        features = np.arange(n_all_features)[support]
-
-        # Evaluate estimator on new subset of features
-        new_estimator = clone(estimator)
-        _update_transformers_param(new_estimator, support)
-        scores = cross_val_score_weighted(new_estimator, x_data[:, features],
-                                          y_data, **kwargs)
-        grid_scores.append(np.mean(scores))
+    supports = [np.array(support) for support in supports]
+    allowed_kwargs = getfullargspec(cross_val_score_weighted).args[3:]
+    for key in kwargs:
+        if key not in allowed_kwargs:
+            raise TypeError(
+                f"perform_efecv() got an unexpected keyword argument '{key}'")
+
+    # Evaluate estimator on all subsets of features (transformer steps are
+    # only fitted once per fold if possible)
+    scorer = check_scoring(estimator, scoring=kwargs.get('scoring'))
+    cv = check_cv(kwargs.get('cv'), y_data,
+                  classifier=is_classifier(estimator))
+    parallel = Parallel(n_jobs=kwargs.get('n_jobs'),
+                        verbose=kwargs.get('verbose', 0),
+                        pre_dispatch=kwargs.get('pre_dispatch', '2*n_jobs'))
+    scores = parallel(
+        delayed(_efecv_single_fold)(
+            estimator, x_data, y_data, scorer, train, test, supports,
+            kwargs.get('fit_params'),
+            error_score=kwargs.get('error_score', np.nan),
+            sample_weights=kwargs.get('sample_weights'))
+        for (train, test) in cv.split(x_data, y_data, kwargs.get('groups')))
+    grid_scores = np.mean(scores, axis=0)
+    for (support, score) in zip(supports, grid_scores):
         logger.debug("Fitted estimator with %i features, CV score was %.5f",
-                     support.sum(), np.mean(scores))
+                     support.sum(), score)
 
     # Final parameters
-    grid_scores = np.array(grid_scores)
     best_idx = np.argmax(grid_scores)
-    support = np.array(supports[best_idx])
+    support = supports[best_idx]
     features = np.arange(n_all_features)[support]
     n_features = support.sum()
     ranking = np.where(support, 1, 2)
@@ -636,6 +781,74 @@ def perform_efecv(estimator, x_data, y_data, **kwargs):
     return (best_estimator, transformer)
 
 
+class _CachedTransformers():
+    """Transformer steps of a pipeline fitted once on all features.
+
+    Only valid for transformer steps which transform every feature
+    independently (see :func:`_get_cached_transformers`). Fitting these on a
+    subset of features is then equivalent to selecting the corresponding
+    columns of the transformed data.
+
+    """
+
+    def __init__(self, pipeline, x_trans, columns, final_fit_kwargs):
+        """Initialize class members."""
+        self.pipeline = pipeline
+        self.x_trans = x_trans
+        self.columns = columns
+        self.final_fit_kwargs = final_fit_kwargs
+
+    def fit_estimator(self, support, y_data, previous_estimator=None):
+        """Fit final step of pipeline on subset of features.
+
+        If the final step of ``previous_estimator`` contains a linear
+        regressor with ``warm_start=True``, its coefficients are used as
+        initialization.
+
+        """
+        (final_name, final_step) = self.pipeline.steps[-1]
+        columns = np.sort(self.columns[support])
+        new_final_step = None
+        if previous_estimator is not None:
+            new_final_step = previous_estimator.steps[-1][1]
+            regressor = getattr(new_final_step, 'regressor_', None)
+            coef = getattr(regressor, 'coef_', None)
+            if (getattr(regressor, 'warm_start', False) and
+                    getattr(coef, 'ndim', None) == 1):
+                previous_columns = previous_estimator.steps[0][1].columns
+                regressor.coef_ = coef[np.isin(previous_columns, columns)]
+            else:
+                new_final_step = None
+        if new_final_step is None:
+            new_final_step = clone(final_step)
+        new_final_step.fit(self.x_trans[:, columns], y_data,
+                           **self.final_fit_kwargs)
+        transformer = _FeatureSubsetTransformer(self.pipeline, support,
+                                                columns)
+        return AdvancedPipeline([('cached_transformers', transformer),
+                                 (final_name, new_final_step)])
+
+
+class _FeatureSubsetTransformer(BaseEstimator, TransformerMixin):
+    """Apply transformer steps fitted on all features to subset of them."""
+
+    def __init__(self, pipeline, support, columns):
+        """Initialize class members."""
+        self.pipeline = pipeline
+        self.support = support
+        self.columns = columns
+
+    def fit(self, *_, **__):
+        """Do nothing (transformer steps are already fitted)."""
+        return self
+
+    def transform(self, x_data):
+        """Transform subset of features."""
+        x_all = np.zeros((x_data.shape[0], self.support.size))
+        x_all[:, self.support] = x_data
+        return self.pipeline.transform_only(x_all)[:, self.columns]
+
+
 class AdvancedPipeline(Pipeline):
     """Expand :class:`sklearn.pipeline.Pipeline`."""
 
@@ -733,18 +946,29 @@ class AdvancedRFE(RFE):
         if step_score:
             self.scores_ = []
 
+        # Transformer steps (e.g., imputers or scalers) are only fitted once
+        # if they transform every feature independently
+        cached_transformers = None
+        if np.sum(support_) > n_features_to_select:
+            cached_transformers = _get_cached_transformers(
+                self.estimator, x_data, y_data, **fit_kwargs)
+
         # Elimination
+        estimator = None
         while np.sum(support_) > n_features_to_select:
             # Remaining features
             features = np.arange(n_features)[support_]
 
             # Rank the remaining features
-            estimator = clone(self.estimator)
             if self.verbose > 0:
                 print(f"Fitting estimator with {np.sum(support_):d} features.")
-
-            _update_transformers_param(estimator, support_)
-            estimator.fit(x_data[:, features], y_data, **fit_kwargs)
+            if cached_transformers is None:
+                estimator = clone(self.estimator)
+                _update_transformers_param(estimator, support_)
+                estimator.fit(x_data[:, features], y_data, **fit_kwargs)
+            else:
+                estimator = cached_transformers.fit_estimator(
+                    support_, y_data, previous_estimator=estimator)
 
             # Get coefs (hasattr(estimator, 'coef_') raises a KeyError for
             # XGBRegressor models
@@ -916,7 +1140,12 @@ class AdvancedTransformedTargetRegressor(TransformedTargetRegressor):
         return self.regressor_.feature_importances_
 
     def fit(self, x_data, y_data, **fit_kwargs):
-        """Expand :meth:`fit` to accept kwargs."""
+        """Expand :meth:`fit` to accept kwargs.
+
+        If the regressor uses ``warm_start=True``, an already fitted regressor
+        is reused (and not cloned) in subsequent calls of this function.
+
+        """
         (y_2d,
          regressor_kwargs) = self.fit_transformer_only(y_data, **fit_kwargs)
 
@@ -925,9 +1154,14 @@ class AdvancedTransformedTargetRegressor(TransformedTargetRegressor):
         if y_trans.ndim == 2 and y_trans.shape[1] == 1:
             y_trans = y_trans.squeeze(axis=1)
 
-        # Perform linear regression if regressor is not given
+        # Perform linear regression if regressor is not given (reuse fitted
+        # regressor if warm start is desired)
         if self.regressor is None:
             self.regressor_ = LinearRegression()
+        elif (getattr(self.regressor, 'warm_start', False) and
+              type(getattr(self, 'regressor_', None)) is
+              type(self.regressor)):
+            self.regressor_.set_params(**self.regressor.get_params())
         else:
             self.regressor_ = clone(self.regressor)
 
@@ -48,6 +48,12 @@ ignore: list of dict, optional
 mlr_model_type: str
     MLR model type. The given model has to be defined in
     :mod:`esmvaltool.diag_scripts.mlr.models`.
+n_parallel_groups: int, optional (default: 1)
+    Number of processes used to create the MLR models of different groups
+    (see ``group_metadata`` and ``pseudo_reality``) in parallel. Use ``-1`` to
+    use all processors. To avoid oversubscription, the option ``n_jobs`` of
+    the individual MLR models is limited to the number of processors divided
+    by the number of parallel groups.
 only_predict: bool, optional (default: False)
     If ``True``, only use
     :meth:`esmvaltool.diag_scripts.mlr.models.MLRModel.predict` and do not
@@ -101,6 +107,11 @@ select_metadata: dict, optional
     Pre-select input data by specifying (key, value) pairs. Affects all
     datasets regardless of ``var_type``.
 
+To skip the training of MLR models whose training data and settings did not
+change since a previous run (e.g., when only ``prediction_input`` datasets are
+changed), use the option ``fitted_model_dir`` of
+:class:`esmvaltool.diag_scripts.mlr.models.MLRModel`.
+
 Additional optional parameters are optional parameters for
 :class:`esmvaltool.diag_scripts.mlr.models.MLRModel` given :ref:`here
 <MLRModeloptionalparameters>` or optional parameters of
@@ -109,7 +120,9 @@ Additional optional parameters are optional parameters for
 """
 
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from pprint import pformat
 
@@ -120,6 +133,7 @@ from esmvaltool.diag_scripts.mlr.mmm import main as create_mmm_model
 from esmvaltool.diag_scripts.mlr.models import MLRModel
 from esmvaltool.diag_scripts.shared import (
     group_metadata,
+    init_diagnostic_worker,
     run_diagnostic,
     select_metadata,
 )
@@ -151,6 +165,21 @@ def _get_grouped_data(cfg, input_data):
     return (group_attribute, grouped_input_data)
 
 
+def _get_n_parallel_groups(cfg, n_groups):
+    """Get number of groups processed in parallel and ``n_jobs`` per group."""
+    n_cpus = os.cpu_count() or 1
+    n_parallel_groups = cfg.get('n_parallel_groups', 1)
+    if n_parallel_groups is None or n_parallel_groups < 1:
+        n_parallel_groups = n_cpus
+    n_parallel_groups = min(n_parallel_groups, n_groups)
+    n_jobs = cfg.get('n_jobs', 1)
+    if n_parallel_groups > 1:
+        max_n_jobs = max(1, n_cpus // n_parallel_groups)
+        if n_jobs is None or n_jobs < 1 or n_jobs > max_n_jobs:
+            n_jobs = max_n_jobs
+    return (n_parallel_groups, n_jobs)
+
+
 def _get_pseudo_reality_data(cfg, input_data):
     """Get input data groups for pseudo-reality experiment."""
     pseudo_reality_attrs = cfg['pseudo_reality']
@@ -208,6 +237,53 @@ def _get_raw_input_data(cfg):
     return input_data
 
 
+def _run_mlr_model_for_group(cfg, mlr_model_type, group_attribute, descr,
+                             datasets):
+    """Run MLR model of desired type on input data of a single group."""
+    cfg = deepcopy(cfg)
+    if descr is not None:
+        attr = '' if group_attribute is None else f'{group_attribute} '
+        logger.info("Creating MLR model '%s' for %s'%s'", mlr_model_type,
+                    attr, descr)
+        cfg['sub_dir'] = descr
+    mlr_model = MLRModel.create(mlr_model_type, datasets, **cfg)
+
+    # Update MLR model parameters dynamically
+    _update_mlr_model(mlr_model_type, mlr_model)
+
+    # Fit (or load already fitted model) and predict
+    if ('grid_search_cv_param_grid' in cfg and
+            cfg['grid_search_cv_param_grid']):
+        cv_param_grid = cfg['grid_search_cv_param_grid']
+        cv_kwargs = cfg.get('grid_search_cv_kwargs', {})
+        mlr_model.fit_or_load('grid_search_cv', param_grid=cv_param_grid,
+                              **cv_kwargs)
+    elif 'efecv_kwargs' in cfg:
+        mlr_model.fit_or_load('efecv', **cfg['efecv_kwargs'])
+    elif 'rfecv_kwargs' in cfg:
+        mlr_model.fit_or_load('rfecv', **cfg['rfecv_kwargs'])
+    else:
+        mlr_model.fit_or_load()
+    predict_args = {
+        'save_mlr_model_error': cfg.get('save_mlr_model_error'),
+        'save_lime_importance': cfg.get('save_lime_importance'),
+        'save_propagated_errors': cfg.get('save_propagated_errors'),
+        **cfg.get('predict_kwargs', {}),
+    }
+    mlr_model.predict(**predict_args)
+
+    # Print further information
+    mlr_model.print_correlation_matrices()
+    mlr_model.print_regression_metrics()
+    mlr_model.test_normality_of_residuals()
+
+    # Skip further output if desired
+    if not cfg.get('only_predict'):
+        mlr_model.export_training_data()
+        mlr_model.export_prediction_data()
+        run_mlr_model_plots(cfg, mlr_model, mlr_model_type)
+
+
 def _update_mlr_model(mlr_model_type, mlr_model):
     """Update MLR model parameters during run time."""
     if mlr_model_type == 'gpr_sklearn':
@@ -248,48 +324,40 @@ def get_grouped_data(cfg):
 
 
 def run_mlr_model(cfg, mlr_model_type, group_attribute, grouped_datasets):
-    """Run MLR model(s) of desired type on input data."""
-    for (descr, datasets) in grouped_datasets.items():
-        if descr is not None:
-            attr = '' if group_attribute is None else f'{group_attribute} '
-            logger.info("Creating MLR model '%s' for %s'%s'", mlr_model_type,
-                        attr, descr)
-            cfg['sub_dir'] = descr
-        mlr_model = MLRModel.create(mlr_model_type, datasets, **cfg)
-
-        # Update MLR model parameters dynamically
-        _update_mlr_model(mlr_model_type, mlr_model)
-
-        # Fit and predict
-        if ('grid_search_cv_param_grid' in cfg and
-                cfg['grid_search_cv_param_grid']):
-            cv_param_grid = cfg['grid_search_cv_param_grid']
-            cv_kwargs = cfg.get('grid_search_cv_kwargs', {})
-            mlr_model.grid_search_cv(cv_param_grid, **cv_kwargs)
-        elif 'efecv_kwargs' in cfg:
-            mlr_model.efecv(**cfg['efecv_kwargs'])
-        elif 'rfecv_kwargs' in cfg:
-            mlr_model.rfecv(**cfg['rfecv_kwargs'])
-        else:
-            mlr_model.fit()
-        predict_args = {
-            'save_mlr_model_error': cfg.get('save_mlr_model_error'),
-            'save_lime_importance': cfg.get('save_lime_importance'),
-            'save_propagated_errors': cfg.get('save_propagated_errors'),
-            **cfg.get('predict_kwargs', {}),
-        }
-        mlr_model.predict(**predict_args)
-
-        # Print further information
-        mlr_model.print_correlation_matrices()
-        mlr_model.print_regression_metrics()
-        mlr_model.test_normality_of_residuals()
-
-        # Skip further output if desired
-        if not cfg.get('only_predict'):
-            mlr_model.export_training_data()
-            mlr_model.export_prediction_data()
-            run_mlr_model_plots(cfg, mlr_model, mlr_model_type)
+    """Run MLR model(s) of desired type on input data.
+
+    Groups are processed in parallel if ``n_parallel_groups`` is given.
+
+    """
+    (n_parallel_groups, n_jobs) = _get_n_parallel_groups(
+        cfg, len(grouped_datasets))
+    if n_parallel_groups < 2:
+        for (descr, datasets) in grouped_datasets.items():
+            _run_mlr_model_for_group(cfg, mlr_model_type, group_attribute,
+                                     descr, datasets)
+        return
+    logger.info(
+        "Creating MLR models for %i groups using %i parallel processes (each "
+        "using at most %i processes)", len(grouped_datasets),
+        n_parallel_groups, n_jobs)
+    cfg = {**cfg, 'n_jobs': n_jobs}
+    # Use fresh interpreters, forking a process that has already used
+    # threads (e.g. through dask) may deadlock
+    with ProcessPoolExecutor(
+            max_workers=n_parallel_groups,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_diagnostic_worker,
+            initargs=(cfg, ),
+    ) as executor:
+        futures = [
+            executor.submit(_run_mlr_model_for_group, cfg, mlr_model_type,
+                            group_attribute, descr, datasets)
+            for (descr, datasets) in grouped_datasets.items()
+        ]
+
+        # Collect results in the order of the groups
+        for future in futures:
+            future.result()
 
 
 def run_mlr_model_plots(cfg, mlr_model, mlr_model_type):
@@ -211,6 +211,17 @@ categorical_features: list of str
     contrast to numerical features).
 coords_as_features: list of str
     If given, specify a list of coordinates which should be used as features.
+cube_cache_dir: str
+    If given, save the data of all input cubes (converted to ``dtype``) as
+    ``.npy`` files in this directory. In subsequent runs, these files are
+    memory-mapped instead of reading the original netCDF files. Files are
+    identified by their path, modification time, size and ``dtype``.
+cube_cache_size: float (default: 1024)
+    Maximum size (in MiB) of the in-memory cache of loaded input cubes, which
+    is shared by all MLR models of a process with identical
+    ``cube_cache_size`` and ``cube_cache_dir`` (e.g., when multiple groups are
+    trained by the :ref:`MLR main diagnostic script
+    <api.esmvaltool.diag_scripts.mlr.main>`). Use ``0`` to disable it.
 dtype: str (default: 'float64')
     Internal data type which is used for all calculations, see
     `<https://docs.scipy.org/doc/numpy/user/basics.types.html>`_ for a list of
@@ -219,6 +230,10 @@ fit_kwargs: dict
     Optional keyword arguments for the pipeline's ``fit()`` function.  These
     arguments have to be given for each step of the pipeline separated by two
     underscores, i.e. ``s__p`` is the parameter ``p`` for step ``s``.
+fitted_model_dir: str
+    If given, save fitted pipelines in this directory and reuse them in
+    subsequent runs if the training data and all settings relevant for the
+    fitting are unchanged (see :meth:`fit_or_load`).
 group_datasets_by_attributes: list of str
     List of dataset attributes which are used to group input data for
     ``feature`` s and ``label`` s. For example, this is necessary if the MLR
@@ -232,6 +247,17 @@ imputation_strategy: str (default: 'remove')
     Strategy for the imputation of missing values in the features. Must be one
     of ``'remove'``, ``'mean'``, ``'median'``, ``'most_frequent'`` or
     ``'constant'``.
+lime_batch_size: int (default: 50)
+    Number of prediction points for which the LIME perturbation samples are
+    evaluated by a single call of the pipeline's ``predict()`` function (used
+    for ``save_lime_importance`` and ``save_propagated_errors`` in
+    :meth:`predict`). Larger values are faster but need more memory (roughly
+    ``0.25 * lime_batch_size * n_features`` MiB).
+lime_subsample: int (default: 1)
+    If larger than 1, only evaluate LIME on every ``lime_subsample``-th grid
+    point along the latitude and longitude dimensions (all dimensions if these
+    are not available) of the prediction input and use the value of the
+    nearest evaluated point for all other points.
 log_level: str (default: 'info')
     Verbosity for the logger. Must be one of ``'debug'``, ``'info'``,
     ``'warning'`` or ``'error'``.
@@ -293,23 +319,28 @@ work_dir: str (default: ~/work)
 
 """
 
+import hashlib
 import importlib
 import logging
 import os
+import re
 import warnings
+from collections import OrderedDict
 from copy import deepcopy
 from inspect import getfullargspec
 from pprint import pformat
 
 import iris
+import joblib
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
+import sklearn
 from cf_units import Unit
-from joblib import Parallel, delayed
 from lime.lime_tabular import LimeTabularExplainer
 from matplotlib.ticker import ScalarFormatter
+from scipy.spatial import cKDTree
 from scipy.stats import shapiro
 from sklearn import metrics
 from sklearn.compose import ColumnTransformer
@@ -335,6 +366,7 @@ from esmvaltool.diag_scripts.mlr.custom_sklearn import (
     perform_efecv,
 )
 from esmvaltool.diag_scripts.shared import (
+    MetadataIndex,
     ProvenanceLogger,
     group_metadata,
     io,
@@ -344,10 +376,129 @@ from esmvaltool.diag_scripts.shared import (
 logger = logging.getLogger(os.path.basename(__file__))
 
 
+class _CubeCache():
+    """Least recently used cache for input cubes of MLR models.
+
+    Loaded cubes are kept in memory up to a total data size of
+    ``max_bytes``. In addition, the data of the cubes (converted to the
+    desired dtype) can be saved as ``.npy`` files in ``cache_dir``; these
+    files are memory-mapped when the same file is loaded again (e.g. in
+    subsequent runs) instead of reading the original netCDF file.
+
+    """
+
+    def __init__(self, max_bytes=0, cache_dir=None):
+        """Initialize class members."""
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._cubes = OrderedDict()
+        self._n_bytes = 0
+
+    def clear(self):
+        """Remove all cubes from the in-memory cache."""
+        self._cubes.clear()
+        self._n_bytes = 0
+
+    def get(self, key):
+        """Get copy of cached cube (``None`` if not cached).
+
+        The returned cube shares its (read-only) data with the cached cube.
+
+        """
+        if key not in self._cubes:
+            return None
+        self._cubes.move_to_end(key)
+        cube = self._cubes[key]
+        return cube.copy(data=cube.core_data())
+
+    def load_data(self, cube, filename, dtype):
+        """Get data of ``cube`` loaded from ``filename`` as ``dtype``."""
+        data = cube.core_data().astype(dtype, casting='same_kind')
+        if self.cache_dir is None:
+            return data
+        key = '|'.join(str(k) for k in self.get_key(filename, dtype))
+        name = hashlib.sha1(key.encode()).hexdigest()
+        data_file = os.path.join(self.cache_dir, f'{name}.npy')
+        mask_file = os.path.join(self.cache_dir, f'{name}_mask.npy')
+
+        # The data file is written last and marks a complete entry
+        if os.path.exists(data_file):
+            logger.debug("Using cached data %s for %s", data_file, filename)
+            data = np.load(data_file, mmap_mode='r')
+            if os.path.exists(mask_file):
+                data = np.ma.array(data, mask=np.load(mask_file), copy=False)
+            return data
+        if not isinstance(data, np.ndarray):
+            data = data.compute()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if np.ma.is_masked(data):
+                self._save(mask_file, np.ma.getmaskarray(data))
+            self._save(data_file, np.ma.getdata(data))
+        except OSError as exc:
+            logger.debug("Could not cache data of %s in %s: %s", filename,
+                         data_file, exc)
+        return data
+
+    def put(self, key, cube):
+        """Cache ``cube`` (its data is realized and set to read-only)."""
+        if not self.max_bytes:
+            return
+        n_bytes = self._get_n_bytes(cube)
+        if n_bytes > self.max_bytes:
+            return
+        if key in self._cubes:
+            self._n_bytes -= self._get_n_bytes(self._cubes.pop(key))
+        data = cube.data
+        data.flags.writeable = False
+        if np.ma.getmask(data) is not np.ma.nomask:
+            data.mask.flags.writeable = False
+        self._cubes[key] = cube.copy(data=data)
+        self._n_bytes += n_bytes
+        self._evict()
+
+    def resize(self, max_bytes):
+        """Change maximum size of the in-memory cache."""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used cubes until cache is small enough."""
+        while self._n_bytes > self.max_bytes:
+            (_, old_cube) = self._cubes.popitem(last=False)
+            self._n_bytes -= self._get_n_bytes(old_cube)
+
+    @staticmethod
+    def get_key(filename, *args):
+        """Get key identifying ``filename`` and its current version."""
+        stat = os.stat(filename)
+        return (os.path.realpath(filename), stat.st_mtime_ns, stat.st_size,
+                *args)
+
+    @staticmethod
+    def _get_n_bytes(cube):
+        """Get size of (realized) data of cube."""
+        data = cube.data
+        n_bytes = data.nbytes
+        if np.ma.getmask(data) is not np.ma.nomask:
+            n_bytes += data.mask.nbytes
+        return n_bytes
+
+    @staticmethod
+    def _save(filename, array):
+        """Save array to ``.npy`` file atomically."""
+        tmp_file = f'{filename}.{os.getpid()}.npy'
+        np.save(tmp_file, array)
+        os.replace(tmp_file, filename)
+
+
 class MLRModel():
     """Base class for MLR models."""
 
     _CLF_TYPE = None
+    _CUBE_CACHES = {}
+    _LIME_N_FEATURES = 10
+    _LIME_N_SAMPLES = 5000
     _MODELS = {}
     _MLR_MODEL_TYPE = None
 
@@ -383,6 +534,15 @@ class MLRModel():
 
         return decorator
 
+    @classmethod
+    def _get_cube_cache(cls, max_bytes, cache_dir):
+        """Get cube cache shared by all MLR models with these settings."""
+        key = (max_bytes, cache_dir)
+        if key not in cls._CUBE_CACHES:
+            cls._CUBE_CACHES[key] = _CubeCache(max_bytes=max_bytes,
+                                               cache_dir=cache_dir)
+        return cls._CUBE_CACHES[key]
+
     @classmethod
     def create(cls, mlr_model_type, *args, **kwargs):
         """Create desired MLR model subclass (factory method)."""
@@ -439,6 +599,11 @@ class MLRModel():
         # Set default settings
         self._set_default_settings()
 
+        # Cache for input cubes (shared by MLR models with identical settings)
+        self._cube_cache = self._get_cube_cache(
+            int(self._cfg['cube_cache_size'] * 2**20),
+            self._cfg.get('cube_cache_dir'))
+
         # Random state
         self._random_state = np.random.RandomState(self._cfg['random_state'])
 
@@ -697,6 +862,45 @@ class MLRModel():
         # LIME
         self._load_lime_explainer()
 
+    def fit_or_load(self, fit_method='fit', **kwargs):
+        """Fit MLR model or load it from the store of fitted models.
+
+        If the option ``fitted_model_dir`` is given during class
+        initialization, fitted pipelines are saved in this directory. They are
+        identified by a hash of the training data, the pipeline's parameters,
+        ``fit_kwargs``, ``random_state``, ``fit_method`` and ``kwargs``. If a
+        matching fitted pipeline is found, it is loaded instead of fitting the
+        MLR model again (e.g., if only ``prediction_input`` datasets changed).
+
+        Parameters
+        ----------
+        fit_method : str, optional (default: 'fit')
+            Method used to fit the MLR model. Must be one of ``'efecv'``,
+            ``'fit'``, ``'grid_search_cv'`` or ``'rfecv'``.
+        **kwargs : keyword arguments, optional
+            Keyword arguments for ``fit_method``.
+
+        Raises
+        ------
+        ValueError
+            Invalid ``fit_method`` given.
+
+        """
+        allowed_methods = ('efecv', 'fit', 'grid_search_cv', 'rfecv')
+        if fit_method not in allowed_methods:
+            raise ValueError(
+                f"Expected one of {allowed_methods} for 'fit_method', got "
+                f"'{fit_method}'")
+        if not self._cfg.get('fitted_model_dir'):
+            getattr(self, fit_method)(**kwargs)
+            return
+        path = self._get_fitted_model_path(fit_method, kwargs)
+        if os.path.isfile(path):
+            self._load_fitted_model(path)
+            return
+        getattr(self, fit_method)(**kwargs)
+        self._save_fitted_model(path)
+
     def get_ancestors(self, label=True, features=None, prediction_names=None,
                       prediction_reference=False):
         """Return ancestor files.
@@ -1554,7 +1758,7 @@ class MLRModel():
             (x_pred, x_err, y_ref,
              x_cube) = self._extract_prediction_input(pred_name)
             pred_dict = self._get_prediction_dict(
-                pred_name, x_pred, x_err, y_ref,
+                pred_name, x_pred, x_err, y_ref, x_cube=x_cube,
                 get_mlr_model_error=save_mlr_model_error,
                 get_lime_importance=save_lime_importance,
                 get_propagated_errors=save_propagated_errors, **kwargs)
@@ -1838,15 +2042,11 @@ class MLRModel():
             return None
         weights = mlr.get_all_weights(cube, **self._cfg['weighted_samples'])
         weights = weights.astype(self._cfg['dtype'], casting='same_kind')
-        weights = pd.DataFrame(
-            {'sample_weight': weights.ravel()},
-            index=self._get_multiindex(cube, group_attr=group_attr),
-            dtype=self._cfg['dtype'],
-        )
+        weights = weights.ravel()
         msg = '' if group_attr is None else f" of '{group_attr}'"
         logger.debug(
             "Successfully calculated %i sample weights for training data%s "
-            "using %s", len(weights.index), msg, self._cfg['weighted_samples'])
+            "using %s", weights.size, msg, self._cfg['weighted_samples'])
         return weights
 
     def _check_clf(self):
@@ -2098,41 +2298,61 @@ class MLRModel():
             raise ValueError(
                 f"Excepted one of '{allowed_types}' for 'var_type', got "
                 f"'{var_type}'")
-        x_data = pd.DataFrame(columns=self.features, dtype=self._cfg['dtype'])
-        x_cube = None
-        if self._cfg['weighted_samples'] and var_type == 'feature':
-            sample_weights = pd.DataFrame(columns=['sample_weight'],
-                                          dtype=self._cfg['dtype'])
-        else:
-            sample_weights = None
 
-        # Iterate over datasets
-        datasets = select_metadata(datasets, var_type=var_type)
+        # Get reference cubes of all groups (datasets are selected by tag for
+        # every feature)
+        datasets = MetadataIndex(select_metadata(datasets, var_type=var_type))
         if var_type == 'feature':
             groups = self.group_attributes
         else:
             groups = [None]
+        all_group_datasets = []
+        ref_cubes = []
         for group_attr in groups:
-            group_datasets = select_metadata(datasets,
-                                             group_attribute=group_attr)
-            if group_attr is not None:
-                logger.info("Loading '%s' data of '%s'", var_type, group_attr)
+            group_datasets = MetadataIndex(
+                select_metadata(datasets, group_attribute=group_attr))
             msg = '' if group_attr is None else f" for '{group_attr}'"
             if not group_datasets:
                 raise ValueError(f"No '{var_type}' data{msg} found")
-            (group_data, x_cube,
-             weights) = self._get_x_data_for_group(group_datasets, var_type,
-                                                   group_attr)
-            x_data = pd.concat([x_data, group_data])
+            all_group_datasets.append(group_datasets)
+            ref_cubes.append(
+                self._get_reference_cube(group_datasets, var_type, msg))
+
+        # Allocate arrays for all data points at once
+        n_points = [int(np.prod(cube.shape)) for cube in ref_cubes]
+        x_array = np.empty((sum(n_points), len(self.features)),
+                           dtype=self._cfg['dtype'])
+        if self._cfg['weighted_samples'] and var_type == 'feature':
+            weights_array = np.empty(sum(n_points), dtype=self._cfg['dtype'])
+        else:
+            weights_array = None
 
-            # Append weights if desired
-            if sample_weights is not None:
-                sample_weights = pd.concat([sample_weights, weights])
+        # Iterate over groups
+        start = 0
+        for (group_attr, group_datasets, ref_cube,
+             n_group_points) in zip(groups, all_group_datasets, ref_cubes,
+                                    n_points):
+            if group_attr is not None:
+                logger.info("Loading '%s' data of '%s'", var_type, group_attr)
+            stop = start + n_group_points
+            weights = self._get_x_data_for_group(group_datasets, var_type,
+                                                 ref_cube, x_array[start:stop],
+                                                 group_attr)
+            if weights_array is not None:
+                weights_array[start:stop] = weights
+            start = stop
+        index = self._get_multiindex(groups, n_points)
+        x_data = pd.DataFrame(x_array, index=index, columns=self.features,
+                              copy=False)
+        x_cube = ref_cubes[-1]
 
         # Adapt sample_weights if necessary
-        if sample_weights is not None:
-            sample_weights.index = pd.MultiIndex.from_tuples(
-                sample_weights.index, names=self._get_multiindex_names())
+        if weights_array is None:
+            sample_weights = None
+        else:
+            sample_weights = pd.DataFrame(weights_array, index=index,
+                                          columns=['sample_weight'],
+                                          copy=False)
             logger.info(
                 "Successfully calculated sample weights for training data "
                 "using %s", self._cfg['weighted_samples'])
@@ -2146,10 +2366,6 @@ class MLRModel():
                     sample_weights.min().values[0],
                     sample_weights.max().values[0])
 
-        # Convert index back to MultiIndex
-        x_data.index = pd.MultiIndex.from_tuples(
-            x_data.index, names=self._get_multiindex_names())
-
         return (x_data, x_cube, sample_weights)
 
     def _extract_y_data(self, datasets, var_type):
@@ -2159,7 +2375,6 @@ class MLRModel():
             raise ValueError(
                 f"Excepted one of '{allowed_types}' for 'var_type', got "
                 f"'{var_type}'")
-        y_data = pd.DataFrame(columns=[self.label], dtype=self._cfg['dtype'])
 
         # Iterate over datasets
         datasets = select_metadata(datasets, var_type=var_type)
@@ -2167,6 +2382,7 @@ class MLRModel():
             groups = self.group_attributes
         else:
             groups = [None]
+        cubes = []
         for group_attr in groups:
             if group_attr is not None:
                 logger.info("Loading '%s' data of '%s'", var_type, group_attr)
@@ -2180,17 +2396,20 @@ class MLRModel():
             cube = self._load_cube(dataset)
             text = f"{var_type} '{self.label}'{msg}"
             self._check_cube_dimensions(cube, None, text)
-            cube_data = pd.DataFrame(
-                self._get_cube_data(cube),
-                columns=[self.label],
-                index=self._get_multiindex(cube, group_attr=group_attr),
-                dtype=self._cfg['dtype'],
-            )
-            y_data = pd.concat([y_data, cube_data])
-
-        # Convert index back to MultiIndex
-        y_data.index = pd.MultiIndex.from_tuples(
-            y_data.index, names=self._get_multiindex_names())
+            cubes.append(cube)
+
+        # Collect data of all groups in a single array
+        n_points = [int(np.prod(cube.shape)) for cube in cubes]
+        y_array = np.empty(sum(n_points), dtype=self._cfg['dtype'])
+        start = 0
+        for (cube, n_group_points) in zip(cubes, n_points):
+            stop = start + n_group_points
+            y_array[start:stop] = self._get_cube_data(cube)
+            start = stop
+        y_data = pd.DataFrame(y_array,
+                              index=self._get_multiindex(groups, n_points),
+                              columns=[self.label],
+                              copy=False)
 
         return y_data
 
@@ -2355,6 +2574,33 @@ class MLRModel():
 
         return (units, types)
 
+    def _get_fitted_model_path(self, fit_method, kwargs):
+        """Get path of fitted pipeline in store of fitted models."""
+        hasher = hashlib.sha1()
+        for (key, val) in sorted(self._get_clf_parameters().items()):
+            if key.endswith('memory') or key.endswith('random_state'):
+                continue
+            if hasattr(val, 'get_params'):
+                val = f'{type(val).__module__}.{type(val).__qualname__}'
+
+            # Memory addresses (e.g., of random states) differ between runs
+            val = re.sub(' at 0x[0-9a-fA-F]+', '', repr(val))
+            hasher.update(f'{key}={val};'.encode())
+        data_frame = self.data['train']
+        hasher.update(repr(list(data_frame.columns)).encode())
+        hasher.update(
+            pd.util.hash_pandas_object(data_frame, index=True).values)
+        hasher.update(repr((
+            self._cfg['fit_kwargs'],
+            self._cfg['random_state'],
+            fit_method,
+            sorted(kwargs.items()),
+            sklearn.__version__,
+        )).encode())
+        return os.path.join(
+            self._cfg['fitted_model_dir'],
+            f'{self._MLR_MODEL_TYPE}_{hasher.hexdigest()}.joblib')
+
     def _get_group_attributes(self):
         """Get all group attributes from ``label`` datasets."""
         logger.debug("Extracting group attributes from 'label' datasets")
@@ -2387,56 +2633,158 @@ class MLRModel():
                                        columns=['units'])
         return label
 
-    def _get_lime_feature_importance(self, x_pred):
+    def _get_lime_coefficients(self, x_pred, x_cube=None):
+        """Get coefficients of local linear models given by LIME.
+
+        Perturbation samples of ``lime_batch_size`` points are evaluated by
+        a single call of the pipeline's ``predict()`` function and the local
+        (weighted ridge) models are fitted simultaneously. For identical random
+        states, this gives the same results as
+        :meth:`lime.lime_tabular.LimeTabularExplainer.explain_instance` with
+        the settings used by this class.
+
+        """
+        x_pred = self._impute_nans(x_pred)
+        (subsample_idx, nearest_idx) = self._get_lime_subsample(x_pred, x_cube)
+        x_values = x_pred.values[subsample_idx]
+        logger.debug("Calculating LIME coefficients for %i point(s)",
+                     len(x_values))
+        batch_size = self._cfg['lime_batch_size']
+        coefs = np.empty(x_values.shape, dtype=np.float64)
+        for idx in range(0, len(x_values), batch_size):
+            coefs[idx:idx + batch_size] = self._get_lime_coefficients_batch(
+                x_values[idx:idx + batch_size])
+        return coefs[nearest_idx]
+
+    def _get_lime_coefficients_batch(self, x_values):
+        """Get coefficients of local linear models for a batch of points."""
+        explainer = self._lime_explainer
+        (n_points, n_features) = x_values.shape
+        n_samples = self._LIME_N_SAMPLES
+        data = np.empty((n_points, n_samples, n_features))
+        inverse = np.empty((n_points, n_samples, n_features))
+        for (idx, x_single) in enumerate(x_values):
+            (data[idx], inverse[idx]) = self._get_lime_samples(x_single)
+
+        # Vectorized prediction for all perturbation samples (ignore warnings
+        # about missing feature names here because they are not used)
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                'ignore',
+                message=('X does not have valid feature names, but '
+                         'SimpleImputer was fitted with feature names'),
+                category=UserWarning,
+                module='sklearn',
+            )
+            y_samples = self._clf.predict(
+                inverse.reshape(n_points * n_samples, n_features))
+        y_samples = np.asarray(y_samples, dtype=np.float64)
+        if y_samples.ndim == 2:
+            y_samples = y_samples[:, 0]
+        y_samples = y_samples.reshape(n_points, n_samples)
+
+        # Sample weights given by kernel on distances to original points
+        data = (data - explainer.scaler.mean_) / explainer.scaler.scale_
+        distances = np.linalg.norm(data - data[:, :1], axis=-1)
+        weights = explainer.base.kernel_fn(distances)
+
+        # Local models (LIME selects the features with highest weights if
+        # more than the maximum number of features are given)
+        if n_features <= self._LIME_N_FEATURES:
+            return self._solve_weighted_ridge(data, y_samples, weights, 1.0)
+        coefs = self._solve_weighted_ridge(data, y_samples, weights, 0.01)
+        used_features = np.argsort(-np.abs(coefs * data[:, 0]), axis=1,
+                                   kind='stable')
+        used_features = used_features[:, :self._LIME_N_FEATURES]
+        data = np.take_along_axis(data, used_features[:, np.newaxis], axis=2)
+        coefs = np.zeros((n_points, n_features))
+        np.put_along_axis(
+            coefs, used_features,
+            self._solve_weighted_ridge(data, y_samples, weights, 1.0), axis=1)
+        return coefs
+
+    def _get_lime_feature_importance(self, x_pred, x_cube=None):
         """Get most important feature given by LIME."""
         logger.info(
             "Calculating local feature importance using LIME (this may take "
             "a while...)")
-        x_pred = self._impute_nans(x_pred)
-
-        # Most important feature for single input
-        def _most_important_feature(x_single_pred, explainer, predict_fn):
-            """Get most important feature for single input.
-
-            Note
-            ----
-            Ignore warnings about missing feature names here because they are
-            not used.
-
-            """
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    'ignore',
-                    message=('X does not have valid feature names, but '
-                             'SimpleImputer was fitted with feature names'),
-                    category=UserWarning,
-                    module='sklearn',
-                )
-                explanation = explainer.explain_instance(x_single_pred,
-                                                         predict_fn)
-            local_exp = explanation.local_exp[1]
-            sorted_exp = sorted(local_exp, key=lambda elem: elem[0])
-            norm = sum(abs(elem[1]) for elem in sorted_exp)
-            return [abs(elem[1]) / norm for elem in sorted_exp]
-
-        # Apply on whole input (using multiple processes)
-        parallel = Parallel(n_jobs=self._cfg['n_jobs'])
-        lime_feature_importance = parallel(
-            [
-                delayed(_most_important_feature)(
-                    x,
-                    explainer=self._lime_explainer,
-                    predict_fn=self._clf.predict,
-                ) for x in x_pred.values
-            ]
-        )
-        lime_feature_importance = np.array(lime_feature_importance,
-                                           dtype=self._cfg['dtype'])
-        lime_feature_importance = np.moveaxis(lime_feature_importance, -1, 0)
+        coefs = np.abs(self._get_lime_coefficients(x_pred, x_cube))
+        lime_feature_importance = coefs / coefs.sum(axis=1, keepdims=True)
+        lime_feature_importance = lime_feature_importance.astype(
+            self._cfg['dtype']).T
         lime_feature_importance = dict(zip(self.features,
                                            lime_feature_importance))
         return lime_feature_importance
 
+    def _get_lime_samples(self, x_single):
+        """Get LIME perturbation samples around a single point.
+
+        Note
+        ----
+        The random numbers are drawn in the same order as in
+        :meth:`lime.lime_tabular.LimeTabularExplainer.explain_instance`.
+
+        """
+        explainer = self._lime_explainer
+        random_state = explainer.random_state
+        n_samples = self._LIME_N_SAMPLES
+        data = random_state.normal(0, 1, n_samples * x_single.shape[0])
+        data = (data.reshape(n_samples, x_single.shape[0]) *
+                explainer.scaler.scale_ + x_single)
+        data[0] = x_single
+        inverse = data.copy()
+        for column in explainer.categorical_features:
+            inverse_column = random_state.choice(
+                explainer.feature_values[column], size=n_samples,
+                replace=True, p=explainer.feature_frequencies[column])
+            binary_column = (inverse_column == x_single[column]).astype(int)
+            binary_column[0] = 1
+            inverse_column[0] = data[0, column]
+            data[:, column] = binary_column
+            inverse[:, column] = inverse_column
+        inverse[0] = x_single
+        return (data, inverse)
+
+    def _get_lime_subsample(self, x_pred, x_cube=None):
+        """Get points for which LIME is evaluated and their nearest neighbors.
+
+        If ``lime_subsample`` is larger than 1, LIME is only evaluated on
+        every ``lime_subsample``-th grid point along the latitude and longitude
+        dimensions (all dimensions if these are not available) of
+        ``x_cube``. All other points are assigned the values of the nearest
+        evaluated point (in index space) of the same group.
+
+        """
+        n_points = len(x_pred.index)
+        stride = self._cfg['lime_subsample']
+        if stride <= 1 or x_cube is None or not x_cube.shape:
+            return (np.arange(n_points), np.arange(n_points))
+        dims = set()
+        for coord_name in ('latitude', 'longitude'):
+            if x_cube.coords(coord_name, dim_coords=True):
+                dims.update(x_cube.coord_dims(coord_name))
+        if not dims:
+            dims = set(range(x_cube.ndim))
+        grid_idx = np.stack(np.unravel_index(
+            x_pred.index.get_level_values(-1).values, x_cube.shape), axis=-1)
+        selected = np.all(grid_idx[:, sorted(dims)] % stride == 0, axis=1)
+        groups = pd.factorize(x_pred.index.get_level_values(0))[0]
+        for group in np.unique(groups):
+            if not selected[groups == group].any():
+                selected[np.argmax(groups == group)] = True
+        subsample_idx = np.cumsum(selected) - 1
+        nearest_idx = np.empty(n_points, dtype=int)
+        for group in np.unique(groups):
+            group_mask = groups == group
+            group_selected = group_mask & selected
+            tree = cKDTree(grid_idx[group_selected])
+            (_, tree_idx) = tree.query(grid_idx[group_mask])
+            nearest_idx[group_mask] = subsample_idx[group_selected][tree_idx]
+        logger.info(
+            "Evaluating LIME on %i of %i point(s) (lime_subsample = %i)",
+            selected.sum(), n_points, stride)
+        return (np.nonzero(selected)[0], nearest_idx)
+
     def _get_logo_cv_kwargs(self):
         """Get :class:`sklearn.model_selection.LeaveOneGroupOut` CV."""
         if not self._cfg['group_datasets_by_attributes']:
@@ -2470,11 +2818,17 @@ class MLRModel():
 
         return mask
 
-    def _get_multiindex(self, ref_cube, group_attr=None):
-        """Get :class:`pandas.MultiIndex` for data."""
-        group_attr = self._group_attr_to_pandas_index_str(group_attr)
-        index = pd.MultiIndex.from_product(
-            [[group_attr], np.arange(ref_cube.data.size)],
+    def _get_multiindex(self, group_attributes, n_points):
+        """Get :class:`pandas.MultiIndex` for data of several groups."""
+        group_attributes = np.array([
+            self._group_attr_to_pandas_index_str(group_attr)
+            for group_attr in group_attributes
+        ], dtype=object)
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(group_attributes, n_points),
+                np.concatenate([np.arange(n) for n in n_points]),
+            ],
             names=self._get_multiindex_names(),
         )
         return index
@@ -2497,7 +2851,7 @@ class MLRModel():
         return self._cfg['plot_units'].get(str(units), str(units))
 
     def _get_prediction_dict(self, pred_name, x_pred, x_err, y_ref,
-                             get_mlr_model_error=None,
+                             x_cube=None, get_mlr_model_error=None,
                              get_lime_importance=False,
                              get_propagated_errors=False, **kwargs):
         """Get prediction output in a dictionary."""
@@ -2513,7 +2867,8 @@ class MLRModel():
 
         # LIME feature importance
         if get_lime_importance:
-            lime_importance = self._get_lime_feature_importance(x_pred)
+            lime_importance = self._get_lime_feature_importance(
+                x_pred, x_cube)
             for (feature, importance) in lime_importance.items():
                 pred_dict[f'lime_importance___{feature}'] = importance
 
@@ -2525,7 +2880,7 @@ class MLRModel():
                     f"'prediction_input_error' data for prediction "
                     f"'{self._get_name(pred_name)}' is available")
             pred_dict['squared_propagated_input_error'] = (
-                self._propagate_input_errors(x_pred, x_err))
+                self._propagate_input_errors(x_pred, x_err, x_cube))
 
         # Calculate residuals relative to reference if possible
         if y_ref is not None:
@@ -2627,22 +2982,18 @@ class MLRModel():
                              param, str(function), parameters[param])
         return parameters
 
-    def _get_x_data_for_group(self, datasets, var_type, group_attr=None):
-        """Get x data for a group of datasets."""
+    def _get_x_data_for_group(self, datasets, var_type, ref_cube, x_array,
+                              group_attr=None):
+        """Write x data for a group of datasets into ``x_array``."""
         msg = '' if group_attr is None else f" for '{group_attr}'"
-        ref_cube = self._get_reference_cube(datasets, var_type, msg)
-        group_data = pd.DataFrame(
-            columns=self.features,
-            index=self._get_multiindex(ref_cube, group_attr=group_attr),
-            dtype=self._cfg['dtype'],
-        )
         sample_weights = self._calculate_sample_weights(ref_cube,
                                                         var_type,
                                                         group_attr=group_attr)
 
         # Iterate over all features
-        for tag in self.features:
-            if self.features_types[tag] != 'coordinate':
+        features_types = self.features_types
+        for (idx, tag) in enumerate(self.features):
+            if features_types[tag] != 'coordinate':
                 dataset = self._check_dataset(datasets, var_type, tag, msg)
 
                 # No dataset found
@@ -2682,15 +3033,11 @@ class MLRModel():
                                                      msg)
 
             # Save data
-            new_data = np.array(new_data)
-            if new_data.size != ref_cube.data.size:
-                new_data = np.broadcast_to(new_data, (ref_cube.data.size,))
-            group_data[tag] = new_data
+            x_array[:, idx] = new_data
 
-        # Return data and reference cube
         logger.debug("Found %i raw '%s' input data points%s",
-                     len(group_data.index), var_type, msg)
-        return (group_data, ref_cube, sample_weights)
+                     x_array.shape[0], var_type, msg)
+        return sample_weights
 
     def _group_by_attributes(self, datasets):
         """Group datasets by specified attributes."""
@@ -2748,33 +3095,48 @@ class MLRModel():
         self._classes['label'] = self._get_label()
 
     def _load_cube(self, dataset):
-        """Load iris cube, check data type and convert units if desired."""
-        logger.debug("Loading %s", dataset['filename'])
-        cube = iris.load_cube(dataset['filename'])
+        """Load iris cube, check data type and convert units if desired.
 
-        # Check dtype
-        if not np.issubdtype(cube.dtype, np.number):
-            raise TypeError(
-                f"Data type of cube loaded from '{dataset['filename']}' is "
-                f"'{cube.dtype}', at the moment only numeric data is "
-                f"supported")
-
-        # Convert dtypes
-        cube.data = cube.core_data().astype(self._cfg['dtype'],
-                                            casting='same_kind')
-        for coord in cube.coords():
-            try:
-                coord.points = coord.points.astype(self._cfg['dtype'],
-                                                   casting='same_kind')
-            except TypeError:
-                logger.debug(
-                    "Cannot convert dtype of coordinate array '%s' from '%s' "
-                    "to '%s'", coord.name(), coord.points.dtype,
-                    self._cfg['dtype'])
+        Loaded cubes are cached, see options ``cube_cache_size`` and
+        ``cube_cache_dir``.
 
-        # Convert and check units
-        if dataset.get('convert_units_to'):
-            self._convert_units_in_cube(cube, dataset['convert_units_to'])
+        """
+        key = self._cube_cache.get_key(dataset['filename'],
+                                       self._cfg['dtype'],
+                                       dataset.get('convert_units_to'))
+        cube = self._cube_cache.get(key)
+        if cube is None:
+            logger.debug("Loading %s", dataset['filename'])
+            cube = iris.load_cube(dataset['filename'])
+
+            # Check dtype
+            if not np.issubdtype(cube.dtype, np.number):
+                raise TypeError(
+                    f"Data type of cube loaded from '{dataset['filename']}' "
+                    f"is '{cube.dtype}', at the moment only numeric data is "
+                    f"supported")
+
+            # Convert dtypes
+            cube.data = self._cube_cache.load_data(cube, dataset['filename'],
+                                                   self._cfg['dtype'])
+            for coord in cube.coords():
+                try:
+                    coord.points = coord.points.astype(self._cfg['dtype'],
+                                                       casting='same_kind')
+                except TypeError:
+                    logger.debug(
+                        "Cannot convert dtype of coordinate array '%s' from "
+                        "'%s' to '%s'", coord.name(), coord.points.dtype,
+                        self._cfg['dtype'])
+
+            # Convert units
+            if dataset.get('convert_units_to'):
+                self._convert_units_in_cube(cube, dataset['convert_units_to'])
+            self._cube_cache.put(key, cube)
+        else:
+            logger.debug("Using cached cube for %s", dataset['filename'])
+
+        # Check units
         if not cube.units == Unit(dataset['units']):
             raise ValueError(
                 f"Units of cube '{dataset['filename']}' for "
@@ -2828,6 +3190,22 @@ class MLRModel():
             logger.info("Using all %i input data point(s) for training",
                         len(y_all.index))
 
+    def _load_fitted_model(self, path):
+        """Load fitted pipeline from store of fitted models."""
+        memory = self._clf.get_params(deep=False).get('memory')
+        self._clf = joblib.load(path)
+        if 'memory' in self._clf.get_params(deep=False):
+            self._clf.set_params(memory=memory)
+        self._parameters = self._get_clf_parameters()
+        logger.info(
+            "Loaded fitted MLR model from %s (skipped fitting on %i training "
+            "point(s))", path, len(self.data['train'].index))
+        logger.debug("Pipeline steps:")
+        logger.debug(pformat(list(self._clf.named_steps.keys())))
+
+        # LIME
+        self._load_lime_explainer()
+
     def _load_final_parameters(self):
         """Load parameters for final regressor."""
         parameters = self._cfg.get('parameters_final_regressor', {})
@@ -3115,7 +3493,7 @@ class MLRModel():
                 metric = f'root_{metric}'
             logger.info("Weighted %s: %s", metric, value)
 
-    def _propagate_input_errors(self, x_pred, x_err):
+    def _propagate_input_errors(self, x_pred, x_err, x_cube=None):
         """Propagate errors from prediction input."""
         logger.info(
             "Propagating prediction input errors using LIME (this may take a "
@@ -3125,48 +3503,12 @@ class MLRModel():
                 "Propagating input errors might not work correctly when a "
                 "'feature_selection' step is present (usually because of "
                 "calling rfecv())")
-        x_pred = self._impute_nans(x_pred)
-
-        # Propagated error for single input
-        def _propagated_error(x_single_pred, x_single_err, explainer,
-                              predict_fn, features, categorical_features):
-            """Get propagated prediction input error for single input.
-
-            Note
-            ----
-            Ignore warnings about missing feature names here because they are
-            not used.
-
-            """
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    'ignore',
-                    message=('X does not have valid feature names, but '
-                             'SimpleImputer was fitted with feature names'),
-                    category=UserWarning,
-                    module='sklearn',
-                )
-                exp = explainer.explain_instance(x_single_pred, predict_fn)
-            x_single_err = np.nan_to_num(x_single_err)
-            x_err_scaled = x_single_err / explainer.scaler.scale_
-            squared_error = 0.0
-            for (idx, coef) in exp.local_exp[1]:
-                if features[idx] in categorical_features:
-                    continue
-                squared_error += (x_err_scaled[idx] * coef)**2
-            return squared_error
-
-        # Apply on whole input (using multiple processes)
-        parallel = Parallel(n_jobs=self._cfg['n_jobs'])
-        errors = parallel(
-            [delayed(_propagated_error)(
-                x, x_e, explainer=self._lime_explainer,
-                predict_fn=self._clf.predict,
-                features=self.features,
-                categorical_features=self.categorical_features,
-            ) for (x, x_e) in zip(x_pred.values, x_err.values)]
-        )
-        return np.array(errors, dtype=self._cfg['dtype'])
+        coefs = self._get_lime_coefficients(x_pred, x_cube)
+        x_err_scaled = (np.nan_to_num(x_err.values) /
+                        self._lime_explainer.scaler.scale_)
+        numerical = ~np.isin(self.features, self.categorical_features)
+        errors = np.sum((x_err_scaled * coefs)[:, numerical]**2, axis=1)
+        return errors.astype(self._cfg['dtype'])
 
     def _remove_missing_features(self, x_data, y_data, sample_weights):
         """Remove missing values in the features data (if desired)."""
@@ -3202,6 +3544,14 @@ class MLRModel():
                 "missing", diff)
         return (x_pred, x_err, y_ref, mask)
 
+    def _save_fitted_model(self, path):
+        """Save fitted pipeline in store of fitted models."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}'
+        joblib.dump(self._clf, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info("Saved fitted MLR model in %s", path)
+
     def _save_prediction_cubes(self, pred_dict, pred_name, x_cube):
         """Save (multi-dimensional) prediction output."""
         logger.debug("Creating output cubes")
@@ -3268,10 +3618,13 @@ class MLRModel():
         """Set default (non-``False``) keyword arguments."""
         self._cfg.setdefault('weighted_samples', {})
         self._cfg.setdefault('cache_intermediate_results', True)
+        self._cfg.setdefault('cube_cache_size', 1024)
         self._cfg.setdefault('dtype', 'float64')
         self._cfg.setdefault('fit_kwargs', {})
         self._cfg.setdefault('group_datasets_by_attributes', [])
         self._cfg.setdefault('imputation_strategy', 'remove')
+        self._cfg.setdefault('lime_batch_size', 50)
+        self._cfg.setdefault('lime_subsample', 1)
         self._cfg.setdefault('log_level', 'info')
         self._cfg.setdefault('mlr_model_name', f'{self._CLF_TYPE} model')
         self._cfg.setdefault('n_jobs', 1)
@@ -3574,3 +3927,23 @@ class MLRModel():
             raise ValueError(f"Expected 'x' or 'y' for axis, got '{axis}'")
         maximum = np.max(np.abs(getter()))
         setter([-maximum, maximum])
+
+    @staticmethod
+    def _solve_weighted_ridge(x_data, y_data, weights, alpha):
+        """Fit multiple weighted ridge regressions with intercept at once.
+
+        Gives the same coefficients as :class:`sklearn.linear_model.Ridge`
+        (with ``fit_intercept=True``) for every index of the first dimension
+        of ``x_data`` (shape ``(n_fits, n_samples, n_features)``), ``y_data``
+        and ``weights`` (shape ``(n_fits, n_samples)``).
+
+        """
+        norm_weights = weights / weights.sum(axis=1, keepdims=True)
+        x_data = x_data - np.einsum('ij,ijk->ik', norm_weights,
+                                    x_data)[:, np.newaxis]
+        y_data = y_data - np.einsum('ij,ij->i', norm_weights,
+                                    y_data)[:, np.newaxis]
+        x_weighted = np.swapaxes(x_data * weights[..., np.newaxis], 1, 2)
+        lhs = x_weighted @ x_data + alpha * np.identity(x_data.shape[2])
+        rhs = x_weighted @ y_data[..., np.newaxis]
+        return np.linalg.solve(lhs, rhs)[..., 0]
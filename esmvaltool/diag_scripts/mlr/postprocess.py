@@ -73,6 +73,12 @@ cov_estimate_dim_map: list of int, optional
     information.
 ignore: list of dict, optional
     Ignore specific datasets by specifying multiple :obj:`dict` s of metadata.
+land_mask_cache_dir: str, optional
+    Directory in which the rasterized Natural Earth land mask used for
+    ``landsea_fraction_weighted`` is cached on disk. Set this to a directory
+    that is shared between recipe runs (e.g., in your home directory) to
+    avoid rasterizing the mask again in every run. By default, the mask is
+    only cached in memory, i.e., it is rasterized once per diagnostic run.
 landsea_fraction_weighted: str, optional
     When given, calculate weighted averages/sums when collapsing over latitude
     and/or longitude coordinates using land/sea fraction (calculated using
@@ -95,6 +101,7 @@ import warnings
 from copy import deepcopy
 from pprint import pformat
 
+import dask.array as da
 import iris
 import numpy as np
 from cf_units import Unit
@@ -193,10 +200,13 @@ def _collapse_covariance_cube(cfg, cov_cube, ref_cube):
             f"only {len(coords):d} ({coords})")
     weights = weights.ravel()
     weights = weights[~np.ma.getmaskarray(ref_cube.data).ravel()]
-    weights = np.outer(weights, weights)
+
+    # Calculate w^T C w chunk by chunk without forming outer(w, w)
+    cov_data = da.ma.filled(cov_cube.lazy_data(), 0.0)
+    collapsed_data = da.dot(da.dot(weights, cov_data), weights)
     cov_cube = cov_cube.collapsed(cov_cube.coords(dim_coords=True),
-                                  iris.analysis.SUM,
-                                  weights=weights)
+                                  iris.analysis.SUM)
+    cov_cube.data = collapsed_data.compute()
     cov_cube.units *= units**2
     return cov_cube
 
@@ -209,24 +219,6 @@ def _collapse_regular_cube(cfg, cube, power=1):
     return cube
 
 
-def _corrcoef(array, rowvar=True, weights=None):
-    """Fast version of :func:`numpy.ma.corrcoef`."""
-    if not rowvar:
-        array = array.T
-        if weights is not None:
-            weights = weights.T
-    mean = np.ma.average(array, axis=1, weights=weights).reshape(-1, 1)
-    if weights is None:
-        sqrt_weights = 1.0
-    else:
-        sqrt_weights = np.ma.sqrt(weights)
-    demean = (array - mean) * sqrt_weights
-    res = np.ma.dot(demean, demean.T)
-    row_norms = np.ma.sqrt(np.ma.sum(demean**2, axis=1))
-    res /= np.ma.outer(row_norms, row_norms)
-    return res
-
-
 def _estim_cov_differing_shape(cfg, squared_error_cube, cov_est_cube, weights):
     """Collapse estimated covariance.
 
@@ -243,13 +235,12 @@ def _estim_cov_differing_shape(cfg, squared_error_cube, cov_est_cube, weights):
     # Load data
     error = np.ma.sqrt(squared_error_cube.data)
     error = np.ma.filled(error, 0.0)
-    cov_est = np.ma.filled(cov_est_cube.data, np.nan)
+    cov_est = _get_lazy_data(cov_est_cube)
 
     # Reshape if necessary
     if 'cov_estimate_dim_map' in cfg:
         dim_map = tuple(cfg['cov_estimate_dim_map'])
         cov_est = _reshape_covariance(cov_est, error, dim_map)
-    cov_est = np.ma.masked_invalid(cov_est)
     if not _identical_trailing_dimensions(cov_est, error):
         raise ValueError(
             f"Expected identical trailing (rightmost) dimensions of "
@@ -257,17 +248,13 @@ def _estim_cov_differing_shape(cfg, squared_error_cube, cov_est_cube, weights):
             f"and 'prediction_output_error' datasets, got {cov_est.shape} and "
             f"{error.shape}")
 
-    # Estimate covariance
-    error = error.ravel()
-    cov_est = cov_est.reshape(-1, *error.shape)
-    pearson_coeffs = _corrcoef(cov_est, rowvar=False)
-    covariance = pearson_coeffs * np.ma.outer(error, error)
-
-    # Collapse covariance
-    weights = weights.ravel()
-    weights = np.outer(weights, weights)
-    error = np.ma.sqrt(np.ma.sum(covariance * weights))
-    return error
+    # Collapse estimated covariance: with the Pearson coefficients R = Z^T Z
+    # given by the normalized anomalies Z, the error is ||Z (error * w)||
+    weighted_error = (error * weights).ravel()
+    cov_est = cov_est.reshape(-1, weighted_error.shape[0])
+    anomalies = _get_normalized_anomalies(cov_est, axis=0)
+    projection = da.dot(anomalies, weighted_error)
+    return np.sqrt(da.sum(projection**2).compute())
 
 
 def _estim_cov_identical_shape(squared_error_cube, cov_est_cube, weights):
@@ -284,31 +271,41 @@ def _estim_cov_identical_shape(squared_error_cube, cov_est_cube, weights):
         "('prediction_output_error')")
     error = np.ma.sqrt(squared_error_cube.data)
     error = np.ma.filled(error, 0.0)
-    cov_est = np.ma.array(cov_est_cube.data)
+    cov_est = _get_lazy_data(cov_est_cube)
     if cov_est.ndim > 2:
         error = error.reshape(error.shape[0], -1)
         cov_est = cov_est.reshape(cov_est.shape[0], -1)
         weights = weights.reshape(weights.shape[0], -1)
 
-    # Pearson coefficients (= normalized covariance) over both dimensions
-    pearson_dim0 = _corrcoef(cov_est, weights=weights)
-    pearson_dim1 = _corrcoef(cov_est, rowvar=False, weights=weights)
-
-    # Covariances
-    cov_dim0 = (np.einsum('...i,...j->...ij', error, error) *
-                np.einsum('...i,...j->...ij', weights, weights) * pearson_dim1)
-    cov_dim1 = (np.einsum('i...,j...->...ij', error, error) *
-                np.einsum('i...,j...->...ij', weights, weights) * pearson_dim0)
+    # The result is symmetric in both dimensions, make sure that the first
+    # one is the smaller one so that only small Gram matrices are formed
+    if cov_est.shape[0] > cov_est.shape[1]:
+        error = error.T
+        cov_est = cov_est.T
+        weights = weights.T
+    weighted_error = error * weights
+
+    # Pearson coefficients (= normalized covariance) over both dimensions are
+    # given by R_0 = Z_0 Z_0^T and R_1 = Z_1^T Z_1
+    anomalies_dim0 = _get_normalized_anomalies(cov_est, axis=1,
+                                               weights=weights)
+    anomalies_dim1 = _get_normalized_anomalies(cov_est, axis=0,
+                                               weights=weights)
+    pearson_dim0 = da.dot(anomalies_dim0, anomalies_dim0.T)
 
     # Errors over dimensions
-    error_dim0 = np.ma.sqrt(np.ma.sum(cov_dim0, axis=(1, 2)))
-    error_dim1 = np.ma.sqrt(np.ma.sum(cov_dim1, axis=(1, 2)))
+    error_dim0 = da.sqrt(
+        da.sum(da.dot(weighted_error, anomalies_dim1.T)**2, axis=1))
+    error_dim1 = da.sqrt(
+        da.maximum(
+            da.sum(weighted_error * da.dot(pearson_dim0, weighted_error),
+                   axis=0), 0.0))
 
     # Collapse further (all weights are already included in first step)
-    cov_order_0 = pearson_dim0 * np.ma.outer(error_dim0, error_dim0)
-    cov_order_1 = pearson_dim1 * np.ma.outer(error_dim1, error_dim1)
-    error_order_0 = np.ma.sqrt(np.ma.sum(cov_order_0))
-    error_order_1 = np.ma.sqrt(np.ma.sum(cov_order_1))
+    error_order_0 = da.sqrt(
+        da.maximum(da.dot(error_dim0, da.dot(pearson_dim0, error_dim0)), 0.0))
+    error_order_1 = da.sqrt(da.sum(da.dot(anomalies_dim1, error_dim1)**2))
+    (error_order_0, error_order_1) = da.compute(error_order_0, error_order_1)
     logger.debug(
         "Found real errors %e and %e after collapsing with different "
         "orderings, using maximum", error_order_0, error_order_1)
@@ -483,6 +480,7 @@ def _get_horizontal_weights(cfg, cube, power=1):
         cube,
         area_weighted=cfg['area_weighted'],
         landsea_fraction_weighted=cfg.get('landsea_fraction_weighted'),
+        land_mask_cache_dir=cfg.get('land_mask_cache_dir'),
     )
     weights = weights**power
     if cfg['area_weighted']:
@@ -502,6 +500,11 @@ def _get_horizontal_coordinates(coords):
     return horizontal_coords
 
 
+def _get_lazy_data(cube):
+    """Get lazy data of cube as float array with missing values set to NaN."""
+    return da.ma.filled(cube.lazy_data().astype(np.float64), np.nan)
+
+
 def _get_normalization_factor(weights, coords, cube, normalize=False):
     """Get normalization constant for calculation of means."""
     if not normalize:
@@ -524,6 +527,34 @@ def _get_normalization_factor(weights, coords, cube, normalize=False):
     return norm[0]
 
 
+def _get_normalized_anomalies(array, axis, weights=None):
+    """Get normalized (weighted) anomalies of an array along an axis.
+
+    The anomalies ``z`` are a low-rank factor of the matrix of Pearson
+    correlation coefficients of the variables in ``array``, i.e.
+    ``z.T @ z`` (``axis=0``) or ``z @ z.T`` (``axis=1``) is identical to
+    the output of :func:`numpy.ma.corrcoef`. This allows to calculate
+    quadratic forms of the correlation matrix without forming it.
+
+    Missing values (NaN) are ignored. The anomalies of constant variables or
+    variables without valid values are set to 0.
+
+    """
+    valid = ~da.isnan(array)
+    if weights is None:
+        weights = valid.astype(np.float64)
+    else:
+        weights = da.where(valid, weights, 0.0)
+    sum_of_weights = da.sum(weights, axis=axis, keepdims=True)
+    sum_of_weights = da.where(sum_of_weights > 0.0, sum_of_weights, 1.0)
+    mean = da.sum(weights * da.where(valid, array, 0.0),
+                  axis=axis,
+                  keepdims=True) / sum_of_weights
+    anomalies = da.where(valid, (array - mean) * da.sqrt(weights), 0.0)
+    norm = da.sqrt(da.sum(anomalies**2, axis=axis, keepdims=True))
+    return anomalies / da.where(norm > 0.0, norm, 1.0)
+
+
 def _get_time_weights(cfg, cube, power=1):
     """Calculate time weights."""
     time_weights = None
@@ -647,7 +678,7 @@ def _reshape_covariance(cov_est, error, dim_map):
         "of 'prediction_output_error' %s as last dimensions using mapping "
         "%s", cov_est.shape, error.shape, dim_map)
 
-    # Get target shape
+    # Get new order of dimensions
     indices = list(range(cov_est.ndim))
     for dim in dim_map:
         if dim not in indices:
@@ -657,14 +688,9 @@ def _reshape_covariance(cov_est, error, dim_map):
                 f"used for covariance estimation")
         indices.remove(dim)
         indices.append(dim)
-    new_shape = tuple(np.array(cov_est.shape)[indices])
-
-    # Broadcast to new shape
-    dim_map_for_broadcasting = []
-    for idx in range(cov_est.ndim):
-        dim_map_for_broadcasting.append(indices.index(idx))
-    cov_est = iris.util.broadcast_to_shape(cov_est, new_shape,
-                                           dim_map_for_broadcasting)
+
+    # Transpose to new shape
+    cov_est = cov_est.transpose(indices)
     logger.info(
         "Reshaped 'prediction_input' for covariance estimation to %s",
         cov_est.shape)
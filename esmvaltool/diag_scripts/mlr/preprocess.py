@@ -35,6 +35,14 @@ argsort: dict, optional
     Calculate :func:`numpy.ma.argsort` along given coordinate to get ranking.
     The coordinate can be specified by the ``coord`` key. If ``descending`` is
     set to ``True``, use descending order instead of ascending.
+cache_dir: str, optional
+    If given, save the intermediate results of all preprocessing steps that
+    are applied to single datasets (all steps except ``ref_calculation``,
+    ``convert_units_to``, ``normalize_by_mean`` and ``normalize_by_std``) in
+    this directory. The results are identified by a hash of the input file's
+    content, the dataset's metadata and the options of all steps up to the
+    respective step. In subsequent runs, only the steps after the last cached
+    result are re-run (e.g., if only options of late steps changed).
 collapse: dict, optional
     Collapse over given coordinates (dict values; given as :obj:`list` of
     :obj:`str`) using a desired aggregator (dict key; given as :obj:`str`).
@@ -56,6 +64,12 @@ extract_range: dict, optional
     for certain coordinates (dict keys, given as :obj:`str`).
 ignore: list of dict, optional
     Ignore specific datasets by specifying multiple :obj:`dict` s of metadata.
+land_mask_cache_dir: str, optional
+    Directory in which the rasterized Natural Earth land mask used for
+    ``landsea_fraction_weighted`` is cached on disk. Set this to a directory
+    that is shared between recipe runs (e.g., in your home directory) to
+    avoid rasterizing the mask again in every run. By default, the mask is
+    only cached in memory, i.e., it is rasterized once per diagnostic run.
 landsea_fraction_weighted: str, optional
     When given, use land/sea fraction for weighted aggregation when collapsing
     over latitude and/or longitude using ``collapse``. Only possible if the
@@ -66,8 +80,9 @@ mask: dict of dict
     `<https://docs.scipy.org/doc/numpy/reference/routines.ma.html>`_) and
     values all the keyword arguments of them.
 n_jobs: int (default: 1)
-    Maximum number of jobs spawned by this diagnostic script. Use ``-1`` to use
-    all processors. More details are given `here
+    Maximum number of jobs spawned by this diagnostic script (e.g., to
+    preprocess independent datasets in parallel). Use ``-1`` to use all
+    processors. More details are given `here
     <https://scikit-learn.org/stable/glossary.html#term-n-jobs>`_.
 normalize_by_mean: bool, optional (default: False)
     Remove total mean of the dataset in the last step (resulting mean will be
@@ -118,6 +133,8 @@ unify_coords_to: dict, optional
 
 import datetime
 import functools
+import hashlib
+import json
 import logging
 import os
 import warnings
@@ -125,18 +142,20 @@ from copy import deepcopy
 
 import dask.array as da
 import iris
+import joblib
 import numpy as np
 from cf_units import Unit
 from joblib import Parallel, delayed
-from scipy import stats
 
 from esmvaltool.diag_scripts import mlr
 from esmvaltool.diag_scripts.shared import (
+    MetadataIndex,
     ProvenanceLogger,
     get_diagnostic_filename,
     io,
     run_diagnostic,
     select_metadata,
+    vectorized_linregress,
 )
 
 logger = logging.getLogger(os.path.basename(__file__))
@@ -150,6 +169,20 @@ AGGREGATORS = {
     'sum': iris.analysis.SUM,
     'var': iris.analysis.VARIANCE,
 }
+DATASET_STEPS = [
+    'unify_coords_to',
+    'mask',
+    'scalar_operations',
+    'extract_range',
+    'extract',
+    'aggregate_by_trend',
+    'collapse_with_trend',
+]
+DATASET_STEPS_AFTER_STDERR = [
+    'aggregate_by',
+    'collapse',
+    'argsort',
+]
 
 
 def _add_categorized_time_coords(cube, coords, aggregator):
@@ -169,6 +202,74 @@ def _add_categorized_time_coords(cube, coords, aggregator):
                 f"cannot be added via iris.coord_categorisation")
 
 
+def _apply_step(cfg, step, cube, data, ref_cube=None):
+    """Apply single preprocessing step to a dataset."""
+    if step == 'unify_coords_to':
+        return (unify_coords_to(cube, ref_cube), data)
+    if step == 'mask':
+        return (mask(cfg, cube), data)
+    if step == 'scalar_operations':
+        return (scalar_operations(cfg, cube), data)
+    if step == 'extract_range':
+        return (extract_range(cfg, cube), data)
+    if step == 'extract':
+        return (extract(cfg, cube), data)
+    if step == 'aggregate_by_trend':
+        return aggregate_by_trend(cfg, cube, data)
+    if step == 'collapse_with_trend':
+        return collapse_with_trend(cfg, cube, data)
+    if step == 'aggregate_by':
+        return aggregate_by(cfg, cube, data)
+    if step == 'collapse':
+        return collapse(cfg, cube, data)
+    if step == 'argsort':
+        return argsort(cfg, cube, data)
+    raise ValueError(f"Got invalid preprocessing step '{step}'")
+
+
+def _apply_steps(cfg, steps, data, key=None, ref_cube=None):
+    """Apply preprocessing steps to a dataset (use cached results if given).
+
+    The cache key of every active step is calculated from the key of the
+    previous active step and the options of the step. The results of
+    inactive steps (steps without any options) are not cached.
+
+    """
+    cube = data['cube']
+    start_data = data
+    step_keys = []
+    for step in steps:
+        step_cfg = _get_step_cfg(cfg, step, ref_cube)
+        if key is None or step_cfg is None:
+            step_keys.append(None)
+            continue
+        key = _get_hash(key, step, step_cfg)
+        step_keys.append(key)
+
+    # Load last cached result
+    first_step = 0
+    for (idx, step_key) in reversed(list(enumerate(step_keys))):
+        if step_key is None:
+            continue
+        path = _get_cache_path(cfg, step_key)
+        if not os.path.isfile(path):
+            continue
+        (cube, data) = joblib.load(path)
+        data = _restore_paths(cfg, data, start_data)
+        first_step = idx + 1
+        logger.info(
+            "Loaded cached result of preprocessing step '%s' for %s from %s",
+            steps[idx], start_data['original_filename'], path)
+        break
+
+    # Apply remaining steps
+    for (step, step_key) in zip(steps[first_step:], step_keys[first_step:]):
+        (cube, data) = _apply_step(cfg, step, cube, data, ref_cube=ref_cube)
+        if step_key is not None:
+            _save_cached_result(cfg, step_key, cube, data)
+    return (cube, data, key)
+
+
 def _apply_trend_aggregator(cfg, cube, data, coord_name):
     """Apply aggregator ``trend`` to cube."""
     return_stderr = _return_stderr(cfg, data)
@@ -219,20 +320,12 @@ def _calculate_slope_along_coord(cube, coord_name, return_stderr=True):
             f"1D coordinate, got {len(coord_dims):d}D coordinate")
 
     # Get slope and error if desired
-    x_data = coord.points
-    y_data = np.moveaxis(cube.data, coord_dims[0], -1)
-    calc_slope = np.vectorize(_get_slope, excluded=['x_arr'],
-                              signature='(n),(n)->()')
-    slope = calc_slope(x_data, y_data)
-    if return_stderr:
-        calc_slope_stderr = np.vectorize(_get_slope_stderr, excluded=['x_arr'],
-                                         signature='(n),(n)->()')
-        slope_stderr = calc_slope_stderr(x_data, y_data)
-    else:
-        slope_stderr = None
+    (slope, slope_stderr) = _get_slope_and_stderr(
+        coord.points, cube.core_data(), axis=coord_dims[0])
 
     # Apply dummy aggregator for correct cell method and set data
-    aggregator = iris.analysis.Aggregator('trend', _remove_axis)
+    aggregator = iris.analysis.Aggregator('trend', _remove_axis,
+                                          lazy_func=_remove_axis)
     with warnings.catch_warnings():
         warnings.filterwarnings(
             'ignore',
@@ -241,10 +334,9 @@ def _calculate_slope_along_coord(cube, coord_name, return_stderr=True):
             module='iris',
         )
         cube = cube.collapsed(coord_name, aggregator)
-    cube.data = np.ma.masked_invalid(slope)
-    if slope_stderr is not None:
-        cube_stderr = cube.copy()
-        cube_stderr.data = np.ma.masked_invalid(slope_stderr)
+    cube.data = slope
+    if return_stderr:
+        cube_stderr = cube.copy(slope_stderr)
     else:
         cube_stderr = None
     return (cube, cube_stderr)
@@ -327,10 +419,16 @@ def _get_all_weights(cfg, cube):
     weights = mlr.get_all_weights(
         cube, area_weighted=cfg['area_weighted'],
         time_weighted=cfg['time_weighted'],
-        landsea_fraction_weighted=cfg.get('landsea_fraction_weighted'))
+        landsea_fraction_weighted=cfg.get('landsea_fraction_weighted'),
+        land_mask_cache_dir=cfg.get('land_mask_cache_dir'))
     return weights
 
 
+def _get_cache_path(cfg, key):
+    """Get path of cached result of preprocessing step."""
+    return os.path.join(cfg['cache_dir'], f'{key}.joblib')
+
+
 def _get_constrained_cube(cube, constraints):
     """Merge multiple :class:`iris.Constraint` s and apply them to cube."""
     constraint = constraints[0]
@@ -359,6 +457,22 @@ def _get_error_datasets(input_data, **kwargs):
     return error_data
 
 
+def _get_file_hash(path):
+    """Get hash of the content of a file."""
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as file_:
+        for chunk in iter(lambda: file_.read(2**20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _get_hash(*args):
+    """Get hash of JSON representation of arbitrary arguments."""
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps(args, sort_keys=True, default=repr).encode())
+    return hasher.hexdigest()
+
+
 def _get_horizontal_coordinates(coords):
     """Extract horizontal coordinates from :obj:`list` of coordinates."""
     horizontal_coords = []
@@ -374,10 +488,36 @@ def _get_horizontal_weights(cfg, cube):
     weights = mlr.get_horizontal_weights(
         cube,
         area_weighted=cfg['area_weighted'],
-        landsea_fraction_weighted=cfg.get('landsea_fraction_weighted'))
+        landsea_fraction_weighted=cfg.get('landsea_fraction_weighted'),
+        land_mask_cache_dir=cfg.get('land_mask_cache_dir'))
     return weights
 
 
+def _get_initial_cache_keys(cfg, input_data):
+    """Get initial keys for cached results of preprocessing steps."""
+    if not cfg.get('cache_dir'):
+        return [None] * len(input_data)
+    logger.info("Using cached results of preprocessing steps from %s",
+                cfg['cache_dir'])
+    file_hashes = [_get_file_hash(d['filename']) for d in input_data]
+
+    # Some operations depend on other datasets
+    dependencies = [iris.__version__]
+    if cfg.get('apply_common_mask'):
+        dependencies.append(sorted(file_hashes))
+    if 'unify_coords_to' in cfg:
+        ref_data = select_metadata(input_data, **cfg['unify_coords_to'])
+        dependencies.append(_get_file_hash(ref_data[0]['filename']))
+
+    # Paths may change between runs (only the content is relevant)
+    keys = []
+    for (data, file_hash) in zip(input_data, file_hashes):
+        metadata = {k: v for (k, v) in data.items() if
+                    k not in ('cube', 'filename', 'original_filename')}
+        keys.append(_get_hash(file_hash, metadata, dependencies))
+    return keys
+
+
 def _get_ref_calc(cfg, dataset, ref_datasets, ref_option):
     """Perform calculations involving reference datasets for regular data."""
     ref_kwargs = cfg.get('ref_kwargs', {})
@@ -526,26 +666,46 @@ def _get_single_constraint(cube, coord_name, val,
     return iris.Constraint(**{coord_name: coord_vals})
 
 
-def _get_slope(x_arr, y_arr):
-    """Get slope of linear regression of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.slope
-
-
-def _get_slope_stderr(x_arr, y_arr):
-    """Get standard error of linear slope of two (masked) arrays."""
-    if np.ma.is_masked(y_arr):
-        x_arr = x_arr[~y_arr.mask]
-        y_arr = y_arr[~y_arr.mask]
-    if len(y_arr) < 2:
-        return np.nan
-    reg = stats.linregress(x_arr, y_arr)
-    return reg.stderr
+def _get_slope_and_stderr(x_data, y_data, axis=-1):
+    """Get slopes and standard errors of linear regressions along an axis.
+
+    See :func:`esmvaltool.diag_scripts.shared.vectorized_linregress` for
+    details.
+
+    """
+    reg = vectorized_linregress(x_data, y_data, axis=axis)
+    return (reg.slope, reg.stderr)
+
+
+def _get_step_cfg(cfg, step, ref_cube):
+    """Get options relevant for preprocessing step (``None`` if inactive)."""
+    if step == 'unify_coords_to':
+        if ref_cube is None:
+            return None
+        return cfg['unify_coords_to']
+    if step in ('extract_range', 'extract'):
+        if not cfg.get(step):
+            return None
+        return [cfg[step], cfg['extract_ignore_bounds']]
+    if step in ('aggregate_by_trend', 'collapse_with_trend'):
+        option = 'aggregate_by' if step == 'aggregate_by_trend' else 'collapse'
+        if 'trend' not in cfg.get(option, {}):
+            return None
+        return [
+            cfg[option]['trend'],
+            cfg['return_trend_stderr'],
+            cfg.get('output_attributes'),
+        ]
+    if not cfg.get(step):
+        return None
+    if step in ('aggregate_by', 'collapse'):
+        return [
+            cfg[step],
+            cfg.get('area_weighted'),
+            cfg.get('time_weighted'),
+            cfg.get('landsea_fraction_weighted'),
+        ]
+    return cfg[step]
 
 
 def _get_time_weights(cfg, cube):
@@ -578,19 +738,12 @@ def _get_trend_relative_to_ref(cfg, data, ref_cube, collapse_over=None):
             f"{coord_dims} and {ref_cube.coord_dims(collapse_over)}")
 
     # Get slope and error if desired
-    x_data = np.moveaxis(ref_cube.data, coord_dims[0], -1)
-    y_data = np.moveaxis(cube.data, coord_dims[0], -1)
-    calc_slope = np.vectorize(_get_slope, signature='(n),(n)->()')
-    slope = calc_slope(x_data, y_data)
-    if return_stderr:
-        calc_slope_stderr = np.vectorize(_get_slope_stderr,
-                                         signature='(n),(n)->()')
-        slope_stderr = calc_slope_stderr(x_data, y_data)
-    else:
-        slope_stderr = None
+    (slope, slope_stderr) = _get_slope_and_stderr(
+        ref_cube.core_data(), cube.core_data(), axis=coord_dims[0])
 
     # Apply dummy aggregator for correct cell method and set data
-    aggregator = iris.analysis.Aggregator('trend using ref', _remove_axis)
+    aggregator = iris.analysis.Aggregator('trend using ref', _remove_axis,
+                                          lazy_func=_remove_axis)
     with warnings.catch_warnings():
         warnings.filterwarnings(
             'ignore',
@@ -599,10 +752,9 @@ def _get_trend_relative_to_ref(cfg, data, ref_cube, collapse_over=None):
             module='iris',
         )
         cube = cube.collapsed(collapse_over, aggregator)
-    cube.data = np.ma.masked_invalid(slope)
-    if slope_stderr is not None:
-        cube_stderr = cube.copy()
-        cube_stderr.data = np.ma.masked_invalid(slope_stderr)
+    cube.data = slope
+    if return_stderr:
+        cube_stderr = cube.copy(slope_stderr)
     else:
         cube_stderr = None
     return (cube, cube_stderr)
@@ -613,12 +765,49 @@ def _remove_axis(data, axis=None):
     return np.take(data, 0, axis=axis)
 
 
+def _restore_paths(cfg, data, start_data):
+    """Restore paths of dataset loaded from cache (might be from old run)."""
+    for key in ('filename', 'original_filename'):
+        data[key] = start_data[key]
+    if isinstance(data.get('stderr'), dict):
+        data['stderr']['filename'] = os.path.join(
+            cfg['work_dir'], os.path.basename(data['stderr']['filename']))
+        data['stderr']['original_filename'] = start_data['original_filename']
+    return data
+
+
 def _return_stderr(cfg, data):
     """Check if standard error should be returned."""
     return (data.get('var_type') == 'prediction_input' and
             cfg['return_trend_stderr'])
 
 
+def _preprocess_dataset(cfg, data, key=None, ref_cube=None):
+    """Apply all preprocessing steps that only involve a single dataset."""
+    (cube, data, key) = _apply_steps(cfg, DATASET_STEPS, data, key=key,
+                                     ref_cube=ref_cube)
+    data = cache_cube(cfg, cube, data)
+
+    # Operations after adding standard errors (without trends)
+    cfg = deepcopy(cfg)
+    cfg.get('collapse', {}).pop('trend', None)
+    cfg.get('aggregate_by', {}).pop('trend', None)
+    all_data = []
+    for new_data in add_standard_errors([data]):
+        new_key = None
+        if key is not None:
+            new_key = _get_hash(key, new_data.get('stderr', False))
+        (cube, new_data, _) = _apply_steps(cfg, DATASET_STEPS_AFTER_STDERR,
+                                           new_data, key=new_key)
+
+        # Units of pickled cubes (cached results and results of worker
+        # processes) are restored from their string representation; do this
+        # for all cubes so that the units do not depend on their origin
+        cube.units = Unit(str(cube.units), calendar=cube.units.calendar)
+        all_data.append(cache_cube(cfg, cube, new_data))
+    return all_data
+
+
 def _promote_aux_coord(cube, data, coord_name):
     """Promote auxiliary coordinate to dimensional coordinate."""
     aux_coords = [coord.name() for coord in cube.coords(dim_coords=False)]
@@ -636,6 +825,20 @@ def _promote_aux_coord(cube, data, coord_name):
                                                          coord_name)
 
 
+def _save_cached_result(cfg, key, cube, data):
+    """Save result of preprocessing step in cache."""
+    path = _get_cache_path(cfg, key)
+    os.makedirs(cfg['cache_dir'], exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}'
+    data = {k: v for (k, v) in data.items() if k != 'cube'}
+    cube.data  # pylint: disable=pointless-statement
+    if isinstance(data.get('stderr'), dict):
+        data['stderr']['cube'].data  # pylint: disable=pointless-statement
+    joblib.dump((cube, data), tmp_path)
+    os.replace(tmp_path, path)
+    logger.debug("Saved cached result of preprocessing step in %s", path)
+
+
 def _set_trend_metadata(cfg, cube, cube_stderr, data, units):
     """Set correct metadata for trend calculation."""
     cube.units /= units
@@ -987,7 +1190,7 @@ def ref_calculation(cfg, input_data):
                 ref_option)
     logger.info("Retrieving reference dataset attributes %s to match datasets",
                 metadata)
-    ref_datasets = select_metadata(input_data, ref=True)
+    ref_datasets = MetadataIndex(select_metadata(input_data, ref=True))
     regular_datasets_errors = _get_error_datasets(input_data, ref=False)
     regular_datasets = []
     for dataset in select_metadata(input_data, ref=False):
@@ -1003,9 +1206,10 @@ def ref_calculation(cfg, input_data):
     logger.info(
         "Performing calculations involving reference datasets for %i error "
         "dataset(s)", len(regular_datasets_errors))
+    regular_datasets = MetadataIndex(new_data)
     for dataset in regular_datasets_errors:
-        dataset = _get_ref_calc_stderr(cfg, dataset, ref_datasets, new_data,
-                                       ref_option)
+        dataset = _get_ref_calc_stderr(cfg, dataset, ref_datasets,
+                                       regular_datasets, ref_option)
         new_data.append(dataset)
     return new_data
 
@@ -1120,38 +1324,29 @@ def main(cfg):
     else:
         ref_cube = None
 
-    # Load cubes and apply common mask
-    input_data = load_cubes(input_data)
-    input_data = apply_common_mask(cfg, input_data)
-
-    # Operations that add additional datasets (standard errors)
+    # Get keys for cached results of preprocessing steps
     for data in input_data:
         data.setdefault('ref', False)
         if data['ref'] == 'True':
             data['ref'] = True
         if data['ref'] == 'False':
             data['ref'] = False
-        cube = data['cube']
-        cube = unify_coords_to(cube, ref_cube)
-        cube = mask(cfg, cube)
-        cube = scalar_operations(cfg, cube)
-        cube = extract_range(cfg, cube)
-        cube = extract(cfg, cube)
-        (cube, data) = aggregate_by_trend(cfg, cube, data)
-        (cube, data) = collapse_with_trend(cfg, cube, data)
-        data = cache_cube(cfg, cube, data)
-    input_data = add_standard_errors(input_data)
+    keys = _get_initial_cache_keys(cfg, input_data)
+
+    # Load cubes and apply common mask
+    input_data = load_cubes(input_data)
+    input_data = apply_common_mask(cfg, input_data)
+
+    # Operations on single datasets (in parallel)
+    parallel = Parallel(n_jobs=cfg['n_jobs'])
+    all_data = parallel(
+        [delayed(_preprocess_dataset)(cfg, data, key=key, ref_cube=ref_cube)
+         for (data, key) in zip(input_data, keys)]
+    )
+    input_data = [data for datasets in all_data for data in datasets]
     cfg.get('collapse', {}).pop('trend', None)
     cfg.get('aggregate_by', {}).pop('trend', None)
 
-    # Remaining operations
-    for data in input_data:
-        cube = data['cube']
-        (cube, data) = aggregate_by(cfg, cube, data)
-        (cube, data) = collapse(cfg, cube, data)
-        (cube, data) = argsort(cfg, cube, data)
-        data = cache_cube(cfg, cube, data)
-
     # Calculations involving reference datasets
     input_data = ref_calculation(cfg, input_data)
     input_data = add_standard_errors(input_data)
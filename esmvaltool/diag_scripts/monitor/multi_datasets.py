@@ -49,6 +49,13 @@ facet_used_for_labels: str, optional (default: 'dataset')
 figure_kwargs: dict, optional
     Optional keyword arguments for :func:`matplotlib.pyplot.figure`. By
     default, uses ``constrained_layout: true``.
+max_cubes_in_memory: int, optional (default: 10)
+    Maximum number of input datasets that are kept in memory at the same time.
+    Input data is only loaded when it is needed for a plot; if this limit is
+    exceeded, the least recently used dataset is removed from memory (and
+    reloaded if it is needed again). Reference datasets are always kept in
+    memory and do not count towards this limit. Use ``null`` to keep all
+    datasets in memory.
 plots: dict, optional
     Plot types plotted by this diagnostic (see list above). Dictionary keys
     must be ``timeseries``, ``annual_cycle``, ``map``, or ``profile``.
@@ -300,6 +307,7 @@ x_pos_stats_bias: float, optional (default: 0.7)
 
 """
 import logging
+from collections import OrderedDict
 from copy import deepcopy
 from pathlib import Path
 from pprint import pformat
@@ -320,6 +328,7 @@ from sklearn.metrics import r2_score
 import esmvaltool.diag_scripts.shared.iris_helpers as ih
 from esmvaltool.diag_scripts.monitor.monitor_base import MonitorBase
 from esmvaltool.diag_scripts.shared import (
+    MetadataIndex,
     ProvenanceLogger,
     get_diagnostic_filename,
     group_metadata,
@@ -341,6 +350,7 @@ class MultiDatasets(MonitorBase):
         self.cfg = deepcopy(self.cfg)
         self.cfg.setdefault('facet_used_for_labels', 'dataset')
         self.cfg.setdefault('figure_kwargs', {'constrained_layout': True})
+        self.cfg.setdefault('max_cubes_in_memory', 10)
         self.cfg.setdefault('savefig_kwargs', {
             'bbox_inches': 'tight',
             'dpi': 300,
@@ -350,8 +360,15 @@ class MultiDatasets(MonitorBase):
         logger.info("Using facet '%s' to create labels",
                     self.cfg['facet_used_for_labels'])
 
-        # Load input data
-        self.input_data = self._load_and_preprocess_data()
+        # Input data (cubes are only loaded when necessary)
+        max_cubes = self.cfg['max_cubes_in_memory']
+        if max_cubes is not None and max_cubes < 1:
+            raise ValueError(
+                f"Expected positive integer or None for option "
+                f"'max_cubes_in_memory', got {max_cubes}")
+        self._cubes = OrderedDict()
+        self._ref_cubes = {}
+        self.input_data = MetadataIndex(self.cfg['input_data'].values())
         self.grouped_input_data = group_metadata(
             self.input_data,
             'short_name',
@@ -443,12 +460,12 @@ class MultiDatasets(MonitorBase):
             return
 
         # Extract cube(s)
-        cube = dataset['cube']
+        cube = self._get_cube(dataset)
         if ref_dataset is None:
             ref_cube = None
             label = self._get_label(dataset)
         else:
-            ref_cube = ref_dataset['cube']
+            ref_cube = self._get_cube(ref_dataset)
             label = (f'{self._get_label(dataset)} vs. '
                      f'{self._get_label(ref_dataset)}')
 
@@ -534,6 +551,31 @@ class MultiDatasets(MonitorBase):
             r2_val,
         )
 
+    def _get_cube(self, dataset):
+        """Get preprocessed cube of a dataset (load it if necessary).
+
+        Reference datasets are kept in memory for the entire run. For all
+        other datasets, at most ``max_cubes_in_memory`` cubes are kept in
+        memory; if this is exceeded, the least recently used one is removed.
+
+        """
+        filename = dataset['filename']
+        if dataset.get('reference_for_monitor_diags', False):
+            if filename not in self._ref_cubes:
+                self._ref_cubes[filename] = self._load_and_preprocess_cube(
+                    dataset)
+            return self._ref_cubes[filename]
+        if filename in self._cubes:
+            self._cubes.move_to_end(filename)
+            return self._cubes[filename]
+        cube = self._load_and_preprocess_cube(dataset)
+        self._cubes[filename] = cube
+        max_cubes = self.cfg['max_cubes_in_memory']
+        if max_cubes is not None and len(self._cubes) > max_cubes:
+            (old_filename, _) = self._cubes.popitem(last=False)
+            logger.debug("Removed %s from memory", old_filename)
+        return cube
+
     def _get_custom_mpl_rc_params(self, plot_type):
         """Get custom matplotlib rcParams."""
         fontsize = self.plots[plot_type]['fontsize']
@@ -648,38 +690,6 @@ class MultiDatasets(MonitorBase):
 
         return deepcopy(plot_kwargs)
 
-    def _load_and_preprocess_data(self):
-        """Load and preprocess data."""
-        input_data = list(self.cfg['input_data'].values())
-
-        for dataset in input_data:
-            filename = dataset['filename']
-            logger.info("Loading %s", filename)
-            cube = iris.load_cube(filename)
-
-            # Fix time coordinate if present
-            if cube.coords('time', dim_coords=True):
-                ih.unify_time_coord(cube)
-
-            # Fix Z-coordinate if present
-            if cube.coords('air_pressure', dim_coords=True):
-                z_coord = cube.coord('air_pressure', dim_coords=True)
-                z_coord.attributes['positive'] = 'down'
-                z_coord.convert_units('hPa')
-            elif cube.coords('altitude', dim_coords=True):
-                z_coord = cube.coord('altitude')
-                z_coord.attributes['positive'] = 'up'
-
-            # Convert pr units if necessary
-            if cube.var_name == 'pr' and cube.units == 'kg m-2 s-1':
-                cube.units = 'mm s-1'
-                cube.convert_units('mm day-1')
-                dataset['units'] = 'mm day-1'
-
-            dataset['cube'] = cube
-
-        return input_data
-
     def _plot_map_with_ref(self, plot_func, dataset, ref_dataset):
         """Plot map plot for single dataset with a reference dataset."""
         plot_type = 'map'
@@ -687,8 +697,8 @@ class MultiDatasets(MonitorBase):
                     self._get_label(ref_dataset), self._get_label(dataset))
 
         # Make sure that the data has the correct dimensions
-        cube = dataset['cube']
-        ref_cube = ref_dataset['cube']
+        cube = self._get_cube(dataset)
+        ref_cube = self._get_cube(ref_dataset)
         dim_coords_dat = self._check_cube_dimensions(cube, plot_type)
         dim_coords_ref = self._check_cube_dimensions(ref_cube, plot_type)
 
@@ -790,7 +800,7 @@ class MultiDatasets(MonitorBase):
                     self._get_label(dataset))
 
         # Make sure that the data has the correct dimensions
-        cube = dataset['cube']
+        cube = self._get_cube(dataset)
         dim_coords_dat = self._check_cube_dimensions(cube, plot_type)
 
         # Create plot with desired settings
@@ -839,8 +849,8 @@ class MultiDatasets(MonitorBase):
                     self._get_label(ref_dataset), self._get_label(dataset))
 
         # Make sure that the data has the correct dimensions
-        cube = dataset['cube']
-        ref_cube = ref_dataset['cube']
+        cube = self._get_cube(dataset)
+        ref_cube = self._get_cube(ref_dataset)
         dim_coords_dat = self._check_cube_dimensions(cube, plot_type)
         dim_coords_ref = self._check_cube_dimensions(ref_cube, plot_type)
 
@@ -944,7 +954,7 @@ class MultiDatasets(MonitorBase):
                     self._get_label(dataset))
 
         # Make sure that the data has the correct dimensions
-        cube = dataset['cube']
+        cube = self._get_cube(dataset)
         dim_coords_dat = self._check_cube_dimensions(cube, plot_type)
 
         # Create plot with desired settings
@@ -1067,6 +1077,34 @@ class MultiDatasets(MonitorBase):
             return ref_datasets[0]
         return None
 
+    @staticmethod
+    def _load_and_preprocess_cube(dataset):
+        """Load and preprocess cube of a dataset."""
+        filename = dataset['filename']
+        logger.info("Loading %s", filename)
+        cube = iris.load_cube(filename)
+
+        # Fix time coordinate if present
+        if cube.coords('time', dim_coords=True):
+            ih.unify_time_coord(cube)
+
+        # Fix Z-coordinate if present
+        if cube.coords('air_pressure', dim_coords=True):
+            z_coord = cube.coord('air_pressure', dim_coords=True)
+            z_coord.attributes['positive'] = 'down'
+            z_coord.convert_units('hPa')
+        elif cube.coords('altitude', dim_coords=True):
+            z_coord = cube.coord('altitude')
+            z_coord.attributes['positive'] = 'up'
+
+        # Convert pr units if necessary
+        if cube.var_name == 'pr' and cube.units == 'kg m-2 s-1':
+            cube.units = 'mm s-1'
+            cube.convert_units('mm day-1')
+            dataset['units'] = 'mm day-1'
+
+        return cube
+
     def create_timeseries_plot(self, datasets, short_name):
         """Create time series plot."""
         plot_type = 'timeseries'
@@ -1085,7 +1123,7 @@ class MultiDatasets(MonitorBase):
         cubes = {}
         for dataset in datasets:
             ancestors.append(dataset['filename'])
-            cube = dataset['cube']
+            cube = self._get_cube(dataset)
             cubes[self._get_label(dataset)] = cube
             self._check_cube_dimensions(cube, plot_type)
 
@@ -1165,7 +1203,7 @@ class MultiDatasets(MonitorBase):
         cubes = {}
         for dataset in datasets:
             ancestors.append(dataset['filename'])
-            cube = dataset['cube']
+            cube = self._get_cube(dataset)
             cubes[self._get_label(dataset)] = cube
             self._check_cube_dimensions(cube, plot_type)
 
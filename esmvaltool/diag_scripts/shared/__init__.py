@@ -1,12 +1,14 @@
 """Code that is shared between multiple diagnostic scripts."""
 from . import io, iris_helpers, names, plot
 from ._base import (
+    MetadataIndex,
     ProvenanceLogger,
     extract_variables,
     get_cfg,
     get_diagnostic_filename,
     get_plot_filename,
     group_metadata,
+    init_diagnostic_worker,
     run_diagnostic,
     save_data,
     save_figure,
@@ -16,11 +18,13 @@ from ._base import (
     variables_available,
 )
 from ._diag import Datasets, Variable, Variables
+from ._regression import LinregressResult, vectorized_linregress
 from ._validation import apply_supermeans, get_control_exper_obs
 
 __all__ = [
     # Main entry point for diagnostics
     'run_diagnostic',
+    'init_diagnostic_worker',
     # Define and write output files
     'save_figure',
     'save_data',
@@ -29,6 +33,7 @@ __all__ = [
     # Log provenance
     'ProvenanceLogger',
     # Select and sort input metadata
+    'MetadataIndex',
     'select_metadata',
     'sorted_metadata',
     'group_metadata',
@@ -46,6 +51,9 @@ __all__ = [
     'iris_helpers',
     # Plotting module
     'plot',
+    # Regressions
+    'LinregressResult',
+    'vectorized_linregress',
     # Validation module
     'get_control_exper_obs',
     'apply_supermeans',
@@ -7,6 +7,7 @@ import os
 import shutil
 import sys
 import time
+from collections.abc import Sequence
 from pathlib import Path
 
 import iris
@@ -135,9 +136,89 @@ def save_data(basename, provenance, cfg, cube, **kwargs):
         provenance_logger.log(filename, provenance)
 
 
+class _ProvenanceStore:
+    """Append-only store of provenance records for a single run directory.
+
+    Records are appended to a journal file next to the provenance file as
+    separate YAML documents, so logging a record never requires reading or
+    rewriting the records logged before. The journal is merged into the
+    provenance file expected by ESMValCore by :meth:`flush`.
+
+    Parameters
+    ----------
+    log_file: str
+        Path to the provenance file.
+    """
+
+    _active = {}
+
+    def __init__(self, log_file):
+        """Create a provenance store."""
+        self.log_file = log_file
+        self.journal_file = f'{log_file}.journal'
+        self.table = self.read()
+
+    @classmethod
+    def start(cls, log_file):
+        """Start buffering provenance records for `log_file`."""
+        cls._active[log_file] = cls(log_file)
+
+    @classmethod
+    def stop(cls, log_file):
+        """Stop buffering and merge the journal into `log_file`."""
+        store = cls._active.pop(log_file, None)
+        if store is not None:
+            store.flush()
+
+    @classmethod
+    def get_active(cls, log_file):
+        """Get the buffering store for `log_file` (if any)."""
+        return cls._active.get(log_file)
+
+    def read(self):
+        """Read all records from the provenance file and the journal."""
+        table = {}
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as file:
+                table.update(yaml.safe_load(file) or {})
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r') as file:
+                for records in yaml.safe_load_all(file):
+                    table.update(records or {})
+        return table
+
+    def append(self, records):
+        """Append records to the journal."""
+        if not records:
+            return
+        self.table.update(records)
+        dirname = os.path.dirname(self.journal_file)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        # A single write per batch keeps appends from different processes
+        # (e.g. when using multiprocessing) from interleaving
+        with open(self.journal_file, 'a') as file:
+            file.write(yaml.safe_dump(records, explicit_start=True))
+
+    def flush(self):
+        """Merge the journal into the provenance file."""
+        if not os.path.exists(self.journal_file):
+            return
+        # Re-read from disk to include records appended by other processes
+        self.table = self.read()
+        with open(self.log_file, 'w') as file:
+            yaml.safe_dump(self.table, file)
+        os.remove(self.journal_file)
+
+
 class ProvenanceLogger:
     """Open the provenance logger.
 
+    When used inside :func:`run_diagnostic`, records are appended to a
+    journal when leaving the context and the provenance file is only written
+    once at the end of the diagnostic run. Otherwise, the provenance file is
+    updated every time the context is left.
+
     Parameters
     ----------
     cfg: dict
@@ -173,12 +254,11 @@ class ProvenanceLogger:
         """Create a provenance logger."""
         self._log_file = os.path.join(cfg['run_dir'],
                                       'diagnostic_provenance.yml')
-
-        if not os.path.exists(self._log_file):
-            self.table = {}
-        else:
-            with open(self._log_file, 'r') as file:
-                self.table = yaml.safe_load(file)
+        self._store = _ProvenanceStore.get_active(self._log_file)
+        if self._store is None:
+            self._store = _ProvenanceStore(self._log_file)
+        self.table = self._store.table
+        self._new_records = {}
 
     def log(self, filename, record):
         """Record provenance.
@@ -212,14 +292,14 @@ class ProvenanceLogger:
                 "Provenance record for {} already exists.".format(filename))
 
         self.table[filename] = record
+        self._new_records[filename] = record
 
     def _save(self):
         """Save the provenance log to file."""
-        dirname = os.path.dirname(self._log_file)
-        if not os.path.exists(dirname):
-            os.makedirs(dirname)
-        with open(self._log_file, 'w') as file:
-            yaml.safe_dump(self.table, file)
+        self._store.append(self._new_records)
+        self._new_records = {}
+        if _ProvenanceStore.get_active(self._log_file) is None:
+            self._store.flush()
 
     def __enter__(self):
         """Enter context."""
@@ -230,6 +310,164 @@ class ProvenanceLogger:
         self._save()
 
 
+def _configure_logging(log_level):
+    """Configure logging of a diagnostic script."""
+    logging.basicConfig(format="%(asctime)s [%(process)d] %(levelname)-8s "
+                        "%(name)s,%(lineno)s\t%(message)s")
+    logging.Formatter.converter = time.gmtime
+    logging.captureWarnings(True)
+    logging.getLogger().setLevel(log_level.upper())
+
+
+def init_diagnostic_worker(cfg):
+    """Initialize a worker process of a diagnostic.
+
+    Use as ``initializer`` of a :class:`multiprocessing.pool.Pool` or
+    :class:`concurrent.futures.ProcessPoolExecutor` started inside
+    :func:`run_diagnostic` (e.g., with the ``spawn`` start method). Logging
+    of the worker process is set up like in :func:`run_diagnostic`, and the
+    :class:`ProvenanceLogger` instances of the worker process append their
+    records to the journal of the main process, which is merged into the
+    provenance file at the end of the diagnostic run, instead of rewriting
+    the provenance file every time.
+
+    Parameters
+    ----------
+    cfg: dict
+        Dictionary with diagnostic configuration.
+    """
+    _configure_logging(cfg.get('log_level', 'info'))
+    log_file = os.path.join(cfg['run_dir'], 'diagnostic_provenance.yml')
+    if _ProvenanceStore.get_active(log_file) is None:
+        _ProvenanceStore.start(log_file)
+
+
+class MetadataIndex(Sequence):
+    """Index of metadata describing preprocessed data.
+
+    Hash indexes on the attributes are built the first time an attribute is
+    queried, so repeated calls to :func:`select_metadata`,
+    :func:`group_metadata` and :func:`sorted_metadata` on the same metadata
+    take time proportional to the size of the result instead of the number
+    of datasets. These functions delegate to the index when called with a
+    :class:`MetadataIndex`.
+
+    The metadata should not be modified after creating the index.
+
+    Parameters
+    ----------
+    metadata : :obj:`list` of :obj:`dict`
+        A list of metadata describing preprocessed data, e.g.
+        ``cfg['input_data'].values()``.
+
+    Example
+    -------
+    Create the index once and use it for all queries::
+
+        input_data = MetadataIndex(cfg['input_data'].values())
+        for dataset in group_metadata(input_data, 'dataset'):
+            tas = select_metadata(input_data, dataset=dataset,
+                                  short_name='tas')
+    """
+    def __init__(self, metadata):
+        self._metadata = list(metadata)
+        self._indexes = {}
+        self._sorted = {}
+
+    def __getitem__(self, index):
+        return self._metadata[index]
+
+    def __len__(self):
+        return len(self._metadata)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._metadata!r})"
+
+    def _get_index(self, attribute):
+        """Get positions of the metadata by value of `attribute`.
+
+        Returns a :obj:`dict` of the positions by (hashable) value, the
+        positions of unhashable values and the positions of all metadata
+        having the attribute.
+        """
+        if attribute not in self._indexes:
+            by_value = {}
+            unhashable = []
+            present = []
+            for (idx, attributes) in enumerate(self._metadata):
+                if attribute not in attributes:
+                    continue
+                present.append(idx)
+                try:
+                    by_value.setdefault(attributes[attribute], []).append(idx)
+                except TypeError:
+                    unhashable.append(idx)
+            self._indexes[attribute] = (by_value, unhashable, present)
+        return self._indexes[attribute]
+
+    def _find(self, attribute, value):
+        """Get positions of the metadata where `attribute` equals `value`."""
+        (by_value, unhashable, present) = self._get_index(attribute)
+        if value == '*':
+            return present
+        try:
+            positions = list(by_value.get(value, []))
+        except TypeError:
+            # Unhashable values can only be compared one by one
+            (positions, candidates) = ([], present)
+        else:
+            if not unhashable:
+                return positions
+            candidates = unhashable
+        positions.extend(idx for idx in candidates
+                         if self._metadata[idx][attribute] == value)
+        return sorted(positions)
+
+    def select(self, **attributes):
+        """Select metadata, see :func:`select_metadata`."""
+        if not attributes:
+            return list(self._metadata)
+        matches = sorted(
+            (self._find(a, v) for (a, v) in attributes.items()), key=len)
+        positions = set(matches[0])
+        for other in matches[1:]:
+            if not positions:
+                break
+            positions.intersection_update(other)
+        return [self._metadata[idx] for idx in sorted(positions)]
+
+    def group(self, attribute, sort=None):
+        """Group metadata, see :func:`group_metadata`."""
+        (by_value, unhashable, present) = self._get_index(attribute)
+        if unhashable:
+            return _group_metadata(self._metadata, attribute, sort)
+        groups = {}
+        missing = sorted(set(range(len(self._metadata))) - set(present))
+        if missing:
+            groups[None] = missing
+        for (value, positions) in by_value.items():
+            if value is None and missing:
+                groups[None] = sorted(missing + positions)
+            else:
+                groups[value] = positions
+        groups = {
+            key: [self._metadata[idx] for idx in groups[key]]
+            for key in sorted(groups, key=lambda k: groups[k][0])
+        }
+        if sort:
+            groups = sorted_group_metadata(groups, sort)
+        return groups
+
+    def sorted(self, sort):
+        """Sort metadata, see :func:`sorted_metadata`."""
+        if isinstance(sort, str):
+            sort = [sort]
+        key = tuple(sort)
+        if key not in self._sorted:
+            self._sorted[key] = _sorted_metadata(self._metadata, sort)
+        return list(self._sorted[key])
+
+
 def select_metadata(metadata, **attributes):
     """Select specific metadata describing preprocessed data.
 
@@ -247,6 +485,8 @@ def select_metadata(metadata, **attributes):
     :obj:`list` of :obj:`dict`
         A list of matching metadata.
     """
+    if isinstance(metadata, MetadataIndex):
+        return metadata.select(**attributes)
     selection = []
     for attribs in metadata:
         if all(a in attribs and (
@@ -273,6 +513,13 @@ def group_metadata(metadata, attribute, sort=None):
     :obj:`dict` of :obj:`list` of :obj:`dict`
         A dictionary containing the requested groups.
     """
+    if isinstance(metadata, MetadataIndex):
+        return metadata.group(attribute, sort)
+    return _group_metadata(metadata, attribute, sort)
+
+
+def _group_metadata(metadata, attribute, sort):
+    """Group metadata by attribute using a linear scan."""
     groups = {}
     for attributes in metadata:
         key = attributes.get(attribute)
@@ -303,8 +550,15 @@ def sorted_metadata(metadata, sort):
     :obj:`list` of :obj:`dict`
         The sorted list of variable metadata.
     """
+    if isinstance(metadata, MetadataIndex):
+        return metadata.sorted(sort)
     if isinstance(sort, str):
         sort = [sort]
+    return _sorted_metadata(metadata, sort)
+
+
+def _sorted_metadata(metadata, sort):
+    """Sort metadata by a list of attributes."""
 
     def normalized_variable_key(attributes):
         """Define a key to sort the list of attributes by."""
@@ -499,11 +753,7 @@ def run_diagnostic():
     if args.log_level:
         cfg['log_level'] = args.log_level
 
-    logging.basicConfig(format="%(asctime)s [%(process)d] %(levelname)-8s "
-                        "%(name)s,%(lineno)s\t%(message)s")
-    logging.Formatter.converter = time.gmtime
-    logging.captureWarnings(True)
-    logging.getLogger().setLevel(cfg['log_level'].upper())
+    _configure_logging(cfg['log_level'])
 
     # Read input metadata
     cfg['input_data'] = _get_input_data_files(cfg)
@@ -514,6 +764,7 @@ def run_diagnostic():
     # Clean run_dir and output directories from previous runs
     default_files = {
         'diagnostic_provenance.yml',
+        'diagnostic_provenance.yml.journal',
         'log.txt',
         'profile.bin',
         'resource_usage.txt',
@@ -551,10 +802,16 @@ def run_diagnostic():
             os.makedirs(output_directory)
 
     provenance_file = os.path.join(cfg['run_dir'], 'diagnostic_provenance.yml')
-    if os.path.exists(provenance_file):
-        logger.info("Removing %s from previous run.", provenance_file)
-        os.remove(provenance_file)
-
-    yield cfg
+    for filename in (provenance_file, f'{provenance_file}.journal'):
+        if os.path.exists(filename):
+            logger.info("Removing %s from previous run.", filename)
+            os.remove(filename)
+
+    # Buffer provenance records and write them to file once at the end
+    _ProvenanceStore.start(provenance_file)
+    try:
+        yield cfg
+    finally:
+        _ProvenanceStore.stop(provenance_file)
 
     logger.info("End of diagnostic script run.")
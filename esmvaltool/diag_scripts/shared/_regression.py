@@ -0,0 +1,107 @@
+"""Vectorized linear regressions."""
+from collections import namedtuple
+
+import dask.array as da
+import numpy as np
+from scipy import special
+
+LinregressResult = namedtuple(
+    'LinregressResult',
+    ['slope', 'intercept', 'rvalue', 'stderr', 'pvalue', 'see'])
+
+
+def vectorized_linregress(x_data, y_data, axis=-1):
+    """Calculate many linear regressions along an axis at once.
+
+    Closed-form ordinary least squares fit of ``y = slope * x + intercept``
+    for every series along ``axis`` (e.g., for every grid point along the
+    time axis). Results are identical to a loop over
+    :func:`scipy.stats.linregress`, but much faster. Masked points (of either
+    ``x_data`` or ``y_data``) are ignored per series. Series with less than
+    two valid points or with constant ``x`` values are masked in the output.
+    :class:`dask.array.Array` input is processed lazily.
+
+    Parameters
+    ----------
+    x_data : numpy.ndarray or dask.array.Array
+        Independent variable. Either 1D with the same length as ``axis`` of
+        ``y_data`` or broadcastable to ``y_data``.
+    y_data : numpy.ndarray or dask.array.Array
+        Dependent variable.
+    axis : int, optional (default: -1)
+        Axis along which the linear regressions are calculated.
+
+    Returns
+    -------
+    LinregressResult
+        Named tuple with the elements ``slope``, ``intercept``, ``rvalue``
+        (correlation coefficient), ``stderr`` (standard error of the slope),
+        ``pvalue`` (two-sided `p`-value of a t-test with the null hypothesis
+        that the slope is zero) and ``see`` (standard error of the estimate,
+        i.e., the standard deviation of the residuals using ``n - 2`` degrees
+        of freedom). Each element is a :class:`numpy.ma.MaskedArray` (or
+        :class:`dask.array.Array` for lazy input) with ``axis`` removed.
+
+    """
+    array_module = np
+    if isinstance(x_data, da.Array) or isinstance(y_data, da.Array):
+        array_module = da
+    axis = axis % np.ndim(y_data)
+    if np.ndim(x_data) == 1 and np.ndim(y_data) > 1:
+        new_shape = [1] * np.ndim(y_data)
+        new_shape[axis] = -1
+        x_data = x_data.reshape(new_shape)
+    mask = (array_module.ma.getmaskarray(x_data) |
+            array_module.ma.getmaskarray(y_data))
+    x_data = array_module.where(
+        mask, 0.0, array_module.ma.getdata(x_data).astype(np.float64))
+    y_data = array_module.where(
+        mask, 0.0, array_module.ma.getdata(y_data).astype(np.float64))
+
+    # Centered sums of squares (safe denominators avoid warnings for invalid
+    # series, which are masked at the end)
+    n_points = (~mask).sum(axis=axis, keepdims=True)
+    safe_n_points = array_module.maximum(n_points, 1)
+    x_mean = x_data.sum(axis=axis, keepdims=True) / safe_n_points
+    y_mean = y_data.sum(axis=axis, keepdims=True) / safe_n_points
+    x_anom = array_module.where(mask, 0.0, x_data - x_mean)
+    y_anom = array_module.where(mask, 0.0, y_data - y_mean)
+    n_points = n_points.squeeze(axis=axis)
+    x_mean = x_mean.squeeze(axis=axis)
+    y_mean = y_mean.squeeze(axis=axis)
+    ss_xx = (x_anom**2).sum(axis=axis)
+    ss_xy = (x_anom * y_anom).sum(axis=axis)
+    ss_yy = (y_anom**2).sum(axis=axis)
+    invalid = (n_points < 2) | (ss_xx == 0.0)
+    ss_xx = array_module.where(invalid, 1.0, ss_xx)
+    slope = ss_xy / ss_xx
+    intercept = y_mean - slope * x_mean
+    ss_res = array_module.maximum(ss_yy - slope * ss_xy, 0.0)
+    dof = array_module.maximum(n_points - 2, 1)
+    see = array_module.sqrt(ss_res / dof)
+    stderr = see / array_module.sqrt(ss_xx)
+
+    # Same conventions as scipy.stats.linregress for constant y values and
+    # two points
+    rvalue = array_module.where(
+        ss_yy == 0.0, 0.0,
+        ss_xy / array_module.sqrt(ss_xx * array_module.where(
+            ss_yy == 0.0, 1.0, ss_yy)))
+    rvalue = array_module.clip(rvalue, -1.0, 1.0)
+    tiny = 1.0e-20
+    t_stat = rvalue * array_module.sqrt(
+        dof / ((1.0 - rvalue + tiny) * (1.0 + rvalue + tiny)))
+    pvalue = 2.0 * special.stdtr(dof, -array_module.abs(t_stat))
+    pvalue = array_module.where(n_points == 2,
+                                array_module.where(ss_yy == 0.0, 1.0, 0.0),
+                                pvalue)
+    stderr = array_module.where(n_points == 2, 0.0, stderr)
+    see = array_module.where(n_points == 2, 0.0, see)
+
+    # Mask invalid series
+    result = [
+        array_module.ma.masked_invalid(
+            array_module.where(invalid, np.nan, val))
+        for val in (slope, intercept, rvalue, stderr, pvalue, see)
+    ]
+    return LinregressResult(*result)
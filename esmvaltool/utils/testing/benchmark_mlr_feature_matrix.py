@@ -0,0 +1,144 @@
+"""Benchmark the assembly of the feature matrix of MLR models.
+
+Writes synthetic gridded feature and label datasets for a number of climate
+models and reports the time and peak memory needed by
+:class:`esmvaltool.diag_scripts.mlr.models.MLRModel` to assemble the
+training and prediction data from these files.
+
+Example
+-------
+python benchmark_mlr_feature_matrix.py --models 30 --resolution 1
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import iris
+import iris.coords
+import iris.cube
+import numpy as np
+
+from esmvaltool.diag_scripts.mlr.models import MLRModel
+
+
+def create_cube(resolution, seed):
+    """Create a global cube with random data and few missing values."""
+    lats = np.arange(-90 + resolution / 2, 90, resolution)
+    lons = np.arange(resolution / 2, 360, resolution)
+    lat = iris.coords.DimCoord(lats,
+                               standard_name='latitude',
+                               units='degrees')
+    lon = iris.coords.DimCoord(lons,
+                               standard_name='longitude',
+                               units='degrees')
+    data = np.random.default_rng(seed).normal(size=(len(lats), len(lons)))
+    data = np.ma.masked_greater(data, 3.0)
+    return iris.cube.Cube(data,
+                          var_name='var',
+                          units='1',
+                          dim_coords_and_dims=[(lat, 0), (lon, 1)])
+
+
+def create_datasets(directory, n_models, n_features, resolution):
+    """Write synthetic netCDF files and return their metadata."""
+    tags = [f'feature_{idx:d}' for idx in range(n_features)] + ['label']
+    datasets = []
+    seed = 0
+    for (var_type, n_datasets) in (('feature', n_models),
+                                   ('prediction_input', 1)):
+        for idx in range(n_datasets):
+            dataset_name = f'MODEL{idx:d}'
+            for tag in tags:
+                if tag == 'label':
+                    if var_type != 'feature':
+                        continue
+                    dataset_var_type = 'label'
+                else:
+                    dataset_var_type = var_type
+                filename = os.path.join(
+                    directory, f'{dataset_var_type}_{dataset_name}_{tag}.nc')
+                iris.save(create_cube(resolution, seed), filename)
+                seed += 1
+                datasets.append({
+                    'dataset': dataset_name,
+                    'filename': filename,
+                    'long_name': tag,
+                    'project': 'CMIP6',
+                    'short_name': tag,
+                    'standard_name': None,
+                    'tag': tag,
+                    'units': '1',
+                    'var_type': dataset_var_type,
+                })
+    return datasets
+
+
+def get_mlr_model(datasets, work_dir, **cfg):
+    """Get MLR model with loaded datasets but without any data."""
+    mlr_model = MLRModel.__new__(MLRModel)
+    mlr_model._cfg = {
+        'coords_as_features': ['latitude'],
+        'group_datasets_by_attributes': ['dataset'],
+        'plot_dir': work_dir,
+        'work_dir': work_dir,
+        **cfg,
+    }
+    mlr_model._data = {'pred': {}}
+    mlr_model._datasets = {}
+    mlr_model._classes = {}
+    mlr_model._set_default_settings()
+    mlr_model._load_input_datasets(datasets)
+    mlr_model._load_classes()
+    return mlr_model
+
+
+def benchmark(n_models, n_features, resolution, dtype):
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        datasets = create_datasets(work_dir, n_models, n_features, resolution)
+        mlr_model = get_mlr_model(datasets, work_dir, dtype=dtype)
+        tracemalloc.start()
+        start = time.perf_counter()
+        (x_data, y_data, _) = mlr_model._extract_features_and_labels()
+        train_time = time.perf_counter() - start
+        (_, train_memory) = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        mlr_model._extract_prediction_input(None)
+        pred_time = time.perf_counter() - start
+        (_, pred_memory) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"Training data: {x_data.shape[0]:d} points x "
+          f"{x_data.shape[1]:d} features ({x_data.values.nbytes / 2**20:.0f} "
+          f"MiB), label: {y_data.shape[0]:d} points")
+    print(f"{'data':<12}{'time [s]':>10}{'peak memory [MiB]':>20}")
+    print(f"{'training':<12}{train_time:>10.2f}{train_memory / 2**20:>20.0f}")
+    print(f"{'prediction':<12}{pred_time:>10.2f}{pred_memory / 2**20:>20.0f}")
+
+
+def main():
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--models',
+                        type=int,
+                        default=10,
+                        help='Number of climate models (groups).')
+    parser.add_argument('--features',
+                        type=int,
+                        default=5,
+                        help='Number of gridded features.')
+    parser.add_argument('--resolution',
+                        type=float,
+                        default=2.,
+                        help='Horizontal resolution in degrees.')
+    parser.add_argument('--dtype',
+                        default='float64',
+                        help='Data type of the feature matrix.')
+    args = parser.parse_args()
+    benchmark(args.models, args.features, args.resolution, args.dtype)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark the trend calculations of the MLR preprocessing.
+
+Creates a synthetic monthly cube with a few missing values and reports the
+time needed by
+:func:`esmvaltool.diag_scripts.mlr.preprocess.collapse_with_trend` and
+:func:`esmvaltool.diag_scripts.mlr.preprocess.aggregate_by_trend` (yearly
+trends) to calculate the trends and their standard errors for realized and
+lazy data. Optionally, the time needed by a loop over
+:func:`scipy.stats.linregress` for all grid points is reported as reference.
+
+Example
+-------
+python benchmark_mlr_trends.py --years 100 --resolution 1 --reference
+"""
+import argparse
+import os
+import time
+
+import dask.array as da
+import iris
+import iris.coords
+import iris.cube
+import numpy as np
+from cf_units import Unit
+from scipy import stats
+
+from esmvaltool.diag_scripts.mlr import preprocess
+
+
+def create_cube(years, resolution, lazy):
+    """Create a monthly cube with trends, noise and few missing values."""
+    n_times = 12 * years
+    lats = np.arange(-90 + resolution / 2, 90, resolution)
+    lons = np.arange(resolution / 2, 360, resolution)
+    time_coord = iris.coords.DimCoord(
+        np.arange(n_times) * 30.4375 + 15.0,
+        standard_name='time',
+        units=Unit('days since 1900-01-01', calendar='standard'))
+    lat = iris.coords.DimCoord(lats,
+                               standard_name='latitude',
+                               units='degrees')
+    lon = iris.coords.DimCoord(lons,
+                               standard_name='longitude',
+                               units='degrees')
+    rng = np.random.default_rng(0)
+    trends = rng.normal(size=(1, len(lats), len(lons)))
+    data = (trends * np.arange(n_times).reshape(-1, 1, 1) / n_times +
+            rng.normal(size=(n_times, len(lats), len(lons))))
+    data = np.ma.masked_greater(data, 3.0)
+    if lazy:
+        data = da.ma.masked_array(data.data, mask=data.mask,
+                                  chunks=(-1, 30, -1))
+    return iris.cube.Cube(data,
+                          var_name='var',
+                          units='K',
+                          dim_coords_and_dims=[(time_coord, 0), (lat, 1),
+                                               (lon, 2)])
+
+
+def get_cfg(option):
+    """Get configuration of the preprocessing."""
+    return {
+        option: {'trend': ['time' if option == 'collapse' else 'year']},
+        'n_jobs': 1,
+        'return_trend_stderr': True,
+        'work_dir': os.getcwd(),
+    }
+
+
+def get_data(cube):
+    """Get metadata of the dataset."""
+    return {
+        'filename': 'var.nc',
+        'long_name': 'Variable',
+        'short_name': 'var',
+        'units': str(cube.units),
+        'var_type': 'prediction_input',
+    }
+
+
+def run_reference(years, resolution):
+    """Calculate trends with :func:`scipy.stats.linregress`."""
+    cube = create_cube(years, resolution, False)
+    x_data = cube.coord('time').points
+    y_data = cube.data.reshape(cube.shape[0], -1)
+    start = time.perf_counter()
+    for idx in range(y_data.shape[1]):
+        mask = np.ma.getmaskarray(y_data[:, idx])
+        stats.linregress(x_data[~mask], y_data[:, idx].data[~mask])
+    return time.perf_counter() - start
+
+
+def run_trend(years, resolution, lazy, option):
+    """Calculate trends using the MLR preprocessing functions."""
+    cube = create_cube(years, resolution, lazy)
+    data = get_data(cube)
+    cfg = get_cfg(option)
+    start = time.perf_counter()
+    if option == 'collapse':
+        (cube, data) = preprocess.collapse_with_trend(cfg, cube, data)
+    else:
+        (cube, data) = preprocess.aggregate_by_trend(cfg, cube, data)
+    cube.data
+    data['stderr']['cube'].data
+    return time.perf_counter() - start
+
+
+def benchmark(years, resolution, reference):
+    """Run the benchmark and print the results."""
+    print(f"{'calculation':<28}{'time [s]':>10}")
+    for option in ('collapse', 'aggregate_by'):
+        for lazy in (False, True):
+            duration = run_trend(years, resolution, lazy, option)
+            label = f"{option} ({'lazy' if lazy else 'realized'})"
+            print(f"{label:<28}{duration:>10.2f}")
+    if reference:
+        duration = run_reference(years, resolution)
+        print(f"{'scipy.stats.linregress':<28}{duration:>10.2f}")
+
+
+def main():
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--years',
+                        type=int,
+                        default=100,
+                        help='Number of years of monthly data.')
+    parser.add_argument('--resolution',
+                        type=float,
+                        default=1.,
+                        help='Horizontal resolution in degrees.')
+    parser.add_argument('--reference',
+                        action='store_true',
+                        help='Also time a loop over scipy.stats.linregress.')
+    args = parser.parse_args()
+    benchmark(args.years, args.resolution, args.reference)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark the output profiles of the CMORizer.
+
+Writes a synthetic daily cube with each of the profiles in
+:data:`esmvaltool.cmorizers.data.utilities.OUTPUT_PROFILES` and reports
+the write time, the file size and the time needed to read a single time
+series and a single map from the file.
+
+Example
+-------
+python benchmark_output_profiles.py --years 5 --resolution 0.5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import dask.array as da
+import iris
+import iris.coords
+import iris.cube
+import numpy as np
+from cf_units import Unit
+
+from esmvaltool.cmorizers.data import utilities
+
+ATTRIBUTES = {
+    'project_id': 'OBS6',
+    'dataset_id': 'BENCHMARK',
+    'modeling_realm': 'reanaly',
+    'version': '1',
+    'mip': 'day',
+}
+
+
+def create_cube(years, resolution):
+    """Create a daily cube with smooth random data."""
+    n_times = 365 * years
+    lats = np.arange(-90 + resolution / 2, 90, resolution)
+    lons = np.arange(resolution / 2, 360, resolution)
+    time_coord = iris.coords.DimCoord(np.arange(n_times, dtype=np.float64),
+                                      standard_name='time',
+                                      units=Unit('days since 2000-01-01',
+                                                 calendar='noleap'))
+    lat = iris.coords.DimCoord(lats,
+                               standard_name='latitude',
+                               units='degrees')
+    lon = iris.coords.DimCoord(lons,
+                               standard_name='longitude',
+                               units='degrees')
+    shape = (n_times, len(lats), len(lons))
+    data = 280. + 10. * da.sin(da.arange(n_times)[:, None, None] / 58.)
+    data = data + da.random.random(shape, chunks=(365, -1, -1))
+    data = da.round(data, 2).astype(np.float32)
+    return iris.cube.Cube(data,
+                          var_name='tas',
+                          units='K',
+                          attributes={'mip': 'day'},
+                          dim_coords_and_dims=[(time_coord, 0), (lat, 1),
+                                               (lon, 2)])
+
+
+def _read_time(filename, index):
+    start = time.perf_counter()
+    cube = iris.load_cube(filename)
+    cube[index].data
+    return time.perf_counter() - start
+
+
+def benchmark(years, resolution, profiles):
+    """Run the benchmark and print the results."""
+    cube = create_cube(years, resolution)
+    print(f"Cube shape: {cube.shape}, "
+          f"size: {cube.lazy_data().nbytes / 2**20:.0f} MiB")
+    print(f"{'profile':<12}{'write [s]':>10}{'size [MiB]':>12}"
+          f"{'series [s]':>12}{'map [s]':>10}")
+    for name in profiles:
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            utilities.save_variable(
+                cube.copy(),
+                'tas',
+                out_dir,
+                ATTRIBUTES,
+                output_profile=utilities.OUTPUT_PROFILES[name])
+            write_time = time.perf_counter() - start
+            (filename, ) = [
+                os.path.join(out_dir, f) for f in os.listdir(out_dir)
+            ]
+            size = os.path.getsize(filename) / 2**20
+            series_time = _read_time(filename, (slice(None), 10, 10))
+            map_time = _read_time(filename, 0)
+        print(f"{name:<12}{write_time:>10.2f}{size:>12.1f}"
+              f"{series_time:>12.3f}{map_time:>10.3f}")
+
+
+def main():
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--years',
+                        type=int,
+                        default=2,
+                        help='Number of years of daily data.')
+    parser.add_argument('--resolution',
+                        type=float,
+                        default=1.,
+                        help='Horizontal resolution in degrees.')
+    parser.add_argument('--profiles',
+                        nargs='+',
+                        default=list(utilities.OUTPUT_PROFILES),
+                        choices=list(utilities.OUTPUT_PROFILES),
+                        help='Output profiles to compare.')
+    args = parser.parse_args()
+    benchmark(args.years, args.resolution, args.profiles)
+
+
+if __name__ == '__main__':
+    main()
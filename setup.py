@@ -49,6 +49,7 @@ REQUIREMENTS = {
         'pyproj',
         'pyyaml',
         'progressbar2',
+        'psutil',
         'psyplot',
         'psy-maps',
         'psy-reg',
@@ -72,6 +73,7 @@ REQUIREMENTS = {
     # Execute `pip install .[test]` once and the use `pytest` to run tests
     'test': [
         'flake8',
+        'pyftpdlib',
         'pytest>=3.9,!=6.0.0rc1,!=6.0.0',
         'pytest-cov>=2.10.1',
         'pytest-env',
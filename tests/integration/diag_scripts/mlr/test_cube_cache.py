@@ -0,0 +1,99 @@
+"""Tests for the cache of input cubes of MLR models."""
+
+import iris
+import iris.cube
+import numpy as np
+import pytest
+
+from esmvaltool.diag_scripts.mlr.models import MLRModel, _CubeCache
+
+
+def get_cube(data):
+    """Get cube with data."""
+    return iris.cube.Cube(np.ma.masked_invalid(data), var_name='x', units='K')
+
+
+@pytest.fixture
+def netcdf_file(tmp_path):
+    """Write cube with missing values to netCDF file."""
+    filename = str(tmp_path / 'x.nc')
+    iris.save(get_cube([1.0, np.nan, 3.0, 4.0]), filename)
+    return filename
+
+
+def test_lru_eviction():
+    """Test that least recently used cubes are removed from cache."""
+    cache = _CubeCache(max_bytes=80)
+    for key in ('a', 'b'):
+        cache.put(key, get_cube(np.arange(4.0)))
+    assert cache.get('a') is not None
+    cache.put('c', get_cube(np.arange(4.0)))
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+    cache.put('d', get_cube(np.arange(20.0)))
+    assert cache.get('d') is None
+
+
+def test_get_returns_read_only_copy():
+    """Test that cached data cannot be modified."""
+    cache = _CubeCache(max_bytes=1000)
+    cache.put('a', get_cube([1.0, np.nan]))
+    cube = cache.get('a')
+    cube.var_name = 'y'
+    assert cache.get('a').var_name == 'x'
+    with pytest.raises(ValueError):
+        cube.data[0] = 0.0
+
+
+def test_load_data_from_disk_cache(netcdf_file, tmp_path):
+    """Test memory-mapped data cached on disk."""
+    cache = _CubeCache(cache_dir=str(tmp_path / 'cache'))
+    data = cache.load_data(iris.load_cube(netcdf_file), netcdf_file,
+                           'float32')
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+    cached_data = cache.load_data(iris.load_cube(netcdf_file), netcdf_file,
+                                  'float32')
+    assert isinstance(cached_data.data, np.memmap)
+    assert cached_data.dtype == np.float32
+    np.testing.assert_array_equal(cached_data.mask, data.mask)
+    np.testing.assert_array_equal(cached_data, data)
+
+
+def test_load_cube_uses_cache(netcdf_file, mocker):
+    """Test that files are only read once by MLR models."""
+    load_cube = mocker.spy(iris, 'load_cube')
+    mlr_model = MLRModel.__new__(MLRModel)
+    mlr_model._cfg = {'dtype': 'float64'}
+    mlr_model._cube_cache = _CubeCache(max_bytes=1000)
+    dataset = {
+        'filename': netcdf_file,
+        'units': 'K',
+        'var_type': 'feature',
+        'tag': 'x',
+    }
+    cube_1 = mlr_model._load_cube(dataset)
+    cube_2 = mlr_model._load_cube(dataset)
+    assert load_cube.call_count == 1
+    assert cube_1 is not cube_2
+    np.testing.assert_array_equal(cube_2.data.mask, [0, 1, 0, 0])
+
+    # Other units are cached separately
+    mlr_model._load_cube({**dataset, 'convert_units_to': 'celsius',
+                          'units': 'celsius'})
+    assert load_cube.call_count == 2
+
+
+def test_get_cube_cache(mocker):
+    """Test that only MLR models with identical settings share caches."""
+    mocker.patch.object(MLRModel, '_CUBE_CACHES', {})
+    cache = MLRModel._get_cube_cache(1000, None)
+    assert cache.max_bytes == 1000
+    assert cache.cache_dir is None
+    assert MLRModel._get_cube_cache(1000, None) is cache
+    other_cache = MLRModel._get_cube_cache(10, 'cache')
+    assert other_cache is not cache
+    assert other_cache.max_bytes == 10
+    assert other_cache.cache_dir == 'cache'
+    assert cache.max_bytes == 1000
+    assert cache.cache_dir is None
@@ -42,6 +42,7 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # pylint: disable=too-few-public-methods
 # pylint: disable=too-many-arguments
 
+import itertools
 from copy import copy, deepcopy
 
 import numpy as np
@@ -50,9 +51,10 @@ import scipy.sparse as sp
 from sklearn import datasets
 from sklearn.base import BaseEstimator
 from sklearn.compose import ColumnTransformer
-from sklearn.decomposition import KernelPCA
+from sklearn.decomposition import PCA, KernelPCA
 from sklearn.exceptions import FitFailedWarning, NotFittedError
-from sklearn.linear_model import LinearRegression
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import Lasso, LinearRegression
 from sklearn.metrics import (
     explained_variance_score,
     make_scorer,
@@ -60,6 +62,7 @@ from sklearn.metrics import (
     mean_squared_error,
 )
 from sklearn.model_selection import LeaveOneGroupOut, ShuffleSplit
+from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
 from esmvaltool.diag_scripts.mlr.custom_sklearn import (
@@ -67,10 +70,12 @@ from esmvaltool.diag_scripts.mlr.custom_sklearn import (
     AdvancedPipeline,
     AdvancedRFE,
     AdvancedRFECV,
+    AdvancedTransformedTargetRegressor,
     FeatureSelectionTransformer,
     _check_fit_params,
     _determine_key_type,
     _fit_and_score_weighted,
+    _get_cached_transformers,
     _get_fit_parameters,
     _is_pairwise,
     _map_features,
@@ -1033,3 +1038,102 @@ def test_perform_efecv():
     assert len(transformer.grid_scores) == 7
     np.testing.assert_array_equal(transformer.ranking, [1, 1, 2])
     np.testing.assert_array_equal(transformer.support, [True, True, False])
+
+
+# _get_cached_transformers
+
+
+def get_pipeline(regressor=None, pca=False):
+    """Get pipeline with column-wise transformer steps."""
+    steps = [
+        ('imputer', SimpleImputer()),
+        ('x_scaler', ColumnTransformer([('', StandardScaler(), [1, 2])],
+                                       remainder='passthrough')),
+    ]
+    if pca:
+        steps.append(('pca', PCA()))
+    steps.append(('final', AdvancedTransformedTargetRegressor(
+        transformer=StandardScaler(), regressor=regressor)))
+    return AdvancedPipeline(steps)
+
+
+X_PIPE = np.array([
+    [0.0, 1.0, 2.0, 3.0],
+    [1.0, np.nan, 0.0, 2.0],
+    [2.0, 3.0, 5.0, 1.0],
+    [0.0, 3.0, 3.0, -1.0],
+    [4.0, 4.0, np.nan, 0.0],
+    [4.0, 0.0, 0.0, 1.0],
+])
+Y_PIPE = np.array([1.0, 0.0, 3.0, -5.0, -3.0, -3.0])
+
+
+def test_get_cached_transformers_not_possible():
+    """Test ``_get_cached_transformers`` for invalid estimators."""
+    assert _get_cached_transformers(LinearRegression(), X_PIPE,
+                                    Y_PIPE) is None
+    assert _get_cached_transformers(get_pipeline(pca=True), X_PIPE,
+                                    Y_PIPE) is None
+    assert _get_cached_transformers(get_pipeline(), X_PIPE, Y_PIPE,
+                                    imputer__param=1) is None
+    x_data = X_PIPE.copy()
+    x_data[:, 0] = np.nan
+    assert _get_cached_transformers(get_pipeline(), x_data, Y_PIPE) is None
+
+
+@pytest.mark.parametrize('support', [
+    [True, True, True, True],
+    [True, False, True, True],
+    [False, True, False, True],
+    [False, False, True, False],
+])
+def test_get_cached_transformers(support):
+    """Test ``_get_cached_transformers``."""
+    support = np.array(support)
+    cached_transformers = _get_cached_transformers(get_pipeline(), X_PIPE,
+                                                   Y_PIPE)
+    estimator = cached_transformers.fit_estimator(support, Y_PIPE)
+
+    # Compare to pipeline fitted on subset of features
+    expected = get_pipeline()
+    _update_transformers_param(expected, support)
+    expected.fit(X_PIPE[:, support], Y_PIPE)
+    np.testing.assert_allclose(estimator.coef_, expected.coef_)
+    np.testing.assert_allclose(estimator.predict(X_PIPE[:, support]),
+                               expected.predict(X_PIPE[:, support]))
+
+
+def test_get_cached_transformers_warm_start():
+    """Test warm start of final regressor."""
+    regressor = Lasso(alpha=0.1, warm_start=True)
+    cached_transformers = _get_cached_transformers(get_pipeline(regressor),
+                                                   X_PIPE, Y_PIPE)
+    estimator_1 = cached_transformers.fit_estimator(
+        np.array([True, True, True, True]), Y_PIPE)
+    final_step = estimator_1.steps[-1][1]
+    regressor_ = final_step.regressor_
+    estimator_2 = cached_transformers.fit_estimator(
+        np.array([True, False, True, True]), Y_PIPE,
+        previous_estimator=estimator_1)
+    assert estimator_2.steps[-1][1] is final_step
+    assert final_step.regressor_ is regressor_
+    assert regressor_.coef_.shape == (3, )
+
+
+def test_perform_efecv_pipeline():
+    """Test ``perform_efecv`` with cached transformers."""
+    (best_est, transformer) = perform_efecv(get_pipeline(), X_PIPE, Y_PIPE,
+                                            cv=2)
+    assert isinstance(best_est, AdvancedPipeline)
+    assert len(transformer.grid_scores) == 15
+
+    # Compare to scores calculated with full pipeline
+    supports = list(itertools.product([False, True], repeat=4))[1:]
+    expected_scores = []
+    for support in supports:
+        support = np.array(support)
+        estimator = get_pipeline()
+        _update_transformers_param(estimator, support)
+        expected_scores.append(np.mean(cross_val_score_weighted(
+            estimator, X_PIPE[:, support], Y_PIPE, cv=2)))
+    np.testing.assert_allclose(transformer.grid_scores, expected_scores)
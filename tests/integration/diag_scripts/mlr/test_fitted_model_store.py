@@ -0,0 +1,68 @@
+"""Tests for the store of fitted MLR models."""
+
+import numpy as np
+import pytest
+
+from esmvaltool.diag_scripts.mlr.models.linear import LinearRegressionModel
+from esmvaltool.utils.testing.benchmark_mlr_feature_matrix import (
+    create_datasets,
+)
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    """Write input files for MLR models."""
+    return create_datasets(str(tmp_path), 3, 2, 30.0)
+
+
+def get_mlr_model(datasets, tmp_path, **kwargs):
+    """Create MLR model using store of fitted models."""
+    work_dir = str(tmp_path / 'work')
+    return LinearRegressionModel(
+        datasets,
+        coords_as_features=['latitude'],
+        fitted_model_dir=str(tmp_path / 'store'),
+        group_datasets_by_attributes=['dataset'],
+        plot_dir=work_dir,
+        random_state=1,
+        work_dir=work_dir,
+        **kwargs,
+    )
+
+
+def test_fit_or_load(datasets, tmp_path, mocker):
+    """Test that fitted pipelines are reused."""
+    mlr_model = get_mlr_model(datasets, tmp_path)
+    mlr_model.fit_or_load()
+    x_data = mlr_model.data['train'].x
+    y_pred = mlr_model._clf.predict(x_data)
+    assert len(list((tmp_path / 'store').iterdir())) == 1
+
+    # Identical settings
+    fit = mocker.spy(LinearRegressionModel, 'fit')
+    mlr_model = get_mlr_model(datasets, tmp_path)
+    mlr_model.fit_or_load()
+    fit.assert_not_called()
+    np.testing.assert_array_equal(mlr_model._clf.predict(x_data), y_pred)
+    assert mlr_model._lime_explainer is not None
+
+    # Different fit method
+    mlr_model = get_mlr_model(datasets, tmp_path)
+    mlr_model.fit_or_load('rfecv', cv=2)
+    fit.assert_not_called()
+    assert len(list((tmp_path / 'store').iterdir())) == 2
+
+    # Different parameters
+    mlr_model = get_mlr_model(
+        datasets, tmp_path,
+        parameters_final_regressor={'fit_intercept': False})
+    mlr_model.fit_or_load()
+    fit.assert_called_once()
+    assert len(list((tmp_path / 'store').iterdir())) == 3
+
+
+def test_fit_or_load_invalid_method(datasets, tmp_path):
+    """Test invalid fit method."""
+    mlr_model = get_mlr_model(datasets, tmp_path)
+    with pytest.raises(ValueError):
+        mlr_model.fit_or_load('predict')
@@ -0,0 +1,105 @@
+"""Tests for the batched LIME calculations of MLR models."""
+
+import iris.coords
+import iris.cube
+import numpy as np
+import pandas as pd
+import pytest
+from lime.lime_tabular import LimeTabularExplainer
+from sklearn.linear_model import Ridge
+
+from esmvaltool.diag_scripts.mlr.models import MLRModel
+
+RNG = np.random.default_rng(42)
+
+
+@pytest.mark.parametrize('alpha', [0.01, 1.0])
+def test_solve_weighted_ridge(alpha):
+    """Test vectorized weighted ridge regressions."""
+    x_data = RNG.normal(size=(3, 50, 4))
+    y_data = RNG.normal(size=(3, 50))
+    weights = RNG.random((3, 50))
+    coefs = MLRModel._solve_weighted_ridge(x_data, y_data, weights, alpha)
+    assert coefs.shape == (3, 4)
+    for idx in range(3):
+        ridge = Ridge(alpha=alpha, fit_intercept=True)
+        ridge.fit(x_data[idx], y_data[idx], sample_weight=weights[idx])
+        np.testing.assert_allclose(coefs[idx], ridge.coef_)
+
+
+def get_x_cube():
+    """Get cube with latitude and longitude dimensions."""
+    lat = iris.coords.DimCoord([0.0, 1.0, 2.0, 3.0],
+                               standard_name='latitude',
+                               units='degrees')
+    lon = iris.coords.DimCoord([0.0, 1.0, 2.0, 3.0, 4.0],
+                               standard_name='longitude',
+                               units='degrees')
+    return iris.cube.Cube(np.zeros((4, 5)),
+                          dim_coords_and_dims=[(lat, 0), (lon, 1)])
+
+
+@pytest.mark.parametrize('stride', [1, 2])
+def test_get_lime_subsample(stride):
+    """Test selection of subsampled points for LIME."""
+    mlr_model = MLRModel.__new__(MLRModel)
+    mlr_model._cfg = {'lime_subsample': stride}
+    flat_idx = np.array([0, 2, 3, 5, 12, 17, 19])
+    index = pd.MultiIndex.from_arrays([['a'] * 7, flat_idx])
+    x_pred = pd.DataFrame(np.zeros((7, 1)), index=index)
+    (subsample_idx,
+     nearest_idx) = mlr_model._get_lime_subsample(x_pred, get_x_cube())
+    if stride == 1:
+        np.testing.assert_array_equal(subsample_idx, np.arange(7))
+        np.testing.assert_array_equal(nearest_idx, np.arange(7))
+    else:
+        np.testing.assert_array_equal(subsample_idx, [0, 1, 4])
+        np.testing.assert_array_equal(flat_idx[subsample_idx][nearest_idx],
+                                      [0, 2, 2, 0, 12, 12, 12])
+
+
+class _Regressor():
+    """Nonlinear regressor used to test LIME."""
+
+    @staticmethod
+    def predict(x_data):
+        """Predict target values."""
+        return (np.sin(x_data[:, 0]) + x_data[:, 1]**2 +
+                np.arange(1, x_data.shape[1] + 1) @ x_data.T / 10.0)
+
+
+@pytest.mark.parametrize('categorical', [False, True])
+@pytest.mark.parametrize('n_features', [3, MLRModel._LIME_N_FEATURES + 4])
+def test_get_lime_coefficients_batch(n_features, categorical):
+    """Test batched LIME against ``explain_instance`` with the same seed."""
+    x_train = RNG.normal(size=(100, n_features))
+    categorical_features = []
+    if categorical:
+        x_train[:, -1] = RNG.integers(3, size=100)
+        categorical_features = [n_features - 1]
+    y_train = _Regressor.predict(x_train)
+    kwargs = {
+        'mode': 'regression',
+        'training_labels': y_train,
+        'categorical_features': categorical_features,
+        'discretize_continuous': False,
+        'sample_around_instance': True,
+        'random_state': 1,
+    }
+    x_values = x_train[:3]
+    mlr_model = MLRModel.__new__(MLRModel)
+    mlr_model._clf = _Regressor()
+    mlr_model._lime_explainer = LimeTabularExplainer(x_train, **kwargs)
+    coefs = mlr_model._get_lime_coefficients_batch(x_values)
+    assert coefs.shape == (3, n_features)
+
+    explainer = LimeTabularExplainer(x_train, **kwargs)
+    for (idx, x_single) in enumerate(x_values):
+        explanation = explainer.explain_instance(x_single,
+                                                 _Regressor.predict)
+        ref = np.zeros(n_features)
+        for (feature_idx, coef) in explanation.local_exp[1]:
+            ref[feature_idx] = coef
+        np.testing.assert_allclose(coefs[idx], ref, rtol=1e-7, atol=1e-10)
+    assert (np.count_nonzero(coefs, axis=1) ==
+            min(n_features, MLRModel._LIME_N_FEATURES)).all()
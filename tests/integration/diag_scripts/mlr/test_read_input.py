@@ -70,3 +70,18 @@ def test_load_input_datasets(mock_models_logger, mock_mlr_logger, data):
     logger_calls = mock_models_logger.method_calls
     logger_calls.extend(mock_mlr_logger.method_calls)
     assert get_logger_msg(logger_calls) == data['logger']
+
+
+def test_get_multiindex():
+    """Test creation of index for data of several groups."""
+    mlr_model = SimplifiedMLRModel({'group_datasets_by_attributes': ['a']})
+    index = mlr_model._get_multiindex(['x', None, 'y'], [2, 1, 3])
+    assert index.names == ['a', 'index']
+    assert list(index) == [
+        ('x', 0),
+        ('x', 1),
+        ('none', 0),
+        ('y', 0),
+        ('y', 1),
+        ('y', 2),
+    ]
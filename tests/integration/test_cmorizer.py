@@ -174,3 +174,22 @@ def test_cmorize_obs_woa_data(tmp_path):
     output_path = os.path.join(log_dir, os.listdir(log_dir)[0], 'Tier2', 'WOA')
     check_output_exists(output_path)
     check_conversion(output_path)
+
+
+def test_cmorize_obs_parallel(tmp_path):
+    """Test formatting several datasets in parallel."""
+
+    config_user_file = write_config_user_file(tmp_path)
+    data_path = os.path.join(tmp_path, 'raw_stuff', 'Tier2', 'WOA')
+    put_dummy_data(data_path)
+    with keep_cwd():
+        with pytest.raises(Exception, match='Format failed for datasets XYZ'):
+            DataCommand().format('WOA,XYZ', config_user_file, jobs=2)
+
+    log_dir = os.path.join(tmp_path, 'output_dir')
+    run_dir = os.path.join(log_dir, os.listdir(log_dir)[0], 'run')
+    check_log_file(os.path.join(run_dir, 'WOA', 'log.txt'), no_data=False)
+    with open(os.path.join(run_dir, 'main_log.txt'), 'r') as log:
+        assert any("1 succeeded, 1 failed" in line for line in log)
+    output_path = os.path.join(log_dir, os.listdir(log_dir)[0], 'Tier2', 'WOA')
+    check_output_exists(output_path)
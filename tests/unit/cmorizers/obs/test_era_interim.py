@@ -0,0 +1,68 @@
+"""Tests for the ERA-Interim CMORizer."""
+import dask.array as da
+import iris
+import numpy as np
+import pytest
+from cf_units import Unit
+
+from esmvaltool.cmorizers.data.formatters.datasets.era_interim import (
+    _compute_daily,
+    _estimate_output_size,
+)
+
+
+def _create_cube(var_name, step=6, n_days=3):
+    """Create a lazy cube with sub-daily data."""
+    n_times = n_days * 24 // step
+    time = iris.coords.DimCoord(np.arange(n_times, dtype=np.float64) * step +
+                                step,
+                                standard_name='time',
+                                units=Unit('hours since 1900-01-01',
+                                           calendar='gregorian'))
+    lat = iris.coords.DimCoord([0.0, 1.0],
+                               standard_name='latitude',
+                               units='degrees')
+    data = da.arange(2 * n_times, dtype=np.float32,
+                     chunks=4).reshape(n_times, 2)
+    return iris.cube.Cube(data,
+                          var_name=var_name,
+                          dim_coords_and_dims=[(time, 0), (lat, 1)])
+
+
+@pytest.mark.parametrize('var_name,expected', [
+    ('tas', [[2.0, 3.0], [9.0, 10.0], [17.0, 18.0], [22.0, 23.0]]),
+    ('tasmax', [[6.0, 7.0], [14.0, 15.0], [22.0, 23.0]]),
+    ('pr', [[12.0, 16.0], [44.0, 48.0], [76.0, 80.0]]),
+])
+def test_compute_daily(var_name, expected):
+    """Test the daily aggregation."""
+    cube = _compute_daily(_create_cube(var_name))
+
+    assert cube.has_lazy_data()
+    np.testing.assert_allclose(cube.data, expected)
+    time = cube.coord('time')
+    n_days = len(expected)
+    np.testing.assert_allclose(time.points, np.arange(n_days) * 24 + 12)
+    np.testing.assert_allclose(
+        time.bounds,
+        np.stack([np.arange(n_days) * 24,
+                  np.arange(n_days) * 24 + 24], axis=-1))
+
+
+@pytest.mark.parametrize('mip,expected_times', [
+    ('day', 6),
+    ('6hr', 20),
+    ('fx', None),
+])
+def test_estimate_output_size(tmp_path, mip, expected_times):
+    """Test the estimate of the output size."""
+    cube = _create_cube('t2m', n_days=5)
+    filename = str(tmp_path / 'ERA-Interim_t2m_1990.nc')
+    iris.save(cube, filename)
+
+    size = _estimate_output_size([filename], {'raw': 't2m', 'mip': mip})
+
+    if expected_times is None:
+        assert size == 2 * 4
+    else:
+        assert size == expected_times * 2 * 4
@@ -0,0 +1,193 @@
+"""Tests for :mod:`esmvaltool.cmorizers.data.downloaders.cds`."""
+import json
+import os
+
+import pytest
+
+from esmvaltool.cmorizers.data.downloaders import cds
+from esmvaltool.cmorizers.data.downloaders.cds import (
+    LEDGER_FILE,
+    CDSDownloader,
+)
+
+
+class FakeCDSClient():
+    """Fake CDS that completes each request after a few state checks."""
+    def __init__(self, n_checks=2, fail=(), fail_download=()):
+        self.n_checks = n_checks
+        self.fail = fail
+        self.fail_download = set(fail_download)
+        self.requests = {}
+        self.checks = {}
+        self.submitted = []
+
+    def submit(self, product_name, request):
+        request_id = f'request-{len(self.submitted)}'
+        self.submitted.append(request_id)
+        self.requests[request_id] = (product_name, request)
+        self.checks[request_id] = 0
+        return request_id
+
+    def state(self, request_id):
+        if request_id not in self.requests:
+            raise KeyError(request_id)
+        if self.requests[request_id][1]['month'] in self.fail:
+            return 'failed'
+        self.checks[request_id] += 1
+        if self.checks[request_id] < self.n_checks:
+            return 'queued'
+        return 'completed'
+
+    def download(self, request_id, target):
+        month = self.requests[request_id][1]['month']
+        if month in self.fail_download:
+            self.fail_download.remove(month)
+            raise OSError('Connection lost')
+        with open(target, 'w', encoding='utf-8') as file:
+            json.dump(self.requests[request_id], file)
+
+
+def get_downloader(tmp_path, client, overwrite=False):
+    """Create a downloader using the fake client."""
+    return CDSDownloader(
+        product_name='product',
+        config={'rootpath': {
+            'RAWOBS': [str(tmp_path)]
+        }},
+        request_dictionary={'variable': 'var'},
+        dataset='DATASET',
+        dataset_info={'tier': 3},
+        overwrite=overwrite,
+        client=client,
+        max_requests=3,
+    )
+
+
+def read_file(downloader, month):
+    """Read the content of a downloaded file."""
+    path = os.path.join(downloader.local_folder, f'product_2000{month}.tar')
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@pytest.fixture(autouse=True)
+def no_wait(monkeypatch):
+    """Do not wait between checks of the state of the requests."""
+    monkeypatch.setattr(cds, 'POLL_INTERVAL', 0)
+
+
+def test_download(tmp_path):
+    """Test downloading a single file."""
+    client = FakeCDSClient()
+    downloader = get_downloader(tmp_path, client)
+    downloader.download(2000, 1)
+    assert read_file(downloader, '01') == [
+        'product', {'variable': 'var', 'year': '2000', 'month': '01'}
+    ]
+    assert os.listdir(downloader.local_folder) == ['product_200001.tar']
+
+
+def test_batch(tmp_path):
+    """Test submitting several requests at once."""
+    client = FakeCDSClient()
+    downloader = get_downloader(tmp_path, client)
+    with downloader.batch():
+        for month in range(1, 13):
+            downloader.download(2000, month)
+        assert not client.submitted
+    assert len(client.submitted) == 12
+    assert sorted(os.listdir(downloader.local_folder)) == [
+        f'product_2000{month:02d}.tar' for month in range(1, 13)
+    ]
+
+
+def test_batch_shared_queue(tmp_path):
+    """Test sharing a queue between downloaders."""
+    client = FakeCDSClient()
+    downloader1 = get_downloader(tmp_path, client)
+    downloader2 = get_downloader(tmp_path, client)
+    downloader2._product_name = 'other'
+    with downloader1.batch() as queue:
+        with downloader2.batch(queue):
+            downloader2.download(2000, 1)
+        downloader1.download(2000, 1)
+        assert not client.submitted
+    assert sorted(os.listdir(downloader1.local_folder)) == [
+        'other_200001.tar', 'product_200001.tar'
+    ]
+
+
+def test_batch_skip_existing(tmp_path):
+    """Test that downloaded files are not requested again."""
+    client = FakeCDSClient()
+    downloader = get_downloader(tmp_path, client)
+    downloader.download(2000, 1)
+    with downloader.batch():
+        downloader.download(2000, 1)
+        downloader.download(2000, 2)
+    assert len(client.submitted) == 2
+
+
+def test_batch_resume(tmp_path):
+    """Test that an interrupted download is resumed without resubmitting."""
+    client = FakeCDSClient(fail_download=['02'])
+    downloader = get_downloader(tmp_path, client)
+    with pytest.raises(RuntimeError, match='Failed to retrieve 1 file'):
+        with downloader.batch():
+            for month in range(1, 4):
+                downloader.download(2000, month)
+    ledger_file = os.path.join(downloader.local_folder, LEDGER_FILE)
+    with open(ledger_file, encoding='utf-8') as file:
+        ledger = json.load(file)
+    assert [entry['request_id'] for entry in ledger.values()] == ['request-1']
+
+    with downloader.batch():
+        for month in range(1, 4):
+            downloader.download(2000, month)
+    assert client.submitted == ['request-0', 'request-1', 'request-2']
+    assert read_file(downloader, '02')[1]['month'] == '02'
+    assert not os.path.exists(ledger_file)
+    assert not os.path.exists(
+        os.path.join(downloader.local_folder, 'product_200002.tar.part'))
+
+
+def test_batch_resume_expired(tmp_path):
+    """Test that requests unknown to the CDS are submitted again."""
+    client = FakeCDSClient(fail_download=['01'])
+    downloader = get_downloader(tmp_path, client)
+    with pytest.raises(RuntimeError):
+        downloader.download(2000, 1)
+
+    # The new client does not know the request anymore
+    client = FakeCDSClient()
+    downloader = get_downloader(tmp_path, client)
+    downloader.download(2000, 1)
+    assert client.submitted == ['request-0']
+    assert read_file(downloader, '01')[1]['month'] == '01'
+    assert not os.path.exists(
+        os.path.join(downloader.local_folder, LEDGER_FILE))
+
+
+def test_batch_resubmit_changed_request(tmp_path):
+    """Test that requests are submitted again if they changed."""
+    client = FakeCDSClient(fail_download=['01'])
+    downloader = get_downloader(tmp_path, client)
+    with pytest.raises(RuntimeError):
+        downloader.download(2000, 1)
+    downloader._request_dict = {'variable': 'other'}
+    downloader.download(2000, 1)
+    assert client.submitted == ['request-0', 'request-1']
+    assert read_file(downloader, '01')[1]['variable'] == 'other'
+
+
+def test_batch_failed_request(tmp_path):
+    """Test that failed requests are reported after the other downloads."""
+    client = FakeCDSClient(fail=['02'])
+    downloader = get_downloader(tmp_path, client)
+    with pytest.raises(RuntimeError, match='product_200002.tar'):
+        with downloader.batch():
+            for month in range(1, 4):
+                downloader.download(2000, month)
+    assert sorted(os.listdir(downloader.local_folder)) == [
+        'product_200001.tar', 'product_200003.tar'
+    ]
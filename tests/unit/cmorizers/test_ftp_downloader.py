@@ -0,0 +1,181 @@
+"""Tests for :mod:`esmvaltool.cmorizers.data.downloaders.ftp`."""
+import ftplib
+import os
+import threading
+
+import pytest
+
+from esmvaltool.cmorizers.data.downloaders import ftp
+from esmvaltool.cmorizers.data.downloaders.ftp import FTPDownloader
+
+pytest.importorskip('pyftpdlib')
+from pyftpdlib.authorizers import DummyAuthorizer  # noqa: E402
+from pyftpdlib.handlers import FTPHandler  # noqa: E402
+from pyftpdlib.servers import ThreadedFTPServer  # noqa: E402
+
+CONTENT = {
+    'file_2000.nc': b'a' * 100_000,
+    'file_2001.nc': b'b' * 50_000,
+    'other.txt': b'c' * 10,
+}
+
+
+@pytest.fixture
+def ftp_server(tmp_path):
+    """Run a local FTP server serving some files in folder `data`."""
+    server_dir = tmp_path / 'server' / 'data'
+    server_dir.mkdir(parents=True)
+    for filename, content in CONTENT.items():
+        (server_dir / filename).write_bytes(content)
+
+    authorizer = DummyAuthorizer()
+    authorizer.add_anonymous(str(tmp_path / 'server'))
+    handler = type('Handler', (FTPHandler, ), {'authorizer': authorizer})
+    server = ThreadedFTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever,
+                              kwargs={'timeout': 0.1})
+    thread.start()
+    yield server
+    server.close_all()
+    thread.join()
+
+
+@pytest.fixture
+def local_folder(tmp_path):
+    """Folder to which the files are downloaded."""
+    return tmp_path / 'rawobs' / 'Tier3' / 'DATASET' / 'sub'
+
+
+def get_downloader(tmp_path, ftp_server, overwrite=False):
+    """Create a downloader connected to the local FTP server."""
+    config = {'rootpath': {'RAWOBS': [str(tmp_path / 'rawobs')]}}
+    (host, port) = ftp_server.address
+    downloader = FTPDownloader(config,
+                               host,
+                               'DATASET', {'tier': 3},
+                               overwrite,
+                               max_connections=2,
+                               port=port)
+    downloader.connect()
+    downloader.set_cwd('data')
+    return downloader
+
+
+def test_download_folder(tmp_path, ftp_server, local_folder):
+    """Test downloading a folder."""
+    downloader = get_downloader(tmp_path, ftp_server)
+    downloader.download_folder('.', 'sub', filter_files=r'.*\.nc')
+
+    assert sorted(os.listdir(local_folder)) == [
+        'file_2000.nc', 'file_2001.nc'
+    ]
+    assert downloader._n_sessions == 0
+    assert downloader._sessions.empty()
+    for filename in os.listdir(local_folder):
+        assert (local_folder / filename).read_bytes() == CONTENT[filename]
+        server_file = tmp_path / 'server' / 'data' / filename
+        assert (int((local_folder / filename).stat().st_mtime) == int(
+            server_file.stat().st_mtime))
+
+
+def test_download_file_resume(tmp_path, ftp_server, local_folder):
+    """Test that partially downloaded files are resumed."""
+    local_folder.mkdir(parents=True)
+    part_file = local_folder / 'file_2000.nc.part'
+    part_file.write_bytes(CONTENT['file_2000.nc'][:1000])
+    # Mark the part as different from the data in the server
+    with open(part_file, 'r+b') as file:
+        file.write(b'x')
+
+    downloader = get_downloader(tmp_path, ftp_server)
+    downloader.download_file('file_2000.nc', 'sub')
+
+    assert not part_file.exists()
+    content = (local_folder / 'file_2000.nc').read_bytes()
+    assert content == b'x' + CONTENT['file_2000.nc'][1:]
+
+
+def test_download_file_restart_if_modified(tmp_path, ftp_server,
+                                           local_folder):
+    """Test that partial downloads are discarded if the file changed."""
+    local_folder.mkdir(parents=True)
+    part_file = local_folder / 'file_2000.nc.part'
+    part_file.write_bytes(b'x' * 1000)
+    os.utime(part_file, (0, 0))
+
+    downloader = get_downloader(tmp_path, ftp_server)
+    downloader.download_file('file_2000.nc', 'sub')
+
+    content = (local_folder / 'file_2000.nc').read_bytes()
+    assert content == CONTENT['file_2000.nc']
+
+
+@pytest.mark.parametrize('overwrite', [True, False])
+def test_download_file_skip(tmp_path, ftp_server, local_folder, overwrite):
+    """Test that complete files are only downloaded again if requested."""
+    downloader = get_downloader(tmp_path, ftp_server, overwrite)
+    downloader.download_file('file_2001.nc', 'sub')
+    local_file = local_folder / 'file_2001.nc'
+    mtime = local_file.stat().st_mtime
+    local_file.write_bytes(b'y' * len(CONTENT['file_2001.nc']))
+    os.utime(local_file, (mtime, mtime))
+
+    downloader.download_file('file_2001.nc', 'sub')
+
+    if overwrite:
+        assert local_file.read_bytes() == CONTENT['file_2001.nc']
+    else:
+        assert local_file.read_bytes() == b'y' * len(CONTENT['file_2001.nc'])
+
+
+def test_download_file_size_mismatch(tmp_path, ftp_server, local_folder):
+    """Test that incomplete files are downloaded again."""
+    local_folder.mkdir(parents=True)
+    local_file = local_folder / 'file_2001.nc'
+    local_file.write_bytes(b'y')
+
+    downloader = get_downloader(tmp_path, ftp_server)
+    downloader.download_file('file_2001.nc', 'sub')
+
+    assert local_file.read_bytes() == CONTENT['file_2001.nc']
+
+
+def test_session_dropped_while_waiting(tmp_path, mocker):
+    """Test that waiting threads open a new connection if one is dropped."""
+    mocker.patch.object(ftp, '_POOL_TIMEOUT', 0.01)
+    config = {'rootpath': {'RAWOBS': [str(tmp_path / 'rawobs')]}}
+    downloader = FTPDownloader(config, 'server', 'DATASET', {'tier': 3},
+                               False)
+    sessions = [mocker.Mock(name='session_1'), mocker.Mock(name='session_2')]
+    refused = threading.Event()
+
+    def open_session():
+        if len(sessions) == 1 and not refused.is_set():
+            refused.set()
+            raise ftplib.error_temp('421 too many connections')
+        return sessions.pop(0)
+
+    mocker.patch.object(downloader, '_open_session', side_effect=open_session)
+    used = []
+
+    def use_session():
+        with downloader._session() as session:
+            used.append(session)
+
+    thread = threading.Thread(target=use_session, daemon=True)
+    with pytest.raises(ftplib.error_temp):
+        with downloader._session() as session:
+            first_session = session
+            thread.start()
+            refused.wait(timeout=10)
+            raise ftplib.error_temp('connection lost')
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    first_session.close.assert_called_once_with()
+    assert len(used) == 1
+    assert used[0] is not first_session
+
+    downloader.close()
+    used[0].quit.assert_called_once_with()
+    assert downloader._n_sessions == 0
@@ -1,5 +1,11 @@
 """Tests for the module :mod:`esmvaltool.cmorizers.data.utilities`."""
 
+import gzip
+import io
+import logging
+import os
+import shutil
+import tarfile
 from unittest.mock import Mock
 
 import dask.array as da
@@ -329,3 +335,304 @@ def test_read_cmor_config():
     assert 'thetao' in cfg['variables']
     assert 'Omon' in cfg['cmor_table'].tables
     assert 'thetao' in cfg['cmor_table'].tables['Omon']
+
+
+def test_get_output_profile():
+    """Test reading the output profile from the cmor_config."""
+    assert utils.get_output_profile('WOA') == {}
+    assert utils.get_output_profile('NON-EXISTENT') == {}
+    profile = utils.get_output_profile('ERA-Interim')
+    assert profile['zlib'] is True
+    assert profile['chunks'] == 'timeseries'
+
+
+def _create_time_series_cube(n_years=2):
+    """Create a daily time series cube."""
+    n_times = 365 * n_years
+    time = iris.coords.DimCoord(np.arange(n_times, dtype=np.float64),
+                                standard_name='time',
+                                units=Unit('days since 2000-01-01',
+                                           calendar='noleap'))
+    lat = iris.coords.DimCoord(np.linspace(-89.5, 89.5, 180),
+                               standard_name='latitude',
+                               units='degrees')
+    lon = iris.coords.DimCoord(np.linspace(0.5, 359.5, 360),
+                               standard_name='longitude',
+                               units='degrees')
+    return iris.cube.Cube(da.zeros((n_times, 180, 360), dtype=np.float32),
+                          var_name='tas',
+                          units='K',
+                          attributes={'mip': 'day'},
+                          dim_coords_and_dims=[(time, 0), (lat, 1),
+                                               (lon, 2)])
+
+
+@pytest.mark.parametrize('chunks,expected', [
+    ('map', [1, 180, 360]),
+    ('timeseries', [730, 23, 45]),
+    ({
+        'time': 10,
+        'longitude': -1
+    }, [10, 180, 360]),
+])
+def test_get_chunksizes(chunks, expected):
+    """Test the chunk shapes of the output profiles."""
+    cube = _create_time_series_cube()
+    assert utils._get_chunksizes(cube, chunks) == expected
+
+
+def test_save_variable_profile(tmp_path):
+    """Test saving a variable using an output profile."""
+    profile = dict(utils.OUTPUT_PROFILES['timeseries'], split_by_year=True)
+    cube = _create_time_series_cube()
+    attrs = {
+        'project_id': 'OBS6',
+        'dataset_id': 'DATASET',
+        'modeling_realm': 'reanaly',
+        'version': '1',
+        'mip': 'day',
+    }
+    utils.save_variable(cube, 'tas', str(tmp_path), attrs, profile)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        'OBS6_DATASET_reanaly_1_day_tas_200001-200012.nc',
+        'OBS6_DATASET_reanaly_1_day_tas_200101-200112.nc',
+    ]
+    netcdf4 = pytest.importorskip('netCDF4')
+    filename = tmp_path / 'OBS6_DATASET_reanaly_1_day_tas_200001-200012.nc'
+    with netcdf4.Dataset(filename) as dataset:
+        variable = dataset.variables['tas']
+        assert variable.chunking() == [365, 45, 45]
+        assert variable.filters()['zlib'] is True
+        assert variable.filters()['shuffle'] is True
+
+
+def test_save_variable_profile_scalar_time(tmp_path):
+    """Test splitting by year with a scalar time coordinate."""
+    profile = dict(utils.OUTPUT_PROFILES['timeseries'], split_by_year=True)
+    cube = _create_time_series_cube()[0]
+    attrs = {
+        'project_id': 'OBS6',
+        'dataset_id': 'DATASET',
+        'modeling_realm': 'reanaly',
+        'version': '1',
+        'mip': 'day',
+    }
+    utils.save_variable(cube, 'tas', str(tmp_path), attrs, profile)
+
+    assert os.listdir(tmp_path) == [
+        'OBS6_DATASET_reanaly_1_day_tas_200001-200012.nc'
+    ]
+
+
+def test_bin_to_grid():
+    """Test binning of point data on a grid."""
+    pd = pytest.importorskip('pandas')
+    rng = np.random.default_rng(0)
+    n_points = 1000
+    grid_lats = np.linspace(-90.0, 90.0, 91)
+    grid_lons = np.linspace(-180.0, 180.0, 181)
+    lat = np.around(rng.uniform(-90.0, 90.0, n_points))
+    lon = np.around(rng.uniform(-180.0, 180.0, n_points))
+    data = np.ma.masked_greater(rng.normal(size=(n_points, 3)), 1.5)
+
+    result = utils.bin_to_grid(lat, lon, data, grid_lats, grid_lons)
+
+    assert result.shape == (3, 91, 181)
+    for level in range(3):
+        expected = pd.pivot_table(
+            pd.DataFrame({
+                'lat': lat,
+                'lon': lon,
+                'data': data[:, level].filled(np.nan),
+            }),
+            values='data',
+            index='lat',
+            columns='lon',
+            aggfunc=np.mean,
+            dropna=False,
+        ).reindex(index=grid_lats, columns=grid_lons).values
+        np.testing.assert_allclose(result[level].filled(np.nan), expected)
+    np.testing.assert_array_equal(
+        utils.bin_to_grid(lat, lon, data[:, 0], grid_lats, grid_lons),
+        result[0])
+
+
+def _write_job_output(path, name):
+    """Write a file to mark that a job has run."""
+    (path / name).write_text(name)
+
+
+def _fail_job():
+    """Raise an error."""
+    raise ValueError("Job failed")
+
+
+def _log_job(name):
+    """Log messages with different levels."""
+    job_logger = logging.getLogger('esmvaltool.cmorizers.test_job')
+    job_logger.debug("Debug message of job %s", name)
+    job_logger.info("CMORizing job %s", name)
+
+
+@pytest.mark.parametrize('max_parallel_tasks', [1, 2])
+def test_run_jobs(tmp_path, max_parallel_tasks):
+    """Test running CMORization jobs."""
+    jobs = {(var, year): (tmp_path, f'{var}_{year}')
+            for var in ('tas', 'pr') for year in (2000, 2001)}
+    cfg_user = {'max_parallel_tasks': max_parallel_tasks}
+    utils.run_jobs(_write_job_output, jobs, cfg_user,
+                   job_memory=lambda *_: 2**60)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'pr_2000', 'pr_2001', 'tas_2000', 'tas_2001'
+    ]
+
+
+@pytest.mark.parametrize('max_parallel_tasks', [1, 2])
+def test_run_jobs_logging(caplog, max_parallel_tasks):
+    """Test that log messages of CMORization jobs are kept."""
+    caplog.set_level(logging.INFO)
+    jobs = {name: (name, ) for name in ('a', 'b', 'c')}
+    cfg_user = {'max_parallel_tasks': max_parallel_tasks}
+    utils.run_jobs(_log_job, jobs, cfg_user)
+    messages = [r.getMessage() for r in caplog.records
+                if r.name == 'esmvaltool.cmorizers.test_job']
+    assert sorted(messages) == [
+        'CMORizing job a', 'CMORizing job b', 'CMORizing job c'
+    ]
+
+
+@pytest.mark.parametrize('max_parallel_tasks', [1, 2])
+def test_run_jobs_fail(max_parallel_tasks):
+    """Test that errors in CMORization jobs are raised."""
+    jobs = {'a': (), 'b': ()}
+    cfg_user = {'max_parallel_tasks': max_parallel_tasks}
+    with pytest.raises(ValueError, match="Job failed"):
+        utils.run_jobs(_fail_job, jobs, cfg_user)
+
+
+@pytest.mark.parametrize('max_parallel_tasks,n_jobs,n_workers', [
+    (4, None, 4),
+    (4, 2, 2),
+    (None, 1, 1),
+    (None, None, 1),
+    (0, None, 1),
+])
+def test_get_n_workers(max_parallel_tasks, n_jobs, n_workers):
+    """Test getting the number of workers."""
+    cfg_user = {'max_parallel_tasks': max_parallel_tasks}
+    assert utils.get_n_workers(cfg_user, n_jobs) == n_workers
+
+
+def test_estimate_memory(tmp_path):
+    """Test estimating the memory from the input files."""
+    in_files = [tmp_path / 'a.nc', tmp_path / 'b.nc']
+    in_files[0].write_bytes(b'0' * 10)
+    in_files[1].write_bytes(b'0' * 20)
+    assert utils.estimate_memory(in_files) == 60
+    assert utils.estimate_memory(str(in_files[0]), factor=1.5) == 15
+
+
+def _make_tar(path, members):
+    """Create a tar file with the given members."""
+    with tarfile.open(path, 'w:gz' if path.endswith('gz') else 'w') as tar:
+        for (name, content) in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_unpack_files_in_folder(tmp_path, n_workers):
+    """Test unpacking nested archives into a flat folder."""
+    inner_tar = tmp_path / 'inner.tar'
+    _make_tar(str(inner_tar), {
+        'sub/c.nc': b'c',
+        'd.nc.gz': gzip.compress(b'd'),
+    })
+    folder = tmp_path / 'folder'
+    (folder / 'subfolder').mkdir(parents=True)
+    _make_tar(str(folder / 'subfolder' / 'outer.tgz'), {
+        'dir/a.nc': b'a',
+        'dir/inner.tar': inner_tar.read_bytes(),
+    })
+    (folder / 'b.nc.gz').write_bytes(gzip.compress(b'b'))
+    (folder / '.hidden.gz').write_bytes(b'not an archive')
+    (folder / 'e.txt').write_bytes(b'e')
+
+    utils.unpack_files_in_folder(str(folder), n_workers=n_workers)
+
+    assert sorted(os.listdir(folder)) == [
+        '.hidden.gz', 'a.nc', 'b.nc', 'c.nc', 'd.nc', 'e.txt'
+    ]
+    for name in 'abcde':
+        filename = 'e.txt' if name == 'e' else f'{name}.nc'
+        assert (folder / filename).read_bytes() == name.encode()
+
+
+def test_unpack_files_in_folder_skip_existing(tmp_path):
+    """Test that existing outputs are not unpacked again."""
+    _make_tar(str(tmp_path / 'archive.tar'), {'a.nc': b'a', 'b.nc': b'b'})
+    (tmp_path / 'a.nc').write_bytes(b'x')
+    os.utime(tmp_path / 'a.nc', (0, 0))
+    (tmp_path / 'c.nc.gz').write_bytes(gzip.compress(b'c', mtime=1000))
+    (tmp_path / 'c.nc').write_bytes(b'x')
+    os.utime(tmp_path / 'c.nc', (1000, 1000))
+
+    utils.unpack_files_in_folder(str(tmp_path), n_workers=1)
+
+    assert sorted(os.listdir(tmp_path)) == ['a.nc', 'b.nc', 'c.nc']
+    assert (tmp_path / 'a.nc').read_bytes() == b'x'
+    assert (tmp_path / 'b.nc').read_bytes() == b'b'
+    assert (tmp_path / 'b.nc').stat().st_mtime == 0
+    assert (tmp_path / 'c.nc').read_bytes() == b'x'
+
+
+@pytest.mark.parametrize('existing', [b'xx', b'x'])
+def test_unpack_files_in_folder_replace_outdated(tmp_path, existing):
+    """Test that outdated files from previous runs are replaced."""
+    _make_tar(str(tmp_path / 'archive.tar'), {'dir/a.nc': b'a'})
+    (tmp_path / 'a.nc').write_bytes(existing)
+    (tmp_path / 'b.nc.gz').write_bytes(gzip.compress(b'b', mtime=1000))
+    (tmp_path / 'b.nc').write_bytes(b'x')
+
+    utils.unpack_files_in_folder(str(tmp_path), n_workers=1)
+
+    assert sorted(os.listdir(tmp_path)) == ['a.nc', 'b.nc']
+    assert (tmp_path / 'a.nc').read_bytes() == b'a'
+    assert (tmp_path / 'b.nc').read_bytes() == b'b'
+    assert (tmp_path / 'b.nc').stat().st_mtime == 1000
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_unpack_files_in_folder_collision(tmp_path, n_workers):
+    """Test archives with same-named members."""
+    _make_tar(str(tmp_path / 'archive1.tar'), {'a.nc': b'a'})
+    _make_tar(str(tmp_path / 'archive2.tar'), {'a.nc': b'bb'})
+    (tmp_path / 'b.nc.gz').write_bytes(gzip.compress(b'b'))
+    _make_tar(str(tmp_path / 'archive3.tar'), {'b.nc': b'b'})
+
+    with pytest.raises(FileExistsError, match="same name"):
+        utils.unpack_files_in_folder(str(tmp_path), n_workers=n_workers)
+    assert (tmp_path / 'a.nc').read_bytes() in (b'a', b'bb')
+    assert not [f for f in os.listdir(tmp_path) if f.endswith('.part')]
+
+
+def test_unpack_files_in_folder_duplicate_member(tmp_path):
+    """Test that archive members with the same name raise an error."""
+    _make_tar(str(tmp_path / 'archive.tar'), {
+        'dir1/a.nc': b'a',
+        'dir2/a.nc': b'b',
+    })
+    with pytest.raises(FileExistsError):
+        utils.unpack_files_in_folder(str(tmp_path), n_workers=1)
+
+
+def test_unpack_files_in_folder_flatten_collision(tmp_path):
+    """Test that flattening does not overwrite files with the same name."""
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'a.nc').write_bytes(b'a')
+    (tmp_path / 'a.nc').write_bytes(b'x')
+    with pytest.raises(shutil.Error):
+        utils.unpack_files_in_folder(str(tmp_path), n_workers=1)
+    assert (tmp_path / 'a.nc').read_bytes() == b'x'
@@ -0,0 +1,57 @@
+"""Tests for the anomaly calculations of climate metrics."""
+import iris
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+from cf_units import Unit
+
+from esmvaltool.diag_scripts.climate_metrics import feedback_parameters, tcr
+
+
+def get_cube(offset, trend, lazy=False):
+    """Get cube with monthly float32 data."""
+    n_months = 12 * (tcr.END_YEAR_IDX + 1)
+    time_coord = iris.coords.DimCoord(
+        np.arange(n_months) * 30.0 + 15.0,
+        standard_name='time',
+        units=Unit('days since 1850-01-01', calendar='360_day'))
+    data = (offset + trend * np.arange(n_months) / 12.0).astype(np.float32)
+    cube = iris.cube.Cube(data,
+                          var_name='tas',
+                          long_name='Near-Surface Air Temperature',
+                          units='K',
+                          dim_coords_and_dims=[(time_coord, 0)])
+    if lazy:
+        cube.data = cube.lazy_data()
+    return cube
+
+
+def get_anomaly(n_years):
+    """Get expected annual anomalies."""
+    return 3.0 + 0.04 * (np.arange(n_years) + 5.5 / 12.0)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_tcr_anomaly_cube(lazy):
+    """Test that anomalies keep the data type of the input data."""
+    anomaly_cube = tcr._get_anomaly_cube(get_cube(290.0, 0.05, lazy=lazy),
+                                         get_cube(287.0, 0.01))
+    assert anomaly_cube.has_lazy_data() == lazy
+    assert anomaly_cube.dtype == np.float32
+    np.testing.assert_allclose(anomaly_cube.data,
+                               get_anomaly(anomaly_cube.shape[0]), atol=1e-4)
+
+
+def test_feedback_parameters_anomaly(tmp_path):
+    """Test that anomalies keep the data type of the input data."""
+    data = {}
+    for (exp, offset, trend) in [('4x', 290.0, 0.05), ('pic', 287.0, 0.01)]:
+        filename = str(tmp_path / f'{exp}.nc')
+        iris.save(get_cube(offset, trend), filename)
+        data[exp] = [{'filename': filename}]
+    anomaly_cube = feedback_parameters.calculate_anomaly(data['4x'],
+                                                         data['pic'])
+    assert anomaly_cube.dtype == np.float32
+    np.testing.assert_allclose(anomaly_cube.data,
+                               get_anomaly(anomaly_cube.shape[0]), atol=1e-4)
@@ -0,0 +1,86 @@
+"""Tests for the temperature variability metric psi."""
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+from scipy import stats
+
+from esmvaltool.diag_scripts.climate_metrics import psi
+
+N_YEARS = 80
+
+
+def get_cube(shape=()):
+    """Get cube with (autocorrelated) annual data."""
+    rng = np.random.default_rng(0)
+    noise = np.zeros((N_YEARS, ) + shape)
+    for idx in range(1, N_YEARS):
+        noise[idx] = 0.6 * noise[idx - 1] + rng.normal(size=shape)
+    trend = 0.02 * np.arange(N_YEARS).reshape((-1, ) + (1, ) * len(shape))
+    year_coord = iris.coords.DimCoord(np.arange(1900, 1900 + N_YEARS),
+                                      long_name='year')
+    coords = [(year_coord, 0)]
+    for (idx, length) in enumerate(shape):
+        coords.append((iris.coords.DimCoord(np.arange(length, dtype=float),
+                                            long_name=f'dim{idx}'), idx + 1))
+    return iris.cube.Cube(287.0 + trend + 0.3 * noise,
+                          var_name='tas',
+                          units='K',
+                          dim_coords_and_dims=coords)
+
+
+def get_reference_psi(years, tas, window_length, lag):
+    """Calculate psi with loop over windows."""
+    psis = []
+    for yr_idx in range(years.shape[0] - window_length):
+        slc = slice(yr_idx, yr_idx + window_length)
+        reg = stats.linregress(years[slc], tas[slc])
+        res = tas[slc] - (reg.slope * years[slc] + reg.intercept)
+        autocorr = np.sum(res[:-lag] * res[lag:]) / np.sum(res**2)
+        psis.append(np.std(res) / np.sqrt(-np.log(autocorr)))
+    return np.array(psis)
+
+
+@pytest.mark.parametrize('cfg', [{}, {'window_length': 20, 'lag': 2}])
+def test_calculate_psi(cfg):
+    """Test calculation of psi for 1D data."""
+    cube = get_cube()
+    psi_cube = psi.calculate_psi(cube, cfg)
+    window_length = cfg.get('window_length', 55)
+    assert psi_cube.shape == (N_YEARS - window_length, )
+    np.testing.assert_array_equal(
+        psi_cube.coord('year').points,
+        np.arange(1899 + window_length, 1899 + N_YEARS))
+    assert psi_cube.attributes == {
+        'window_length': window_length,
+        'lag': cfg.get('lag', 1),
+    }
+    ref = get_reference_psi(cube.coord('year').points, cube.data,
+                            window_length, cfg.get('lag', 1))
+    np.testing.assert_allclose(psi_cube.data, ref, rtol=1e-10)
+
+
+def test_calculate_psi_grid():
+    """Test calculation of psi for every grid cell."""
+    cube = get_cube((2, 3))
+    cube.data = np.ma.masked_array(cube.data)
+    cube.data[40, 1, 2] = np.ma.masked
+    psi_cube = psi.calculate_psi(cube, {'window_length': 20})
+    assert psi_cube.shape == (60, 2, 3)
+    assert psi_cube.coord('dim1') == cube.coord('dim1')
+    for (idx_0, idx_1) in np.ndindex(2, 3):
+        ref = get_reference_psi(cube.coord('year').points,
+                                cube.data.data[:, idx_0, idx_1], 20, 1)
+        if (idx_0, idx_1) == (1, 2):
+            mask = np.zeros(60, dtype=bool)
+            mask[21:41] = True
+            np.testing.assert_array_equal(psi_cube.data.mask[:, 1, 2], mask)
+            ref = np.ma.masked_array(ref, mask=mask)
+        np.testing.assert_allclose(psi_cube.data[:, idx_0, idx_1], ref,
+                                   rtol=1e-10)
+
+
+def test_calculate_psi_too_short():
+    """Test calculation of psi for too short time series."""
+    with pytest.raises(ValueError):
+        psi.calculate_psi(get_cube(), {'window_length': N_YEARS})
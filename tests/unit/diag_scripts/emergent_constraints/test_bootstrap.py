@@ -0,0 +1,64 @@
+"""Tests for the batched resampling of emergent constraints."""
+
+import numpy as np
+import pytest
+
+import esmvaltool.diag_scripts.emergent_constraints as ec
+
+RNG = np.random.default_rng(42)
+X_DATA = RNG.normal(size=15)
+Y_DATA = 2.0 * X_DATA + 1.0 + 0.8 * RNG.normal(size=15)
+
+
+@pytest.mark.parametrize('necessary_p_value', [None, 0.01])
+def test_bootstrap_constraint_info_array(necessary_p_value):
+    """Test batched evaluation against loop over samples."""
+    indices = RNG.integers(15, size=(7, 10))
+    obs_mean = np.linspace(0.0, 0.5, 7)
+    info = ec.bootstrap_constraint_info_array(
+        X_DATA, Y_DATA, obs_mean, 0.3, resample_indices=indices,
+        n_points=200, necessary_p_value=necessary_p_value, batch_size=3)
+    assert info.shape == (7, 8)
+    for (idx, sample) in enumerate(indices):
+        ref = ec.constraint_info_array(X_DATA[sample], Y_DATA[sample],
+                                       obs_mean[idx], 0.3, n_points=200,
+                                       necessary_p_value=necessary_p_value)
+        np.testing.assert_allclose(info[idx], ref, rtol=1e-10, atol=1e-12)
+
+
+def test_bootstrap_constraint_info_array_random_state():
+    """Test reproducibility of bootstrap samples."""
+    kwargs = {'n_samples': 5, 'n_points': 100, 'random_state': 1}
+    info = ec.bootstrap_constraint_info_array(X_DATA, Y_DATA, 0.2, 0.3,
+                                              **kwargs)
+    assert info.shape == (5, 8)
+    np.testing.assert_array_equal(
+        ec.bootstrap_constraint_info_array(X_DATA, Y_DATA, 0.2, 0.3,
+                                           n_jobs=2, **kwargs), info)
+    kwargs['random_state'] = 2
+    assert not np.allclose(
+        ec.bootstrap_constraint_info_array(X_DATA, Y_DATA, 0.2, 0.3,
+                                           **kwargs), info)
+
+
+def test_bootstrap_constraint_info_array_degenerate():
+    """Test degenerate samples."""
+    indices = [[0, 0, 0], [0, 1, 2]]
+    info = ec.bootstrap_constraint_info_array(X_DATA, Y_DATA, 0.2, 0.3,
+                                              resample_indices=indices,
+                                              n_points=100)
+    assert np.isnan(info[0, [0, 1, 4, 5]]).all()
+    assert np.isfinite(info[1]).all()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'resample_indices': [0, 1, 2]},
+    {'obs_mean': [0.1, 0.2]},
+    {'obs_std': np.ones((3, 1))},
+])
+def test_bootstrap_constraint_info_array_fail(kwargs):
+    """Test invalid input."""
+    all_kwargs = {'obs_mean': 0.2, 'obs_std': 0.3, 'n_samples': 3}
+    all_kwargs.update(kwargs)
+    with pytest.raises(ValueError):
+        ec.bootstrap_constraint_info_array(X_DATA, Y_DATA, **all_kwargs)
@@ -0,0 +1,100 @@
+"""Tests for the PDF of the target variable of emergent constraints."""
+
+import numpy as np
+import pytest
+from scipy import integrate
+from scipy.stats import linregress, norm
+
+import esmvaltool.diag_scripts.emergent_constraints as ec
+
+X_DATA = np.array([0.5, 1.2, 1.9, 2.4, 3.3, 3.9, 4.6, 5.0])
+Y_DATA = np.array([2.1, 3.9, 6.4, 7.2, 10.8, 12.1, 14.9, 15.8])
+
+
+def get_reference_pdf(x_data, y_data, obs_mean, obs_std, y_lin):
+    """Calculate PDF of target variable with adaptive quadrature."""
+    spe = ec.standard_prediction_error(x_data, y_data)
+    reg = linregress(x_data, y_data)
+
+    def comb_pdf(x_new, y_new):
+        """Return combined PDF P(y,x)."""
+        y_pred = reg.slope * x_new + reg.intercept
+        return (ec._gaussian_pdf(x_new, obs_mean, obs_std) *
+                ec._gaussian_pdf(y_new, y_pred, spe(x_new)))
+
+    y_pdf = []
+    for y_val in y_lin:
+        x_cond = (y_val - reg.intercept) / reg.slope
+        points = np.linspace(x_cond - 0.05, x_cond + 0.05, 21)
+        points = points[np.abs(points - obs_mean) < 3.0 * obs_std]
+        y_pdf.append(integrate.quad(comb_pdf,
+                                    obs_mean - 3.0 * obs_std,
+                                    obs_mean + 3.0 * obs_std,
+                                    args=(y_val, ),
+                                    points=points if points.size else None,
+                                    limit=1000,
+                                    epsabs=1e-14,
+                                    epsrel=1e-10)[0])
+    return np.array(y_pdf)
+
+
+@pytest.mark.parametrize('noise', [0.5, 0.01, 0.001])
+@pytest.mark.parametrize('obs_std', [0.05, 2.0])
+def test_target_pdf(noise, obs_std):
+    """Test PDF of target variable against adaptive quadrature."""
+    rng = np.random.default_rng(42)
+    x_data = rng.normal(size=20)
+    y_data = 3.0 * x_data + 1.0 + noise * rng.normal(size=20)
+    (y_lin, y_pdf) = ec.target_pdf(x_data, y_data, 0.3, obs_std,
+                                   n_points=200)
+    assert y_lin.shape == (200, )
+    assert y_pdf.shape == (200, )
+    ref_pdf = get_reference_pdf(x_data, y_data, 0.3, obs_std, y_lin)
+    np.testing.assert_allclose(y_pdf, ref_pdf, rtol=0.0,
+                               atol=1e-10 * np.max(ref_pdf))
+
+
+def test_target_pdf_zero_slope():
+    """Test PDF of target variable for a slope of exactly zero."""
+    x_data = np.array([-1.5, -0.5, 0.5, 1.5])
+    y_data = np.array([1.0, 0.0, 0.0, 1.0])
+    (y_lin, y_pdf) = ec.target_pdf(x_data, y_data, 0.3, 0.5, n_points=17)
+    assert 0.5 in y_lin
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ref_pdf = get_reference_pdf(x_data, y_data, 0.3, 0.5, y_lin)
+    assert np.isfinite(y_pdf).all()
+    np.testing.assert_allclose(y_pdf, ref_pdf, rtol=0.0,
+                               atol=1e-10 * np.max(ref_pdf))
+
+
+def test_target_pdf_unconstrained():
+    """Test PDF of target variable for insignificant relationship."""
+    (y_lin, y_pdf) = ec.target_pdf(X_DATA, Y_DATA, 2.8, 0.4,
+                                   necessary_p_value=1e-20)
+    np.testing.assert_allclose(
+        y_pdf, norm.pdf(y_lin, np.mean(Y_DATA), np.std(Y_DATA)))
+
+
+def test_cdf():
+    """Test cumulative distribution function."""
+    data = np.linspace(-5.0, 5.0, 1000)
+    pdf = norm.pdf(data)
+    cdf = ec.cdf(data, pdf)
+    assert cdf.shape == (1000, )
+    assert cdf[0] == 0.0
+    np.testing.assert_allclose(cdf, norm.cdf(data) - norm.cdf(-5.0),
+                               atol=1e-5)
+    np.testing.assert_allclose(
+        cdf[1:], [integrate.simpson(pdf[:idx], data[:idx]) for idx in
+                  range(2, 1001)], atol=1e-5)
+
+
+@pytest.mark.parametrize('confidence_level,output', [
+    (0.66, (7.7706206206206225, 8.994820065430746, 10.184234234234236)),
+    (0.9, (6.892942942942945, 8.994820065430746, 11.11676676676677)),
+])
+def test_get_constraint(confidence_level, output):
+    """Test constraint on target variable."""
+    constraint = ec.get_constraint(X_DATA, Y_DATA, 2.8, 0.4,
+                                   confidence_level=confidence_level)
+    np.testing.assert_allclose(constraint, output)
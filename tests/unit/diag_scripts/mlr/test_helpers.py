@@ -546,3 +546,76 @@ def test_landsea_fraction_weighting(cube, area_type, normalize, output):
                                                normalize=normalize)
     assert weights.shape == cube.shape
     np.testing.assert_allclose(weights, output)
+
+
+def test_landsea_fraction_weighting_curvilinear():
+    """Test landsea fraction weighting for 2D coordinates."""
+    lat_bounds = LAT_COORD_1D.bounds[:, np.newaxis, [0, 0, 1, 1]]
+    lon_bounds = LON_COORD_1D.bounds[np.newaxis, :, [0, 1, 1, 0]]
+    shape = (3, 2)
+    lat_coord = iris.coords.AuxCoord(
+        np.broadcast_to(LAT_COORD_1D.points[:, np.newaxis], shape),
+        bounds=np.broadcast_to(lat_bounds, shape + (4, )),
+        standard_name='latitude', units='degrees')
+    lon_coord = iris.coords.AuxCoord(
+        np.broadcast_to(LON_COORD_1D.points[np.newaxis, :], shape),
+        bounds=np.broadcast_to(lon_bounds, shape + (4, )),
+        standard_name='longitude', units='degrees')
+    cube = iris.cube.Cube(
+        np.arange(2 * 3 * 2).reshape(2, 3, 2),
+        dim_coords_and_dims=[(TIME_COORD, 0)],
+        aux_coords_and_dims=[(lat_coord, (1, 2)), (lon_coord, (1, 2))])
+    weights = mlr.get_landsea_fraction_weights(cube, 'land')
+    expected = mlr.get_landsea_fraction_weights(CUBE_1_1_1, 'land')
+    np.testing.assert_allclose(weights, expected)
+
+
+def test_ne_land_mask_cache(tmp_path, monkeypatch):
+    """Test caching of the rasterized land mask on disk."""
+    mlr._get_ne_land_mask_cube.cache_clear()
+    cube = mlr._get_ne_land_mask_cube(n_lats=10, n_lons=20,
+                                      cache_dir=str(tmp_path))
+    assert cube.shape == (10, 20)
+    assert len(list(tmp_path.glob('ne_10m_land_10x20_*.npy'))) == 1
+
+    rasterize = mock.Mock(side_effect=AssertionError)
+    monkeypatch.setattr(mlr, '_rasterize_ne_land_mask', rasterize)
+    mlr._get_ne_land_mask_cube.cache_clear()
+    cached_cube = mlr._get_ne_land_mask_cube(n_lats=10, n_lons=20,
+                                             cache_dir=str(tmp_path))
+    assert cached_cube == cube
+    mlr._get_ne_land_mask_cube.cache_clear()
+
+
+def test_ne_land_mask_cache_file(tmp_path):
+    """Test that the cache file depends on the shapefile."""
+    shapefile = tmp_path / 'land.shp'
+    shapefile.write_bytes(b'a')
+    cache_file = mlr._get_ne_land_mask_cache_file('cache', str(shapefile), 10,
+                                                  20)
+    assert os.path.dirname(cache_file) == 'cache'
+    assert os.path.basename(cache_file).startswith('land_10x20_')
+    assert mlr._get_ne_land_mask_cache_file('cache', str(shapefile), 10,
+                                            20) == cache_file
+    assert mlr._get_ne_land_mask_cache_file('cache', str(shapefile), 10,
+                                            30) != cache_file
+
+    # Changed content
+    shapefile.write_bytes(b'ab')
+    new_cache_file = mlr._get_ne_land_mask_cache_file('cache', str(shapefile),
+                                                      10, 20)
+    assert new_cache_file != cache_file
+
+    # Changed modification time
+    os.utime(shapefile, (0, 0))
+    old_cache_file = mlr._get_ne_land_mask_cache_file('cache', str(shapefile),
+                                                      10, 20)
+    assert old_cache_file not in (cache_file, new_cache_file)
+
+    # Other file
+    other_file = tmp_path / 'other' / 'land.shp'
+    other_file.parent.mkdir()
+    other_file.write_bytes(b'ab')
+    os.utime(other_file, (0, 0))
+    assert mlr._get_ne_land_mask_cache_file(
+        'cache', str(other_file), 10, 20) != old_cache_file
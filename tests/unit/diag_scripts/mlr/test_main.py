@@ -0,0 +1,23 @@
+"""Unit tests for the module :mod:`esmvaltool.diag_scripts.mlr.main`."""
+
+import pytest
+
+import esmvaltool.diag_scripts.mlr.main as main
+
+TEST_GET_N_PARALLEL_GROUPS = [
+    ({}, 10, (1, 1)),
+    ({'n_jobs': -1}, 10, (1, -1)),
+    ({'n_parallel_groups': 4}, 10, (4, 1)),
+    ({'n_parallel_groups': 4}, 2, (2, 1)),
+    ({'n_parallel_groups': 4, 'n_jobs': None}, 10, (4, 2)),
+    ({'n_parallel_groups': 4, 'n_jobs': 16}, 10, (4, 2)),
+    ({'n_parallel_groups': -1}, 10, (8, 1)),
+    ({'n_parallel_groups': 16, 'n_jobs': -1}, 20, (16, 1)),
+]
+
+
+@pytest.mark.parametrize('cfg,n_groups,output', TEST_GET_N_PARALLEL_GROUPS)
+def test_get_n_parallel_groups(mocker, cfg, n_groups, output):
+    """Test distribution of processes among groups."""
+    mocker.patch.object(main.os, 'cpu_count', return_value=8)
+    assert main._get_n_parallel_groups(cfg, n_groups) == output
@@ -0,0 +1,91 @@
+"""Unit tests for the module :mod:`esmvaltool.diag_scripts.mlr.postprocess`."""
+
+import dask.array as da
+import iris.cube
+import numpy as np
+import pytest
+
+import esmvaltool.diag_scripts.mlr.postprocess as postprocess
+
+RNG = np.random.default_rng(12345)
+ARRAY = RNG.normal(size=(6, 8))
+ARRAY[2, 3] = np.nan
+ARRAY[:, 5] = 1.0
+WEIGHTS = RNG.random((6, 8))
+
+
+def _corrcoef(array, rowvar=True):
+    """Calculate full matrix of Pearson coefficients."""
+    array = np.ma.masked_invalid(array)
+    if not rowvar:
+        array = array.T
+    demean = array - np.ma.mean(array, axis=1).reshape(-1, 1)
+    res = np.ma.dot(demean, demean.T)
+    row_norms = np.ma.sqrt(np.ma.sum(demean**2, axis=1))
+    res /= np.ma.outer(row_norms, row_norms)
+    return res
+
+
+def _dense_error(array, error, weights):
+    """Calculate error using full matrix of Pearson coefficients."""
+    pearson_coeffs = _corrcoef(array, rowvar=False)
+    weighted_error = error * weights
+    covariance = pearson_coeffs * np.ma.outer(weighted_error, weighted_error)
+    return np.ma.sqrt(np.ma.sum(covariance))
+
+
+@pytest.mark.parametrize('axis', [0, 1])
+def test_get_normalized_anomalies(axis):
+    """Test low-rank factor of matrix of Pearson coefficients."""
+    anomalies = postprocess._get_normalized_anomalies(da.asarray(ARRAY),
+                                                      axis).compute()
+    if axis == 0:
+        pearson_coeffs = anomalies.T @ anomalies
+    else:
+        pearson_coeffs = anomalies @ anomalies.T
+    expected = _corrcoef(ARRAY, rowvar=bool(axis))
+    mask = np.ma.getmaskarray(expected)
+    np.testing.assert_allclose(pearson_coeffs[~mask], expected[~mask])
+    np.testing.assert_allclose(pearson_coeffs[mask], 0.0)
+
+
+def test_estim_cov_differing_shape():
+    """Test estimation of error with covariance from ensemble."""
+    error = RNG.random((2, 4))
+    weights = RNG.random((2, 4))
+    cov_est = ARRAY.reshape(6, 2, 4)
+    out = postprocess._estim_cov_differing_shape(
+        {}, iris.cube.Cube(error**2), iris.cube.Cube(cov_est), weights)
+    expected = _dense_error(ARRAY, error.ravel(), weights.ravel())
+    np.testing.assert_allclose(out, expected)
+
+
+@pytest.mark.parametrize('transpose', [False, True])
+def test_estim_cov_identical_shape(transpose):
+    """Test estimation of error with covariance from same shape."""
+    error = RNG.random((6, 8))
+    cov_est = np.ma.masked_invalid(ARRAY)
+    weights = WEIGHTS
+    if transpose:
+        (error, cov_est, weights) = (error.T, cov_est.T, weights.T)
+    out = postprocess._estim_cov_identical_shape(iris.cube.Cube(error**2),
+                                                 iris.cube.Cube(cov_est),
+                                                 weights)
+
+    # Dense reference (collapse second dimension first)
+    pearson_dim0 = postprocess._get_normalized_anomalies(
+        da.asarray(cov_est.filled(np.nan)), 1, weights=weights).compute()
+    pearson_dim0 = pearson_dim0 @ pearson_dim0.T
+    pearson_dim1 = postprocess._get_normalized_anomalies(
+        da.asarray(cov_est.filled(np.nan)), 0, weights=weights).compute()
+    pearson_dim1 = pearson_dim1.T @ pearson_dim1
+    weighted_error = error * weights
+    error_dim0 = np.sqrt(
+        np.einsum('ij,jk,ik->i', weighted_error, pearson_dim1,
+                  weighted_error))
+    error_dim1 = np.sqrt(
+        np.einsum('ji,jk,ki->i', weighted_error, pearson_dim0,
+                  weighted_error))
+    expected = max(np.sqrt(error_dim0 @ pearson_dim0 @ error_dim0),
+                   np.sqrt(error_dim1 @ pearson_dim1 @ error_dim1))
+    np.testing.assert_allclose(out, expected)
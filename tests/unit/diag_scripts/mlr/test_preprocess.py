@@ -1,7 +1,15 @@
 """Unit tests for the module :mod:`esmvaltool.diag_scripts.mlr.preprocess`."""
 
+from copy import deepcopy
+
+import dask.array as da
+import iris
+import iris.coords
+import iris.cube
 import numpy as np
 import pytest
+from cf_units import Unit
+from scipy import stats
 
 import esmvaltool.diag_scripts.mlr.preprocess as preprocess
 
@@ -16,8 +24,9 @@ TEST_GET_SLOPE = [
 @pytest.mark.parametrize('x_arr,y_arr,output', TEST_GET_SLOPE)
 def test_get_slope(x_arr, y_arr, output):
     """Test calculation of slope."""
-    out = preprocess._get_slope(x_arr, y_arr)
-    assert ((out == output) | (np.isnan(output) & np.isnan(output))).all()
+    (out, _) = preprocess._get_slope_and_stderr(x_arr, y_arr)
+    out = np.ma.filled(out, np.nan)
+    assert (np.isclose(out, output) | (np.isnan(out) & np.isnan(output)))
 
 
 Y_ARR_1 = np.ma.masked_invalid([np.nan, 1.0, 0.0, np.nan, -0.5])
@@ -37,7 +46,194 @@ TEST_GET_SLOPE_VECTORIZED = [
 @pytest.mark.parametrize('x_arr,y_arr,output', TEST_GET_SLOPE_VECTORIZED)
 def test_get_slope_vectorized(x_arr, y_arr, output):
     """Test vectorized calculation of slope."""
-    get_slope = np.vectorize(preprocess._get_slope, excluded=['x_arr'],
-                             signature='(n),(n)->()')
-    out = get_slope(x_arr, y_arr)
+    (out, _) = preprocess._get_slope_and_stderr(x_arr, y_arr)
+    out = np.ma.filled(out, np.nan)
     assert (np.isclose(out, output) | (np.isnan(out) & np.isnan(output))).all()
+
+
+def get_linregress(x_arr, y_arr):
+    """Get slopes and standard errors from :func:`scipy.stats.linregress`."""
+    slope = np.full(y_arr.shape[:-1], np.nan)
+    stderr = np.full(y_arr.shape[:-1], np.nan)
+    for idx in np.ndindex(*y_arr.shape[:-1]):
+        mask = np.ma.getmaskarray(y_arr[idx])
+        if (~mask).sum() < 2:
+            continue
+        reg = stats.linregress(x_arr[~mask], y_arr[idx].data[~mask])
+        slope[idx] = reg.slope
+        stderr[idx] = reg.stderr
+    return (slope, stderr)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('axis', [0, 1, -1])
+def test_get_slope_and_stderr(axis, lazy):
+    """Test vectorized calculation of slope and its standard error."""
+    rng = np.random.default_rng(0)
+    x_arr = 1000.0 + 3.0 * np.arange(20)
+    y_arr = np.ma.masked_greater(rng.normal(size=(4, 5, 20)), 1.0)
+    y_arr[0, 0, 2:] = np.ma.masked
+    y_arr[0, 1, 3:] = np.ma.masked
+    (slope, stderr) = get_linregress(x_arr, y_arr)
+    y_in = np.ma.array(np.moveaxis(y_arr.data, -1, axis),
+                       mask=np.moveaxis(y_arr.mask, -1, axis))
+    if lazy:
+        y_in = da.ma.masked_array(y_in.data, mask=y_in.mask, chunks=2)
+    (out_slope, out_stderr) = preprocess._get_slope_and_stderr(
+        x_arr, y_in, axis=axis)
+    if lazy:
+        assert isinstance(out_slope, da.Array)
+        assert isinstance(out_stderr, da.Array)
+        out_slope = out_slope.compute()
+        out_stderr = out_stderr.compute()
+    assert out_slope.shape == (4, 5)
+    assert out_stderr.shape == (4, 5)
+    assert out_stderr[0, 1] == 0.0
+    np.testing.assert_allclose(out_slope.filled(np.nan), slope)
+    np.testing.assert_allclose(out_stderr.filled(np.nan), stderr,
+                               atol=1e-15)
+
+
+def test_get_slope_and_stderr_masked_x():
+    """Test vectorized calculation of slope with masked x values."""
+    x_arr = np.ma.masked_invalid([[0.0, 1.0, np.nan, 3.0],
+                                  [1.0, 1.0, 1.0, 1.0],
+                                  [0.0, 1.0, 2.0, 3.0]])
+    y_arr = np.ma.masked_invalid([[0.0, 2.0, 100.0, 6.0],
+                                  [1.0, 2.0, 3.0, 4.0],
+                                  [np.nan, np.nan, np.nan, 4.0]])
+    (slope, stderr) = preprocess._get_slope_and_stderr(x_arr, y_arr)
+    np.testing.assert_allclose(slope[0], 2.0)
+    np.testing.assert_allclose(stderr[0], 0.0, atol=1e-15)
+    assert slope.mask.tolist() == [False, True, True]
+    assert stderr.mask.tolist() == [False, True, True]
+
+
+def get_dataset(path, lons=None):
+    """Write monthly dataset and return its metadata."""
+    time_coord = iris.coords.DimCoord(
+        np.arange(36) * 30.4375 + 15.0,
+        standard_name='time',
+        units=Unit('days since 2000-01-01', calendar='standard'))
+    lat_coord = iris.coords.DimCoord([-10.0, 10.0],
+                                     standard_name='latitude',
+                                     units='degrees')
+    data = np.arange(72.0).reshape(36, 2) % 7.0
+    coords = [(time_coord, 0), (lat_coord, 1)]
+    if lons is not None:
+        data = data[..., np.newaxis] * np.ones(len(lons))
+        coords.append((iris.coords.DimCoord(lons,
+                                            standard_name='longitude',
+                                            units='degrees'), 2))
+    cube = iris.cube.Cube(data,
+                          var_name='tas',
+                          units='K',
+                          dim_coords_and_dims=coords)
+    iris.save(cube, path)
+    return {
+        'dataset': 'MODEL',
+        'filename': path,
+        'long_name': 'Temperature',
+        'short_name': 'tas',
+        'units': 'K',
+        'var_type': 'prediction_input',
+    }
+
+
+def preprocess_dataset(cfg, data):
+    """Apply all preprocessing steps for single datasets."""
+    keys = preprocess._get_initial_cache_keys(cfg, [data])
+    input_data = preprocess.load_cubes([deepcopy(data)])
+    return preprocess._preprocess_dataset(cfg, input_data[0], key=keys[0])
+
+
+def assert_datasets_equal(all_data_1, all_data_2):
+    """Assert that lists of preprocessed datasets are equal."""
+    assert len(all_data_1) == len(all_data_2)
+    for (data_1, data_2) in zip(all_data_1, all_data_2):
+        assert data_1['cube'] == data_2['cube']
+        for key in ('filename', 'original_filename', 'var_type'):
+            assert data_1[key] == data_2[key]
+
+
+def test_preprocess_dataset_cache(tmp_path, mocker):
+    """Test caching of preprocessing steps."""
+    data = get_dataset(str(tmp_path / 'tas.nc'))
+    cache_dir = tmp_path / 'cache'
+    cfg = {
+        'aggregate_by': {'trend': 'year'},
+        'collapse': {'mean': ['year']},
+        'extract_ignore_bounds': False,
+        'mask': {'masked_greater': {'value': 5.0}},
+        'n_jobs': 1,
+        'return_trend_stderr': True,
+        'work_dir': str(tmp_path),
+    }
+    all_data = preprocess_dataset(cfg, data)
+    assert len(all_data) == 2
+    assert not cache_dir.exists()
+
+    # First run: cache results of active steps (masking, trend and collapse
+    # for dataset and its standard error)
+    cfg['cache_dir'] = str(cache_dir)
+    assert_datasets_equal(preprocess_dataset(cfg, data), all_data)
+    assert len(list(cache_dir.iterdir())) == 4
+
+    # Change late step: only re-run late step
+    cfg_max = {**cfg, 'collapse': {'max': ['year']}}
+    all_data = preprocess_dataset({**cfg_max, 'cache_dir': None}, data)
+    mask = mocker.spy(preprocess, 'mask')
+    aggregate_by_trend = mocker.spy(preprocess, 'aggregate_by_trend')
+    collapse = mocker.spy(preprocess, 'collapse')
+    assert_datasets_equal(preprocess_dataset(cfg_max, data), all_data)
+    mask.assert_not_called()
+    aggregate_by_trend.assert_not_called()
+    assert collapse.call_count == 2
+    assert len(list(cache_dir.iterdir())) == 6
+
+    # Identical settings: nothing is re-run
+    collapse.reset_mock()
+    assert_datasets_equal(preprocess_dataset(cfg_max, data), all_data)
+    collapse.assert_not_called()
+
+    # Different input data: everything is re-run
+    data = get_dataset(str(tmp_path / 'tas.nc'))
+    iris.save(iris.load_cube(data['filename']) * 2.0, str(tmp_path / 'x.nc'))
+    data['filename'] = str(tmp_path / 'x.nc')
+    preprocess_dataset(cfg_max, data)
+    mask.assert_called_once()
+    assert len(list(cache_dir.iterdir())) == 10
+
+
+def test_preprocess_dataset_cache_weights(tmp_path, mocker):
+    """Test that cached results depend on the weighting options."""
+    data = get_dataset(str(tmp_path / 'tas.nc'), lons=[0.0, 180.0])
+    cfg = {
+        'area_weighted': True,
+        'cache_dir': str(tmp_path / 'cache'),
+        'collapse': {'mean': ['latitude']},
+        'extract_ignore_bounds': False,
+        'n_jobs': 1,
+        'return_trend_stderr': True,
+        'time_weighted': True,
+        'work_dir': str(tmp_path),
+    }
+    preprocess_dataset(cfg, data)
+    collapse = mocker.spy(preprocess, 'collapse')
+    get_horizontal_weights = mocker.spy(preprocess.mlr,
+                                        'get_horizontal_weights')
+
+    # Other weights: collapse is re-run
+    cfg_unweighted = {**cfg, 'area_weighted': False}
+    all_data = preprocess_dataset({**cfg_unweighted, 'cache_dir': None}, data)
+    collapse.reset_mock()
+    get_horizontal_weights.reset_mock()
+    assert_datasets_equal(preprocess_dataset(cfg_unweighted, data), all_data)
+    collapse.assert_called_once()
+    get_horizontal_weights.assert_called_once()
+    assert get_horizontal_weights.call_args.kwargs['area_weighted'] is False
+
+    # Original weights: cached result is used
+    collapse.reset_mock()
+    preprocess_dataset(cfg, data)
+    collapse.assert_not_called()
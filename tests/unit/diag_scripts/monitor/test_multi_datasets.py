@@ -0,0 +1,85 @@
+"""Tests for the lazy loading of data in monitoring diagnostics."""
+from collections import OrderedDict
+
+import iris
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+
+from esmvaltool.diag_scripts.monitor.multi_datasets import MultiDatasets
+
+
+def get_multi_datasets(max_cubes_in_memory):
+    """Get :class:`MultiDatasets` instance without input data."""
+    multi_datasets = MultiDatasets.__new__(MultiDatasets)
+    multi_datasets.cfg = {'max_cubes_in_memory': max_cubes_in_memory}
+    multi_datasets._cubes = OrderedDict()
+    multi_datasets._ref_cubes = {}
+    return multi_datasets
+
+
+@pytest.fixture
+def load(mocker):
+    """Mock loading of cubes."""
+    return mocker.patch.object(
+        MultiDatasets,
+        '_load_and_preprocess_cube',
+        side_effect=lambda d: iris.cube.Cube(0.0, var_name=d['filename']),
+    )
+
+
+def test_get_cube_lru(load):
+    """Test that at most ``max_cubes_in_memory`` cubes are kept."""
+    multi_datasets = get_multi_datasets(2)
+    datasets = [{'filename': f'{idx}.nc'} for idx in range(3)]
+    ref_dataset = {'filename': 'ref.nc', 'reference_for_monitor_diags': True}
+
+    cube_0 = multi_datasets._get_cube(datasets[0])
+    assert multi_datasets._get_cube(datasets[0]) is cube_0
+    ref_cube = multi_datasets._get_cube(ref_dataset)
+    multi_datasets._get_cube(datasets[1])
+    assert load.call_count == 3
+
+    # Dataset 1 is least recently used
+    assert multi_datasets._get_cube(datasets[0]) is cube_0
+    multi_datasets._get_cube(datasets[2])
+    assert list(multi_datasets._cubes) == ['0.nc', '2.nc']
+    multi_datasets._get_cube(datasets[1])
+    assert list(multi_datasets._cubes) == ['2.nc', '1.nc']
+    assert load.call_count == 5
+
+    # Reference dataset is never removed
+    assert multi_datasets._get_cube(ref_dataset) is ref_cube
+    assert load.call_count == 5
+
+
+def test_get_cube_unlimited(load):
+    """Test that all cubes are kept if desired."""
+    multi_datasets = get_multi_datasets(None)
+    datasets = [{'filename': f'{idx}.nc'} for idx in range(20)]
+    for dataset in datasets + datasets:
+        multi_datasets._get_cube(dataset)
+    assert len(multi_datasets._cubes) == 20
+    assert load.call_count == 20
+
+
+def test_load_and_preprocess_cube(tmp_path):
+    """Test loading and preprocessing of cubes."""
+    plev = iris.coords.DimCoord([100000.0, 50000.0],
+                                standard_name='air_pressure',
+                                units='Pa')
+    cube = iris.cube.Cube(np.ones(2) / 86400.0,
+                          var_name='pr',
+                          units='kg m-2 s-1',
+                          dim_coords_and_dims=[(plev, 0)])
+    filename = str(tmp_path / 'pr.nc')
+    iris.save(cube, filename)
+    dataset = {'filename': filename, 'units': 'kg m-2 s-1'}
+    cube = MultiDatasets._load_and_preprocess_cube(dataset)
+    assert dataset['units'] == 'mm day-1'
+    assert cube.units == 'mm day-1'
+    np.testing.assert_allclose(cube.data, [1.0, 1.0])
+    np.testing.assert_allclose(cube.coord('air_pressure').points,
+                               [1000.0, 500.0])
+    assert cube.coord('air_pressure').attributes['positive'] == 'down'
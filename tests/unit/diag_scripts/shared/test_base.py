@@ -73,6 +73,57 @@ def test_provenance_logger_duplicate_raises(tmp_path):
             prov.log('output.nc', record)
 
 
+def test_provenance_logger_batched(tmp_path):
+
+    provenance_file = tmp_path / 'diagnostic_provenance.yml'
+    journal_file = tmp_path / 'diagnostic_provenance.yml.journal'
+    shared._base._ProvenanceStore.start(str(provenance_file))
+
+    records = {f'output{i}.nc': {'attribute': i} for i in range(3)}
+    for filename, record in records.items():
+        with shared.ProvenanceLogger({'run_dir': str(tmp_path)}) as prov:
+            prov.log(filename, record)
+    with pytest.raises(KeyError):
+        with shared.ProvenanceLogger({'run_dir': str(tmp_path)}) as prov:
+            prov.log('output0.nc', {})
+
+    assert not provenance_file.exists()
+    assert journal_file.exists()
+
+    shared._base._ProvenanceStore.stop(str(provenance_file))
+
+    assert not journal_file.exists()
+    provenance = yaml.safe_load(provenance_file.read_bytes())
+    assert provenance == records
+
+
+def test_init_diagnostic_worker(tmp_path, mocker):
+
+    provenance_file = tmp_path / 'diagnostic_provenance.yml'
+    journal_file = tmp_path / 'diagnostic_provenance.yml.journal'
+    cfg = {'run_dir': str(tmp_path), 'log_level': 'debug'}
+    configure_logging = mocker.patch.object(shared._base,
+                                            '_configure_logging')
+    shared.init_diagnostic_worker(cfg)
+    configure_logging.assert_called_once_with('debug')
+    store = shared._base._ProvenanceStore.get_active(str(provenance_file))
+    assert store is not None
+    shared.init_diagnostic_worker(cfg)
+    assert shared._base._ProvenanceStore.get_active(
+        str(provenance_file)) is store
+
+    with shared.ProvenanceLogger(cfg) as prov:
+        prov.log('output.nc', {'attribute': 1})
+
+    assert not provenance_file.exists()
+    assert journal_file.exists()
+
+    shared._base._ProvenanceStore.stop(str(provenance_file))
+
+    provenance = yaml.safe_load(provenance_file.read_bytes())
+    assert provenance == {'output.nc': {'attribute': 1}}
+
+
 def test_select_metadata():
 
     metadata = [
@@ -367,6 +418,24 @@ def test_run_diagnostic(tmp_path, monkeypatch):
         assert 'example_setting' in cfg
 
 
+def test_run_diagnostic_provenance(tmp_path, monkeypatch):
+
+    settings = create_settings(tmp_path)
+    settings_file = write_settings(settings)
+
+    monkeypatch.setattr(sys, 'argv', ['', settings_file])
+
+    provenance_file = Path(settings['run_dir']) / 'diagnostic_provenance.yml'
+    record = {'attribute1': 'xyz'}
+    with shared.run_diagnostic() as cfg:
+        with shared.ProvenanceLogger(cfg) as prov:
+            prov.log('output.nc', record)
+        assert not provenance_file.exists()
+
+    provenance = yaml.safe_load(provenance_file.read_bytes())
+    assert provenance == {'output.nc': record}
+
+
 @pytest.mark.parametrize('flag', ['-l', '--log-level'])
 def test_run_diagnostic_log_level(tmp_path, monkeypatch, flag):
     """Test if setting the log level from the command line works."""
@@ -427,3 +496,100 @@ def test_rerun_diagnostic_flag(tmp_path, monkeypatch, flag):
                 Path(settings['plot_dir']) / 'example_output.txt',
         ):
             assert file.exists() == exist
+
+
+METADATA = [
+    {
+        'short_name': 'ta',
+        'dataset': 'dataset2',
+        'exp': 'historical',
+    },
+    {
+        'short_name': 'pr',
+        'dataset': 'dataset2',
+        'exp': ['historical', 'ssp585'],
+    },
+    {
+        'short_name': 'ta',
+        'dataset': 'dataset1',
+        'exp': None,
+    },
+    {
+        'short_name': 'pr',
+        'dataset': 'Dataset3',
+    },
+    {
+        'short_name': 'ta',
+        'dataset': 'dataset1',
+        'exp': 'ssp585',
+        'ensemble': 1,
+    },
+]
+
+
+@pytest.mark.parametrize('attributes', [
+    {},
+    {
+        'short_name': 'ta'
+    },
+    {
+        'short_name': 'ta',
+        'dataset': 'dataset1'
+    },
+    {
+        'exp': '*'
+    },
+    {
+        'exp': 'historical'
+    },
+    {
+        'exp': ['historical', 'ssp585']
+    },
+    {
+        'exp': None
+    },
+    {
+        'ensemble': 1.0
+    },
+    {
+        'short_name': 'tas'
+    },
+])
+def test_metadata_index_select(attributes):
+    """Test that the index gives the same results as a list."""
+    index = shared.MetadataIndex(METADATA)
+    assert len(index) == len(METADATA)
+    assert list(index) == METADATA
+    expected = shared.select_metadata(METADATA, **attributes)
+    assert shared.select_metadata(index, **attributes) == expected
+    # Second query uses the existing index
+    assert shared.select_metadata(index, **attributes) == expected
+
+
+@pytest.mark.parametrize('attribute', ['short_name', 'dataset', 'ensemble'])
+@pytest.mark.parametrize('sort', [None, True, 'exp'])
+def test_metadata_index_group(attribute, sort):
+    """Test that the index gives the same groups as a list."""
+    index = shared.MetadataIndex(METADATA)
+    expected = shared.group_metadata(METADATA, attribute, sort=sort)
+    result = shared.group_metadata(index, attribute, sort=sort)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_metadata_index_group_unhashable():
+    """Test that grouping by unhashable values fails like for lists."""
+    index = shared.MetadataIndex(METADATA)
+    with pytest.raises(TypeError):
+        shared.group_metadata(index, 'exp')
+
+
+@pytest.mark.parametrize('sort', ['dataset', ['short_name', 'dataset']])
+def test_metadata_index_sorted(sort):
+    """Test that the index sorts like a list."""
+    index = shared.MetadataIndex(METADATA)
+    expected = shared.sorted_metadata(METADATA, sort)
+    result = shared.sorted_metadata(index, sort)
+    assert result == expected
+    result.pop()
+    assert shared.sorted_metadata(index, sort) == expected
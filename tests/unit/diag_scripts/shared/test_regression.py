@@ -0,0 +1,77 @@
+"""Tests for the module :mod:`esmvaltool.diag_scripts.shared._regression`."""
+import dask.array as da
+import numpy as np
+import pytest
+from scipy import stats
+
+from esmvaltool.diag_scripts.shared import vectorized_linregress
+
+RNG = np.random.default_rng(0)
+X_ARR = 1000.0 + 3.0 * np.arange(20)
+Y_ARR = np.ma.masked_greater(RNG.normal(size=(4, 5, 20)), 1.2)
+Y_ARR[0, 0, 1:] = np.ma.masked
+Y_ARR[0, 1, 3:] = np.ma.masked
+Y_ARR[0, 2] = 5.0
+Y_ARR[1, 0] = 2.0 * X_ARR + 1.0
+KEYS = ('slope', 'intercept', 'rvalue', 'stderr', 'pvalue', 'see')
+
+
+def get_linregress(x_arr, y_arr):
+    """Get regressions from loop over :func:`scipy.stats.linregress`."""
+    reg = {key: np.full(y_arr.shape[:-1], np.nan) for key in KEYS}
+    for idx in np.ndindex(*y_arr.shape[:-1]):
+        x_data = np.broadcast_to(np.ma.getdata(x_arr), y_arr.shape)[idx]
+        mask = (np.broadcast_to(np.ma.getmaskarray(x_arr), y_arr.shape)[idx] |
+                np.ma.getmaskarray(y_arr[idx]))
+        if (~mask).sum() < 2 or np.ptp(x_data[~mask]) == 0.0:
+            continue
+        single_reg = stats.linregress(x_data[~mask], y_arr[idx].data[~mask])
+        for key in KEYS[:-1]:
+            reg[key][idx] = getattr(single_reg, key)
+        residuals = y_arr[idx].data[~mask] - (
+            single_reg.slope * x_data[~mask] + single_reg.intercept)
+        if (~mask).sum() > 2:
+            reg['see'][idx] = np.sqrt(np.sum(residuals**2) /
+                                      ((~mask).sum() - 2))
+        else:
+            reg['see'][idx] = 0.0
+    return reg
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('axis', [0, 1, -1])
+def test_vectorized_linregress(axis, lazy):
+    """Test vectorized linear regression."""
+    ref = get_linregress(X_ARR, Y_ARR)
+    y_in = np.ma.array(np.moveaxis(Y_ARR.data, -1, axis),
+                       mask=np.moveaxis(Y_ARR.mask, -1, axis))
+    if lazy:
+        y_in = da.ma.masked_array(y_in.data, mask=y_in.mask, chunks=2)
+    reg = vectorized_linregress(X_ARR, y_in, axis=axis)
+    assert reg._fields == KEYS
+    for key in KEYS:
+        result = getattr(reg, key)
+        assert isinstance(result, da.Array) == lazy
+        result = np.ma.masked_invalid(result.compute() if lazy else result)
+        assert result.shape == (4, 5)
+        np.testing.assert_array_equal(result.mask, np.isnan(ref[key]))
+        np.testing.assert_allclose(result.filled(np.nan), ref[key],
+                                   rtol=1e-7, atol=1e-12)
+    assert np.isnan(ref['slope'][0, 0])
+    np.testing.assert_allclose(ref['rvalue'][1, 0], 1.0)
+    assert ref['rvalue'][0, 2] == 0.0
+
+
+def test_vectorized_linregress_masked_x():
+    """Test vectorized linear regression with masked multi-dimensional x."""
+    x_arr = np.ma.masked_less(RNG.normal(size=(4, 5, 20)), -1.5)
+    x_arr[2, 3] = 1.0
+    ref = get_linregress(x_arr, Y_ARR)
+    reg = vectorized_linregress(x_arr, Y_ARR)
+    for key in KEYS:
+        result = getattr(reg, key)
+        np.testing.assert_array_equal(np.ma.getmaskarray(result),
+                                      np.isnan(ref[key]))
+        np.testing.assert_allclose(result.filled(np.nan), ref[key],
+                                   rtol=1e-7, atol=1e-12)
+    assert np.ma.is_masked(reg.slope[2, 3])